@@ -1,15 +1,34 @@
 import os
+import time
+from functools import wraps
 from dotenv import load_dotenv
 import json
 from flask_sqlalchemy import SQLAlchemy
-from flask import Flask, request, jsonify, render_template
+from sqlalchemy import event
+from flask import Flask, request, jsonify, render_template, send_file, g
 
 # Carrega as variáveis do arquivo keys.env para o ambiente do sistema
 load_dotenv('keys.env')
 
 from utils.config_loader import load_config
+from utils.model_router import obter_estatisticas_rotas
+from utils.json_repair import obter_estatisticas_parse
+from utils.relevance_filter import obter_estatisticas_filtro
+from utils.hedging import obter_estatisticas_hedging
+from utils.circuit_breaker import obter_estados_disjuntores
+from utils import fts_index
+from utils import vc_index
+from utils import analytics
+from utils import source_store
+from utils import entity_cache
+from utils.admission import ControleAdmissao, FilaCheia
+from utils import profiling
+from utils import tracing
+from utils import write_behind
+from utils.startup_record import Startup
 from pipelines.pipeline_manager import pesquisar_startups_por_vcs
-from pipelines.deep_pipeline_manager import pesquisar_startups_profundo
+from pipelines import cache_warming
+from pipelines.deep_pipeline_manager import pesquisar_startups_profundo, pesquisar_atualizacao_incremental, aplicar_delta
 
 # Pega o caminho absoluto do diretório onde este script (app.py) está localizado.
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -22,6 +41,33 @@ config = load_config(config_path)
 
 app = Flask(__name__)
 
+# Os pipelines devolvem startups como registros compactos (utils.startup_record)
+_json_padrao_flask = app.json.default
+app.json.default = lambda obj: obj.para_dict() if isinstance(obj, Startup) else _json_padrao_flask(obj)
+
+# -------------------------------
+# Rastreamento: um span raiz por requisição
+# -------------------------------
+@app.before_request
+def iniciar_span_requisicao():
+    g.span_requisicao = tracing.iniciar_span("requisicao", metodo=request.method, rota=request.path)
+
+@app.after_request
+def anotar_span_requisicao(resposta):
+    span_requisicao = g.get("span_requisicao")
+    if span_requisicao:
+        span_requisicao[0].anotar(status_http=resposta.status_code)
+        resposta.headers["X-Trace-Id"] = span_requisicao[0].trace_id
+    return resposta
+
+@app.teardown_request
+def finalizar_span_requisicao(erro=None):
+    span_requisicao = g.pop("span_requisicao", None)
+    if span_requisicao:
+        if erro is not None:
+            span_requisicao[0].anotar(erro=str(erro))
+        tracing.finalizar_span(*span_requisicao)
+
 @app.route("/")
 def home():
     return render_template("index.html")
@@ -32,7 +78,8 @@ def home():
 DATA_DIR = os.path.join(BASE_DIR, "data")
 os.makedirs(DATA_DIR, exist_ok=True)  # cria a pasta se não existir
 
-db_path = os.path.join(BASE_DIR, "pesquisas.db")
+# PESQUISAS_DB_PATH permite apontar para outro banco (ex: teste de carga)
+db_path = os.environ.get("PESQUISAS_DB_PATH", os.path.join(BASE_DIR, "pesquisas.db"))
 app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{db_path}"
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 db = SQLAlchemy(app)
@@ -42,14 +89,171 @@ class Pesquisa(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     vc_list = db.Column(db.String, nullable=False)
     resultado = db.Column(db.Text, nullable=False)
-    tipo_pesquisa = db.Column(db.String, default="normal")  # "normal" ou "profunda"
+    tipo_pesquisa = db.Column(db.String, default="normal")  # "normal", "profunda" ou "incremental"
     metadados = db.Column(db.Text, nullable=True)  # Para armazenar metadados da pesquisa profunda
 
+# Mantém o índice FTS5, o índice de VCs e os agregados de analytics na mesma transação que salva a pesquisa
+@event.listens_for(Pesquisa, "after_insert")
+def indexar_pesquisa_salva(mapper, connection, target):
+    startups = startups_do_registro(target)
+    indexar_registro(connection.connection, target, startups)
+    vc_index.indexar_pesquisa(connection.connection, target.id, target.vc_list)
+    analytics.registrar_pesquisa(connection.connection, target.tipo_pesquisa, target.vc_list, startups)
+
+@event.listens_for(Pesquisa, "after_delete")
+def remover_pesquisa_do_indice(mapper, connection, target):
+    fts_index.remover_pesquisa(connection.connection, target.id)
+    vc_index.remover_pesquisa(connection.connection, target.id)
+    analytics.registrar_pesquisa(connection.connection, target.tipo_pesquisa, target.vc_list,
+                                 startups_do_registro(target), sinal=-1)
+
+def startups_do_registro(pesquisa):
+    try:
+        return json.loads(pesquisa.resultado)
+    except (TypeError, json.JSONDecodeError):
+        return []
+
+def indexar_registro(conn, pesquisa, startups=None):
+    """Indexa startups e trechos de fontes de um registro Pesquisa"""
+    if startups is None:
+        startups = startups_do_registro(pesquisa)
+    fontes = []
+    if pesquisa.metadados:
+        try:
+            fontes = json.loads(pesquisa.metadados).get("fontes", [])
+        except (TypeError, AttributeError, json.JSONDecodeError):
+            fontes = []
+    fts_index.indexar_pesquisa(conn, pesquisa.id, startups, fontes)
+
 # Cria o banco na primeira execução
 with app.app_context():
     db.create_all()
+    
+    # Cria o índice de busca textual e indexa o histórico existente
+    with db.engine.begin() as connection:
+        raw_conn = connection.connection
+        fts_index.criar_indice(raw_conn)
+        if fts_index.indice_vazio(raw_conn):
+            for p in Pesquisa.query.order_by(Pesquisa.id).all():
+                indexar_registro(raw_conn, p)
+
+        # Índice exato de VCs por pesquisa (usado pelo snapshot da incremental)
+        vc_index.criar_indice(raw_conn)
+        if vc_index.indice_vazio(raw_conn):
+            for pesquisa_id, vc_list in db.session.query(Pesquisa.id, Pesquisa.vc_list).yield_per(500):
+                vc_index.indexar_pesquisa(raw_conn, pesquisa_id, vc_list)
+
+        # Agregados de analytics: calculados uma vez sobre o histórico, depois incrementais
+        analytics.criar_tabelas(raw_conn)
+        if analytics.tabelas_vazias(raw_conn):
+            analytics.reconstruir(raw_conn, (
+                (p.tipo_pesquisa, p.vc_list, startups_do_registro(p))
+                for p in Pesquisa.query.order_by(Pesquisa.id).yield_per(200)
+            ))
+
+def gravar_pesquisas(registros):
+    """Grava um lote de pesquisas em uma única transação (thread write-behind)"""
+    with app.app_context():
+        try:
+            db.session.add_all([Pesquisa(**registro) for registro in registros])
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+# Com debug, `python app.py` roda este módulo duas vezes: no processo pai do
+# reloader do Werkzeug (que não atende requisições) e no filho. As threads de
+# fundo (gravação, aquecimento) só sobem no processo que atende.
+PROCESSO_SERVIDOR = not (__name__ == "__main__" and config["flask"]["debug"]) \
+    or os.environ.get("WERKZEUG_RUN_MAIN") == "true"
+
+# Os endpoints só enfileiram; uma thread grava em lotes (config.json > persistencia)
+fila_gravacao = write_behind.iniciar_fila(gravar_pesquisas, iniciar=PROCESSO_SERVIDOR)
+
+# -------------------------------
+# Controle de admissão dos endpoints de pesquisa
+# -------------------------------
+config_admissao = config.get("admissao", {})
+admissao_normal = ControleAdmissao("pesquisa_normal", **config_admissao.get("pesquisa_normal", {}))
+admissao_profunda = ControleAdmissao("pesquisa_profunda", **config_admissao.get("pesquisa_profunda", {}))
+
+def listar_vcs_populares(limite, minimo):
+    """VCs mais frequentes em Pesquisa.vc_list (lidas dos agregados de analytics)"""
+    with app.app_context(), db.engine.connect() as connection:
+        return analytics.vcs_mais_pesquisadas(connection.connection, limite, minimo)
+
+def sem_pesquisas_em_andamento():
+    return admissao_normal.metricas()["executando"] == 0 and admissao_profunda.metricas()["executando"] == 0
+
+# Pesquisa antecipada das VCs populares nas janelas de baixo uso (config.json > aquecimento_cache)
+aquecedor_cache = cache_warming.iniciar_aquecimento(listar_vcs_populares, sem_pesquisas_em_andamento,
+                                                   iniciar=PROCESSO_SERVIDOR)
+
+def identificar_cliente():
+    """Cliente = IP de origem (um cabeçalho enviado pelo próprio cliente poderia ser trocado a cada pedido)"""
+    return request.remote_addr or "desconhecido"
+
+def com_admissao(controle):
+    """Enfileira a requisição no controle; responde 429 com Retry-After se saturado"""
+    def decorador(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            cliente = identificar_cliente()
+            try:
+                info = controle.adquirir(cliente)
+            except FilaCheia as e:
+                resposta = jsonify({"erro": e.motivo, "retry_after": e.retry_after})
+                return resposta, 429, {"Retry-After": str(e.retry_after)}
+
+            inicio = time.perf_counter()
+            try:
+                resposta = app.make_response(view(*args, **kwargs))
+            finally:
+                controle.liberar(cliente, time.perf_counter() - inicio)
+
+            # Métricas da espera já cumprida (a resposta só sai depois da execução)
+            resposta.headers["X-Fila-Posicao"] = str(info["posicao_fila"])
+            resposta.headers["X-Fila-Espera-Ms"] = str(info["espera_ms"])
+            return resposta
+        return wrapper
+    return decorador
+
+# Perfilamento sob demanda (desabilitado por padrão)
+config_perfilamento = {**profiling.CONFIG_PADRAO, **config.get("perfilamento", {})}
+
+def perfil_solicitado():
+    """Perfil pedido por cabeçalho X-Perfil: 1 ou ?perfil=1, se o config permitir"""
+    pedido = request.headers.get("X-Perfil") or request.args.get("perfil")
+    if pedido not in ("1", "true"):
+        return False
+    return profiling.perfil_autorizado(config_perfilamento, request.headers.get("X-Perfil-Token"))
+
+def com_perfil(view):
+    """Executa a view sob o profiler e inclui o id do perfil em metadados.perfil"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not perfil_solicitado():
+            return view(*args, **kwargs)
+
+        retorno, info = profiling.executar_com_perfil(
+            lambda: app.make_response(view(*args, **kwargs)),
+            config_perfilamento
+        )
+        if info is None:
+            retorno.headers["X-Perfil-Id"] = "ocupado"
+            return retorno
+
+        retorno.headers["X-Perfil-Id"] = info["id"]
+        dados = retorno.get_json(silent=True)
+        if isinstance(dados, dict):
+            dados.setdefault("metadados", {})["perfil"] = info
+            retorno.set_data(json.dumps(dados, ensure_ascii=False))
+        return retorno
+    return wrapper
 
 @app.route("/pesquisar", methods=["POST"])
+@com_admissao(admissao_normal)
+@com_perfil
 def pesquisar():
     """Endpoint para pesquisa normal (método original)"""
     try:
@@ -58,41 +262,42 @@ def pesquisar():
         if not lista_vcs:
             return jsonify({"erro": "vc_list é obrigatório"}), 400
 
-        # Executa o pipeline normal
-        resultado_crew = pesquisar_startups_por_vcs(lista_vcs)
+        # Executa o pipeline normal (uma Crew por VC, em paralelo)
+        resultado = pesquisar_startups_por_vcs(lista_vcs)
+        dados_json = resultado["resultado"]
+        metadados = {"por_vc": resultado["por_vc"]}
 
-        # Garante que temos uma string para processar
-        resultado_raw_string = getattr(resultado_crew, "raw", None)
-        if not resultado_raw_string:
+        if not dados_json:
             return jsonify({
                 "erro": "Não foi possível obter resultado do agente.",
-                "saida_bruta": str(resultado_crew)
+                "metadados": metadados
             }), 500
 
-        # Tenta transformar em JSON
-        try:
-            dados_json = json.loads(resultado_raw_string)
-        except json.JSONDecodeError:
-            dados_json = {
-                "erro": "A resposta do agente não é um JSON válido.",
-                "saida_bruta": resultado_raw_string
-            }
-
-        # Salvar no banco
-        pesquisa = Pesquisa(
-            vc_list=",".join(lista_vcs),
-            resultado=json.dumps(dados_json, ensure_ascii=False),
-            tipo_pesquisa="normal"
-        )
-        db.session.add(pesquisa)
-        db.session.commit()
+        # Salvar no banco (write-behind: serialização e commit fora da requisição)
+        fila_gravacao.enfileirar({
+            "vc_list": ",".join(lista_vcs),
+            "resultado": dados_json,
+            "tipo_pesquisa": "normal",
+            "metadados": metadados
+        })
 
-        return jsonify({"resultado": dados_json})
+        # Resposta parcial: VCs que falharam ficam visíveis no topo, não só em metadados.por_vc
+        vcs_com_erro = [vc for vc, detalhes in resultado["por_vc"].items() if detalhes.get("erro")]
+
+        return jsonify({
+            "resultado": dados_json,
+            "metadados": metadados,
+            "agregados": analytics.agregados_da_lista(dados_json),
+            "vcs_com_erro": vcs_com_erro,
+            "parcial": bool(vcs_com_erro)
+        })
 
     except Exception as e:
         return jsonify({"erro": f"Ocorreu um erro interno: {str(e)}"}), 500
 
 @app.route("/pesquisar-profundo", methods=["POST"])
+@com_admissao(admissao_profunda)
+@com_perfil
 def pesquisar_profundo():
     """Endpoint para pesquisa profunda em múltiplas camadas"""
     try:
@@ -108,8 +313,33 @@ def pesquisar_profundo():
         if not os.environ.get("CEREBRAS_API_KEY"):
             return jsonify({"erro": "CEREBRAS_API_KEY não configurada no arquivo keys.env"}), 500
 
-        # Executa o pipeline profundo
-        resultado = pesquisar_startups_profundo(lista_vcs)
+        # Executa o pipeline profundo (Camada 3 especulativa é opcional)
+        especulativo = bool(data.get("especulativo", False))
+        memoria_limitada = bool(data.get("memoria_limitada", False))
+        orcamento_enriquecimento = data.get("orcamento_enriquecimento")
+        if orcamento_enriquecimento is not None:
+            try:
+                orcamento_enriquecimento = max(0, int(orcamento_enriquecimento))
+            except (TypeError, ValueError):
+                return jsonify({"erro": "orcamento_enriquecimento deve ser um número inteiro"}), 400
+
+        # Orçamento de latência: devolve o que houver quando o prazo acabar
+        prazo_segundos = data.get("prazo_segundos")
+        if prazo_segundos is not None:
+            try:
+                prazo_segundos = float(prazo_segundos)
+            except (TypeError, ValueError):
+                prazo_segundos = 0
+            if prazo_segundos <= 0:
+                return jsonify({"erro": "prazo_segundos deve ser um número positivo"}), 400
+
+        resultado = pesquisar_startups_profundo(
+            lista_vcs,
+            especulativo=especulativo,
+            memoria_limitada=memoria_limitada,
+            orcamento_enriquecimento=orcamento_enriquecimento,
+            prazo_segundos=prazo_segundos
+        )
 
         # Verificar se houve erro
         if "erro" in resultado:
@@ -119,25 +349,144 @@ def pesquisar_profundo():
         dados_json = resultado.get("resultado", [])
         metadados = resultado.get("metadados", {})
 
-        # Salvar no banco
-        pesquisa = Pesquisa(
-            vc_list=",".join(lista_vcs),
-            resultado=json.dumps(dados_json, ensure_ascii=False),
-            tipo_pesquisa="profunda",
-            metadados=json.dumps(metadados, ensure_ascii=False)
-        )
-        db.session.add(pesquisa)
-        db.session.commit()
+        # Salvar no banco (write-behind)
+        fila_gravacao.enfileirar({
+            "vc_list": ",".join(lista_vcs),
+            "resultado": dados_json,
+            "tipo_pesquisa": "profunda",
+            "metadados": metadados
+        })
 
         return jsonify({
             "resultado": dados_json,
             "metadados": metadados,
+            "agregados": analytics.agregados_da_lista(dados_json),
             "tipo": "pesquisa_profunda"
         })
 
     except Exception as e:
         return jsonify({"erro": f"Erro na pesquisa profunda: {str(e)}"}), 500
 
+def carregar_snapshot_vc(vc_name):
+    """
+    Reconstrói o portfólio mais recente de uma VC a partir do banco
+
+    Parte da última pesquisa completa (normal ou profunda) com startups da VC
+    e aplica, em ordem, os deltas das atualizações incrementais posteriores.
+
+    Returns:
+        tuple: (lista de startups, id da pesquisa mais recente usada ou None)
+    """
+    chave = vc_index.chave_vc(vc_name)
+    deltas = []
+    base = []
+    pesquisa_mais_recente = None
+
+    # Só as pesquisas desta VC (chave exata), da mais recente para a mais antiga
+    with db.engine.connect() as connection:
+        ids = vc_index.pesquisas_da_vc(connection.connection, vc_name)
+    for pesquisa_id in ids:
+        p = db.session.get(Pesquisa, pesquisa_id)
+        if p is None:
+            continue
+        try:
+            resultado = json.loads(p.resultado)
+        except (TypeError, ValueError):
+            continue
+        if not isinstance(resultado, list):
+            continue
+        startups = [
+            Startup.de_dict(s) for s in resultado
+            if isinstance(s, dict) and vc_index.chave_vc(s.get("vc_investidor")) == chave
+        ]
+        if p.tipo_pesquisa == "incremental":
+            deltas.append(startups)
+            pesquisa_mais_recente = pesquisa_mais_recente or p.id
+            continue
+        if startups:
+            base = startups
+            pesquisa_mais_recente = pesquisa_mais_recente or p.id
+            break
+
+    if not base:
+        # Sem pesquisa completa, os deltas não têm sobre o que ser aplicados
+        return [], None
+
+    portfolio = base
+    for delta in reversed(deltas):
+        portfolio = aplicar_delta(portfolio, delta)
+    return portfolio, pesquisa_mais_recente
+
+@app.route("/pesquisar-incremental", methods=["POST"])
+@com_admissao(admissao_profunda)
+@com_perfil
+def pesquisar_incremental():
+    """Atualiza portfólios já pesquisados e salva apenas o delta"""
+    try:
+        data = request.json
+        lista_vcs = data.get("vc_list", [])
+
+        if not lista_vcs:
+            return jsonify({"erro": "vc_list é obrigatório"}), 400
+
+        if not os.environ.get("EXA_API_KEY"):
+            return jsonify({"erro": "EXA_API_KEY não configurada no arquivo keys.env"}), 500
+        if not os.environ.get("CEREBRAS_API_KEY"):
+            return jsonify({"erro": "CEREBRAS_API_KEY não configurada no arquivo keys.env"}), 500
+
+        orcamento_enriquecimento = data.get("orcamento_enriquecimento")
+        if orcamento_enriquecimento is not None:
+            try:
+                orcamento_enriquecimento = max(0, int(orcamento_enriquecimento))
+            except (TypeError, ValueError):
+                return jsonify({"erro": "orcamento_enriquecimento deve ser um número inteiro"}), 400
+
+        # A incremental logo após uma pesquisa da mesma VC precisa enxergá-la:
+        # espera curta pela fila de gravação (sem travar a requisição se o banco
+        # estiver lento). Se a fila não esvaziar, o snapshot pode não ter a última pesquisa
+        snapshot_em_dia = fila_gravacao.aguardar(timeout=0.5)
+        if not snapshot_em_dia:
+            tracing.anotar(snapshot_possivelmente_desatualizado=True)
+
+        # Snapshot anterior de cada VC (vazio = pesquisa completa)
+        snapshots = {}
+        pesquisas_base = {}
+        for vc_name in lista_vcs:
+            snapshots[vc_name], pesquisas_base[vc_name] = carregar_snapshot_vc(vc_name)
+
+        resultado = pesquisar_atualizacao_incremental(
+            snapshots,
+            orcamento_enriquecimento=orcamento_enriquecimento
+        )
+
+        if "erro" in resultado:
+            return jsonify(resultado), 500
+
+        delta = resultado.get("delta", [])
+        metadados = resultado.get("metadados", {})
+        metadados["pesquisas_base"] = pesquisas_base
+        metadados["snapshot_possivelmente_desatualizado"] = not snapshot_em_dia
+
+        # Salva só o que mudou; o portfólio completo é reconstruído sob demanda
+        fila_gravacao.enfileirar({
+            "vc_list": ",".join(lista_vcs),
+            "resultado": delta,
+            "tipo_pesquisa": "incremental",
+            "metadados": metadados
+        })
+
+        portfolio = resultado.get("resultado", [])
+        return jsonify({
+            "resultado": portfolio,
+            "delta": delta,
+            "metadados": metadados,
+            "agregados": analytics.agregados_da_lista(portfolio),
+            "tipo": "pesquisa_incremental"
+        })
+
+    except Exception as e:
+        return jsonify({"erro": f"Erro na atualização incremental: {str(e)}"}), 500
+
 @app.route("/historico", methods=["GET"])
 def historico():
     """Lista histórico de pesquisas (normal e profunda)"""
@@ -163,17 +512,98 @@ def historico():
     
     return jsonify(historico)
 
+@app.route("/buscar", methods=["GET"])
+def buscar():
+    """Busca textual ranqueada sobre startups e fontes de todo o histórico"""
+    consulta = request.args.get("q", "").strip()
+    if not consulta:
+        return jsonify({"erro": "Parâmetro q é obrigatório"}), 400
+    
+    tipo = request.args.get("tipo", "todos")
+    if tipo not in ("startups", "fontes", "todos"):
+        return jsonify({"erro": "tipo deve ser startups, fontes ou todos"}), 400
+    
+    try:
+        limite = min(max(int(request.args.get("limite", 20)), 1), 100)
+    except ValueError:
+        return jsonify({"erro": "limite deve ser um número inteiro"}), 400
+    
+    with db.engine.connect() as connection:
+        resultado = fts_index.buscar(connection.connection, consulta, limite=limite, tipo=tipo)
+    
+    return jsonify({"consulta": consulta, **resultado})
+
+@app.route("/analytics", methods=["GET"])
+def analytics_historico():
+    """Totais, setores, anos e VCs de todo o histórico (lidos dos agregados)"""
+    try:
+        limite = min(max(int(request.args.get("limite", 20)), 1), 500)
+    except ValueError:
+        return jsonify({"erro": "limite deve ser um número inteiro"}), 400
+
+    with db.engine.connect() as connection:
+        agregados = analytics.ler_agregados(connection.connection, limite=limite)
+    return jsonify(agregados)
+
+@app.route("/proveniencia", methods=["GET"])
+def proveniencia():
+    """Mostra de quais fontes armazenadas veio cada campo de uma startup"""
+    startup = request.args.get("startup", "").strip()
+    if not startup:
+        return jsonify({"erro": "Parâmetro startup é obrigatório"}), 400
+    
+    vc = request.args.get("vc") or None
+    campos = source_store.obter_proveniencia(startup, vc)
+    
+    # Opcionalmente inclui o conteúdo completo das fontes (lido do armazenamento local)
+    if request.args.get("conteudo") == "1":
+        hashes = {f["hash"] for fontes in campos.values() for f in fontes}
+        conteudos = {f["hash"]: f["content"] for f in source_store.carregar_fontes(hashes)}
+        for fontes in campos.values():
+            for f in fontes:
+                f["conteudo"] = conteudos.get(f["hash"])
+    
+    return jsonify({"startup": startup, "vc": vc, "campos": campos})
+
+@app.route("/perfis/<perfil_id>", methods=["GET"])
+def baixar_perfil(perfil_id):
+    """Download de um perfil salvo (?formato=pstats ou collapsed)"""
+    if not profiling.perfil_autorizado(config_perfilamento, request.headers.get("X-Perfil-Token")):
+        return jsonify({"erro": "Perfilamento desabilitado"}), 403
+
+    caminho = profiling.caminho_perfil(perfil_id, request.args.get("formato", "collapsed"))
+    if not caminho:
+        return jsonify({"erro": "Perfil não encontrado"}), 404
+    return send_file(caminho, as_attachment=True)
+
 @app.route("/status", methods=["GET"])
 def status():
     """Verifica status das APIs e configurações"""
+    with db.engine.connect() as connection:
+        contagens = analytics.ler_totais(connection.connection)
+    por_tipo = contagens["por_tipo"]
     status_info = {
         "exa_api_configurada": bool(os.environ.get("EXA_API_KEY")),
         "cerebras_api_configurada": bool(os.environ.get("CEREBRAS_API_KEY")),
         "openai_api_configurada": bool(os.environ.get("OPENAI_API_KEY")),
         "perplexity_api_configurada": bool(os.environ.get("PERPLEXITY_API_KEY")),
-        "total_pesquisas": Pesquisa.query.count(),
-        "pesquisas_normais": Pesquisa.query.filter_by(tipo_pesquisa="normal").count(),
-        "pesquisas_profundas": Pesquisa.query.filter_by(tipo_pesquisa="profunda").count()
+        "total_pesquisas": contagens["totais"]["pesquisas"],
+        "pesquisas_normais": por_tipo.get("normal", {}).get("pesquisas", 0),
+        "pesquisas_profundas": por_tipo.get("profunda", {}).get("pesquisas", 0),
+        "rotas_llm": obter_estatisticas_rotas(),
+        "armazenamento_fontes": source_store.estatisticas(),
+        "cache_atributos": entity_cache.estatisticas(),
+        "qualidade_parse_json": obter_estatisticas_parse(),
+        "filtro_relevancia": obter_estatisticas_filtro(),
+        "hedging": obter_estatisticas_hedging(),
+        "circuit_breakers": obter_estados_disjuntores(),
+        "admissao": {
+            "pesquisa_normal": admissao_normal.metricas(),
+            "pesquisa_profunda": admissao_profunda.metricas()
+        },
+        "rastreamento": tracing.metricas(),
+        "persistencia": fila_gravacao.metricas(),
+        "aquecimento_cache": aquecedor_cache.metricas()
     }
     return jsonify(status_info)
 
@@ -0,0 +1,135 @@
+# arquivo: benchmarks/bench_deep_memory.py
+"""
+Pico de memória do pipeline profundo com e sem o modo de memória limitada
+
+Roda executar_pesquisa_profunda com busca e IA simuladas (sem rede) sobre
+uma lista longa de VCs e mede o pico de memória com tracemalloc. Falha se,
+no modo limitado, houver mais de uma VC de startups em memória durante a
+pesquisa; com --teto-mb, falha também se o pico passar do teto.
+
+Uso:
+    python benchmarks/bench_deep_memory.py [--vcs 50] [--tamanho-fonte 4000] [--teto-mb 20]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), "src"))
+
+# Fontes, cache de atributos, traces e resultados parciais em diretório
+# temporário (nada do benchmark vai para data/)
+_TMP = tempfile.mkdtemp(prefix="bench_memoria_")
+os.environ["FONTES_DB_PATH"] = os.path.join(_TMP, "fontes.db")
+os.environ["ATRIBUTOS_DB_PATH"] = os.path.join(_TMP, "atributos.db")
+os.environ["TRACE_PATH"] = os.path.join(_TMP, "traces.jsonl")
+
+from pipelines import deep_pipeline_manager  # noqa: E402
+from utils.source_store import calcular_hash  # noqa: E402
+
+deep_pipeline_manager.RESULTADOS_PARCIAIS_DIR = os.path.join(_TMP, "resultados_parciais")
+
+
+def criar_busca_simulada(tamanho_fonte):
+    contador = [0]
+    
+    def search_func(query, num_results=10):
+        fontes = []
+        for i in range(num_results):
+            contador[0] += 1
+            conteudo = (f"{query} fonte {contador[0]} " * (tamanho_fonte // 20))[:tamanho_fonte]
+            fontes.append({
+                "title": f"Fonte {contador[0]}",
+                "content": conteudo,
+                "url": f"https://exemplo.com/{contador[0]}",
+                "score": 1.0 / (i + 1),
+                "hash": calcular_hash(conteudo)
+            })
+        return fontes
+    
+    return search_func
+
+
+def analyze_func(prompt, max_tokens=None, temperature=0.1, rota="padrao"):
+    if rota == "enriquecimento":
+        return json.dumps({"site": "https://startup.com", "rodada": "Série A"})
+    if rota == "enriquecimento_lote":
+        nomes = [linha[2:] for linha in prompt.split("\n") if linha.startswith("- ")]
+        return json.dumps({nome: {"rodada": "Série A", "valor_investimento": "US$ 5 milhões"} for nome in nomes})
+    vc = prompt.split("VC Investidor: ", 1)[1].split("\n", 1)[0] if "VC Investidor: " in prompt else "VC"
+    return json.dumps([
+        {
+            "nome": f"{vc} Startup {i}",
+            "site": "Não informado",
+            "setor": "Fintech",
+            "ano_fundacao": "2019",
+            "valor_investimento": "Não informado",
+            "rodada": "Não informado",
+            "data_investimento": "2022",
+            "vc_investidor": vc,
+            "descricao_breve": "Plataforma de pagamentos.",
+            "linkedin_fundador": "Não informado"
+        }
+        for i in range(10)
+    ], ensure_ascii=False)
+
+
+def medir(lista_vcs, tamanho_fonte, memoria_limitada):
+    search_func = criar_busca_simulada(tamanho_fonte)
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        resultado = deep_pipeline_manager.executar_pesquisa_profunda(
+            lista_vcs, search_func, analyze_func, memoria_limitada=memoria_limitada
+        )
+    duracao = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    detalhes = resultado["metadados"]["detalhes_por_vc"].values()
+    return {
+        "pico_startups": resultado["metadados"].get("pico_startups_em_memoria"),
+        "maior_vc": max((d.get("startups_encontradas", 0) for d in detalhes), default=0),
+        "pico_mb": round(pico / 1e6, 2),
+        "duracao_s": round(duracao, 2),
+        "startups": len(resultado.get("resultado", [])),
+        "fontes": resultado["metadados"]["total_fontes"]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pico de memória do pipeline profundo")
+    parser.add_argument("--vcs", type=int, default=50)
+    parser.add_argument("--tamanho-fonte", type=int, default=4000, help="caracteres por fonte")
+    parser.add_argument("--teto-mb", type=float, default=None, help="falha se o modo limitado passar disso")
+    args = parser.parse_args()
+    
+    lista_vcs = [f"VC {i}" for i in range(args.vcs)]
+    
+    padrao = medir(lista_vcs, args.tamanho_fonte, memoria_limitada=False)
+    limitado = medir(lista_vcs, args.tamanho_fonte, memoria_limitada=True)
+    
+    print(f"{args.vcs} VCs, fontes de {args.tamanho_fonte} caracteres\n")
+    print(f"  {'modo':20s} {'pico (MB)':>10s} {'tempo (s)':>10s} {'startups':>9s} {'fontes':>7s}")
+    for nome, r in (("padrão", padrao), ("memória limitada", limitado)):
+        print(f"  {nome:20s} {r['pico_mb']:10.2f} {r['duracao_s']:10.2f} {r['startups']:9d} {r['fontes']:7d}")
+    
+    print(f"\n  startups em memória no modo limitado: pico {limitado['pico_startups']}, "
+          f"maior VC {limitado['maior_vc']}")
+    assert limitado["pico_startups"] <= limitado["maior_vc"], (
+        f"modo limitado manteve {limitado['pico_startups']} startups em memória "
+        f"(uma VC tem no máximo {limitado['maior_vc']})"
+    )
+    
+    if args.teto_mb is not None and limitado["pico_mb"] > args.teto_mb:
+        print(f"\n❌ Pico do modo limitado ({limitado['pico_mb']} MB) acima do teto de {args.teto_mb} MB")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
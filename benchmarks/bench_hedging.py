@@ -0,0 +1,83 @@
+# arquivo: benchmarks/bench_hedging.py
+"""
+Benchmark de hedging (src/utils/hedging.py)
+
+Simula um provedor com cauda longa (a maioria das chamadas perto da mediana e
+uma fração pequena muito lenta) e compara p50/p95/p99 com e sem hedge, além
+do percentual de chamadas extras gasto pelo orçamento.
+
+Uso:
+    python benchmarks/bench_hedging.py [--chamadas 600] [--lentas 0.03]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), "src"))
+
+from utils.hedging import CONFIG_PADRAO, Hedger, _percentil  # noqa: E402
+
+
+def criar_provedor(mediana, fracao_lentas, fator_lentidao, semente):
+    aleatorio = random.Random(semente)
+
+    def chamada(_query):
+        latencia = aleatorio.lognormvariate(0, 0.25) * mediana
+        if aleatorio.random() < fracao_lentas:
+            latencia *= fator_lentidao
+        time.sleep(latencia)
+        return latencia
+
+    return chamada
+
+
+def medir(hedger, chamada, total, concorrencia):
+    latencias = []
+
+    def executar(i):
+        inicio = time.perf_counter()
+        hedger.executar(chamada, f"query {i}")
+        latencias.append(time.perf_counter() - inicio)
+
+    with ThreadPoolExecutor(max_workers=concorrencia) as executor:
+        list(executor.map(executar, range(total)))
+    return latencias
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chamadas", type=int, default=600)
+    parser.add_argument("--concorrencia", type=int, default=8)
+    parser.add_argument("--mediana-ms", type=float, default=40)
+    parser.add_argument("--lentas", type=float, default=0.03, help="Fração de chamadas lentas")
+    parser.add_argument("--fator", type=float, default=15, help="Quantas vezes mais lentas")
+    parser.add_argument("--percentil", type=float, default=CONFIG_PADRAO["percentil"])
+    parser.add_argument("--orcamento", type=float, default=CONFIG_PADRAO["orcamento_percentual"],
+                        help="Hedges permitidos (%% das chamadas)")
+    args = parser.parse_args()
+
+    base = {**CONFIG_PADRAO, "percentil": args.percentil, "orcamento_percentual": args.orcamento,
+            "atraso_minimo_ms": 0}
+    print(f"📦 {args.chamadas} chamadas, concorrência {args.concorrencia}, mediana {args.mediana_ms:.0f} ms, "
+          f"{args.lentas:.0%} lentas (×{args.fator:.0f})")
+    print(f"  {'modo':<12}{'p50 (ms)':>10}{'p95 (ms)':>10}{'p99 (ms)':>10}{'extras':>9}{'vencedores':>12}")
+
+    for modo, habilitado in (("sem hedge", False), ("com hedge", True)):
+        hedger = Hedger("bench", {**base, "habilitado": habilitado})
+        chamada = criar_provedor(args.mediana_ms / 1000, args.lentas, args.fator, semente=42)
+        latencias = medir(hedger, chamada, args.chamadas, args.concorrencia)
+        metricas = hedger.metricas()
+        print(f"  {modo:<12}"
+              f"{_percentil(latencias, 50) * 1000:>10.1f}"
+              f"{_percentil(latencias, 95) * 1000:>10.1f}"
+              f"{_percentil(latencias, 99) * 1000:>10.1f}"
+              f"{metricas['chamadas_extras_percentual']:>8.1f}%"
+              f"{metricas['hedges_vencedores']:>12}")
+
+
+if __name__ == "__main__":
+    main()
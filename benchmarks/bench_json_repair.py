@@ -0,0 +1,128 @@
+# arquivo: benchmarks/bench_json_repair.py
+"""
+Benchmark do parser tolerante de JSON (src/utils/json_repair.py)
+
+Verifica o corpus de respostas quebradas em fixtures/respostas_json contra
+esperado.json, compara quantos objetos o parser antigo recuperava e mede a
+vazão em respostas/s e MB/s.
+
+Uso:
+    python benchmarks/bench_json_repair.py [--iteracoes 2000]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), "src"))
+
+from utils.json_repair import reparar_json  # noqa: E402
+
+FIXTURES_DIR = os.path.join(BENCH_DIR, "fixtures", "respostas_json")
+
+
+def parser_antigo(response):
+    """Comportamento anterior de processar_resposta_json, para comparação"""
+    try:
+        cleaned = response.strip()
+        if cleaned.startswith('```'):
+            lines = cleaned.split('\n')
+            cleaned = '\n'.join(lines[1:-1] if len(lines) > 2 else lines[1:])
+        json_start = cleaned.find('[') if '[' in cleaned else cleaned.find('{')
+        json_end = cleaned.rfind(']') + 1 if ']' in cleaned else cleaned.rfind('}') + 1
+        if json_start != -1 and json_end > json_start:
+            return json.loads(cleaned[json_start:json_end])
+        return []
+    except Exception:
+        return []
+
+
+def contar_objetos(dados):
+    if isinstance(dados, list):
+        return len(dados)
+    return 1 if dados else 0
+
+
+def carregar_corpus():
+    with open(os.path.join(FIXTURES_DIR, "esperado.json"), encoding="utf-8") as f:
+        esperado = json.load(f)
+    corpus = {}
+    for nome in sorted(esperado):
+        with open(os.path.join(FIXTURES_DIR, nome), encoding="utf-8") as f:
+            corpus[nome] = f.read()
+    return corpus, esperado
+
+
+def resposta_sintetica_truncada(n_startups=100):
+    """Resposta grande no formato da extração (5000 tokens), cortada no meio do último objeto"""
+    startup = {
+        "nome": "Startup {i}", "site": "https://startup{i}.com", "setor": "Fintech",
+        "ano_fundacao": "2019", "valor_investimento": "US$ 12 milhões", "rodada": "Série A",
+        "data_investimento": "2022-05-10", "vc_investidor": "Kaszek Ventures",
+        "descricao_breve": "Plataforma de pagamentos para pequenas empresas.",
+        "linkedin_fundador": "Não informado"
+    }
+    itens = [json.dumps({k: v.replace("{i}", str(i)) for k, v in startup.items()}, ensure_ascii=False)
+             for i in range(n_startups)]
+    texto = "```json\n[\n  " + ",\n  ".join(itens) + ",\n]\n```"
+    return texto[:-40]
+
+
+def medir(func, textos, iteracoes):
+    total_bytes = sum(len(t.encode("utf-8")) for t in textos) * iteracoes
+    inicio = time.perf_counter()
+    for _ in range(iteracoes):
+        for texto in textos:
+            func(texto)
+    duracao = time.perf_counter() - inicio
+    return {
+        "respostas_por_s": round(len(textos) * iteracoes / duracao, 1),
+        "mb_por_s": round(total_bytes / duracao / 1e6, 2)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iteracoes", type=int, default=2000)
+    args = parser.parse_args()
+    
+    corpus, esperado = carregar_corpus()
+    
+    print(f"{'fixture':45s} {'esperado':>16s} {'obtido':>16s} {'antigo':>7s}")
+    divergencias = 0
+    total_novo = total_antigo = 0
+    for nome, texto in corpus.items():
+        dados, qualidade = reparar_json(texto)
+        antigo = contar_objetos(parser_antigo(texto))
+        total_novo += qualidade["objetos"]
+        total_antigo += antigo
+        ok = (qualidade["status"] == esperado[nome]["status"]
+              and qualidade["objetos"] == esperado[nome]["objetos"])
+        divergencias += 0 if ok else 1
+        print(f"{nome:45s} {esperado[nome]['status'] + '/' + str(esperado[nome]['objetos']):>16s} "
+              f"{qualidade['status'] + '/' + str(qualidade['objetos']):>16s} {antigo:>7d} "
+              f"{'' if ok else '  <-- DIVERGENTE'}")
+    
+    print(f"\nObjetos recuperados: {total_novo} (parser antigo: {total_antigo})")
+    
+    textos = list(corpus.values())
+    print(f"\nVazão no corpus ({args.iteracoes} iterações):")
+    print(f"  reparar_json:  {medir(reparar_json, textos, args.iteracoes)}")
+    print(f"  parser antigo: {medir(parser_antigo, textos, args.iteracoes)}")
+    
+    grande = resposta_sintetica_truncada()
+    iteracoes_grande = max(1, args.iteracoes // 10)
+    _, qualidade = reparar_json(grande)
+    print(f"\nResposta sintética truncada ({len(grande)} bytes, {qualidade['objetos']} objetos recuperados):")
+    print(f"  reparar_json:  {medir(reparar_json, [grande], iteracoes_grande)}")
+    
+    if divergencias:
+        print(f"\n❌ {divergencias} fixture(s) divergentes")
+        sys.exit(1)
+    print("\n✅ Corpus conferido")
+
+
+if __name__ == "__main__":
+    main()
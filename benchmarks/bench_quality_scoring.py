@@ -0,0 +1,129 @@
+# arquivo: benchmarks/bench_quality_scoring.py
+"""
+Micro-benchmarks da pontuação de qualidade (src/utils/quality_scoring.py)
+
+Compara, sobre startups sintéticas, a implementação anterior (três passadas
+com listas de campos próprias) com a passada única e o caminho colunar, e
+confere que os números batem.
+
+Uso:
+    python benchmarks/bench_quality_scoring.py [--startups 100000] [--repeticoes 5]
+"""
+import argparse
+import heapq
+import os
+import random
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), "src"))
+
+from utils.quality_scoring import (  # noqa: E402
+    CAMPOS_STARTUP, NUMPY_DISPONIVEL, calcular_scores, pontuar_startups, pontuar_colunar, para_colunas
+)
+
+VAZIOS_ANTIGOS = ["Não informado", "—", ""]
+
+
+def startups_sinteticas(n, seed=42):
+    rng = random.Random(seed)
+    startups = []
+    for i in range(n):
+        startup = {}
+        for campo in CAMPOS_STARTUP:
+            sorteio = rng.random()
+            if sorteio < 0.25:
+                startup[campo] = "Não informado"
+            elif sorteio < 0.28:
+                startup[campo] = "—"
+            else:
+                startup[campo] = f"{campo}-{i}"
+        startups.append(startup)
+    return startups
+
+
+def relatorio_antigo(startups):
+    """verificar_completude_dados + análise por campo de gerar_relatorio_qualidade (versão anterior)"""
+    completas = 0
+    for startup in startups:
+        preenchidos = sum(
+            1 for campo in CAMPOS_STARTUP
+            if startup.get(campo) and startup.get(campo) not in VAZIOS_ANTIGOS
+        )
+        if preenchidos >= 7:
+            completas += 1
+    media = sum(
+        sum(1 for campo in CAMPOS_STARTUP if s.get(campo) and s.get(campo) not in VAZIOS_ANTIGOS)
+        for s in startups
+    ) / len(startups)
+    por_campo = {
+        campo: sum(1 for s in startups if s.get(campo) and s.get(campo) not in VAZIOS_ANTIGOS)
+        for campo in CAMPOS_STARTUP
+    }
+    return completas, round(media, 1), por_campo
+
+
+def selecao_antiga(startups, limite=10):
+    """selecionar_melhores_startups anterior (muta os dicts com _completude_score)"""
+    for startup in startups:
+        startup['_completude_score'] = sum(
+            1 for v in startup.values() if v and v != "Não informado" and v != "—"
+        )
+    ordenadas = sorted(startups, key=lambda x: x.get('_completude_score', 0), reverse=True)
+    melhores = ordenadas[:limite]
+    for s in startups:
+        s.pop('_completude_score', None)
+    return melhores
+
+
+def selecao_nova(startups, limite=10):
+    scores = calcular_scores(startups)
+    ordem = heapq.nlargest(limite, range(len(startups)), key=scores.__getitem__)
+    return [startups[i] for i in ordem]
+
+
+def cronometrar(func, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        func()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks da pontuação de qualidade")
+    parser.add_argument("--startups", type=int, default=100000)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+    
+    startups = startups_sinteticas(args.startups)
+    colunas = para_colunas(startups)
+    
+    # Conferência de consistência
+    completas, media, por_campo = relatorio_antigo(startups)
+    novo = pontuar_startups(startups)
+    colunar = pontuar_colunar(colunas)
+    assert novo["completas"] == completas == colunar["completas"]
+    assert novo["media_campos_preenchidos"] == media == colunar["media_campos_preenchidos"]
+    assert {c: v["preenchidos"] for c, v in novo["por_campo"].items()} == por_campo
+    assert {c: v["preenchidos"] for c, v in colunar["por_campo"].items()} == por_campo
+    assert calcular_scores(startups) == novo["scores"] == list(colunar["scores"])
+    
+    print(f"{args.startups} startups sintéticas, melhor de {args.repeticoes} execuções "
+          f"(numpy: {'sim' if NUMPY_DISPONIVEL else 'não'})\n")
+    resultados = [
+        ("relatório: implementação anterior (3 passadas)", lambda: relatorio_antigo(startups)),
+        ("relatório: pontuar_startups (passada única)", lambda: pontuar_startups(startups)),
+        ("relatório: pontuar_colunar", lambda: pontuar_colunar(colunas)),
+        ("relatório: para_colunas + pontuar_colunar", lambda: pontuar_colunar(para_colunas(startups))),
+        ("seleção top 10: anterior (muta dicts)", lambda: selecao_antiga(startups)),
+        ("seleção top 10: calcular_scores (sem mutar)", lambda: selecao_nova(startups)),
+    ]
+    for nome, func in resultados:
+        print(f"  {nome:50s} {cronometrar(func, args.repeticoes):9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
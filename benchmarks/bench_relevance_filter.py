@@ -0,0 +1,105 @@
+# arquivo: benchmarks/bench_relevance_filter.py
+"""
+Benchmark do pré-filtro de relevância (src/utils/relevance_filter.py)
+
+Para cada conjunto de fontes em fixtures/fontes_exa (resultados sintéticos de
+busca com anúncios de investimento, listas de portfólio e páginas
+irrelevantes), monta o contexto como extrair_startups_de_fontes faz (10
+primeiras fontes, até 4000 caracteres cada) com e sem o filtro e compara:
+
+- tokens do contexto (≈ caracteres / 4) e quanto o filtro economizou;
+- startups esperadas cujo nome ainda aparece no contexto (perdidas = estavam
+  no contexto sem filtro e sumiram com ele; recuperadas = o inverso).
+
+Também varre uma grade de limiares para escolher os valores do config.json.
+
+Uso:
+    python benchmarks/bench_relevance_filter.py [--iteracoes 200]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), "src"))
+
+from utils.relevance_filter import CONFIG_PADRAO, carregar_config, filtrar_fontes  # noqa: E402
+
+FIXTURES_DIR = os.path.join(BENCH_DIR, "fixtures", "fontes_exa")
+MAX_FONTES = 10
+LIMITE_CARACTERES = 4000
+
+
+def carregar_fixtures():
+    fixtures = []
+    for nome in sorted(os.listdir(FIXTURES_DIR)):
+        if nome.endswith(".json"):
+            with open(os.path.join(FIXTURES_DIR, nome), encoding="utf-8") as f:
+                fixtures.append(json.load(f))
+    return fixtures
+
+
+def montar_contexto(fontes):
+    """Mesmo recorte usado no prompt de extração"""
+    return "\n\n".join(
+        f"=== {f['title']} ===\n{f['content'][:LIMITE_CARACTERES]}" for f in fontes[:MAX_FONTES]
+    )
+
+
+def avaliar(fixtures, config):
+    """Tokens e startups presentes no contexto, com e sem filtro"""
+    total = {"tokens_antes": 0, "tokens_depois": 0, "perdidas": [], "recuperadas": [], "esperadas": 0}
+    for fixture in fixtures:
+        contexto_antes = montar_contexto(fixture["fontes"])
+        filtradas, _ = filtrar_fontes(fixture["fontes"], fixture["vc"], LIMITE_CARACTERES, config)
+        contexto_depois = montar_contexto(filtradas)
+
+        total["tokens_antes"] += len(contexto_antes) // 4
+        total["tokens_depois"] += len(contexto_depois) // 4
+        total["esperadas"] += len(fixture["startups_esperadas"])
+        for nome in fixture["startups_esperadas"]:
+            antes, depois = nome in contexto_antes, nome in contexto_depois
+            if antes and not depois:
+                total["perdidas"].append(f"{fixture['vc']}: {nome}")
+            elif depois and not antes:
+                total["recuperadas"].append(f"{fixture['vc']}: {nome}")
+    total["economia_pct"] = round((1 - total["tokens_depois"] / total["tokens_antes"]) * 100, 1)
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iteracoes", type=int, default=200, help="Repetições para medir o tempo do filtro")
+    args = parser.parse_args()
+
+    fixtures = carregar_fixtures()
+    config = {**CONFIG_PADRAO, **carregar_config(), "habilitado": True}
+
+    resultado = avaliar(fixtures, config)
+    print(f"📦 {len(fixtures)} conjuntos de fontes, {resultado['esperadas']} startups esperadas")
+    print(f"Config atual (descarte={config['limiar_descarte']}, truncamento={config['limiar_truncamento']}):")
+    print(f"  tokens: {resultado['tokens_antes']} → {resultado['tokens_depois']} "
+          f"({resultado['economia_pct']}% economizados)")
+    print(f"  startups perdidas: {len(resultado['perdidas'])} {resultado['perdidas'] or ''}")
+    print(f"  startups recuperadas: {len(resultado['recuperadas'])} {resultado['recuperadas'] or ''}")
+
+    inicio = time.perf_counter()
+    for _ in range(args.iteracoes):
+        for fixture in fixtures:
+            filtrar_fontes(fixture["fontes"], fixture["vc"], LIMITE_CARACTERES, config)
+    duracao = (time.perf_counter() - inicio) / (args.iteracoes * len(fixtures))
+    print(f"  tempo por chamada: {duracao * 1000:.2f} ms")
+
+    print("\nGrade de limiares (descarte × truncamento): economia% / perdidas / recuperadas")
+    for descarte in (0.0, 0.1, 0.2, 0.3, 0.4):
+        linha = []
+        for truncamento in (0.0, 0.3, 0.45, 0.6):
+            r = avaliar(fixtures, {**config, "limiar_descarte": descarte, "limiar_truncamento": truncamento})
+            linha.append(f"{r['economia_pct']:5.1f}% / {len(r['perdidas'])} / {len(r['recuperadas'])}")
+        print(f"  {descarte:.1f}: " + " | ".join(linha))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+# arquivo: benchmarks/bench_startup_record.py
+"""
+Benchmark do registro compacto de startup (src/utils/startup_record.py)
+
+Monta um histórico sintético como o do banco (pesquisas com 10 a 30 startups
+em JSON, setores/rodadas/VCs repetidos e muitos "Não informado") e compara,
+com tracemalloc, a memória para manter todo o histórico carregado:
+
+- dicts: json.loads de cada pesquisa (como era antes);
+- registros: startup_record.de_json (slots + valores categóricos internados).
+
+Também mede o tempo de leitura (JSON → objetos), de escrita (objetos → JSON)
+e da pontuação de completude (calcular_scores e pontuar_startups), que lê os
+campos de cada startup.
+
+Uso:
+    python benchmarks/bench_startup_record.py [--startups 200000]
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), "src"))
+
+from utils.quality_scoring import calcular_scores, pontuar_startups  # noqa: E402
+from utils.startup_record import de_json, para_json  # noqa: E402
+
+VCS = ["Sequoia Capital", "SoftBank", "a16z", "Kaszek", "Monashees", "Accel", "Tiger Global", "Valor Capital"]
+SETORES = ["Fintech", "HealthTech", "SaaS", "E-commerce", "EdTech", "PropTech", "Logística", "AgTech"]
+RODADAS = ["Seed", "Série A", "Série B", "Série C", "Pre-Seed", "Não informado"]
+
+
+def startup_sintetica(aleatorio, vc, i):
+    def talvez(valor, chance=0.6):
+        return valor if aleatorio.random() < chance else "Não informado"
+
+    return {
+        "nome": f"{vc.split()[0]} Startup {i}",
+        "site": talvez(f"https://startup{i}.com", 0.7),
+        "setor": aleatorio.choice(SETORES),
+        "ano_fundacao": talvez(str(aleatorio.randint(2010, 2023)), 0.8),
+        "valor_investimento": talvez(f"US$ {aleatorio.randint(1, 200)} milhões", 0.5),
+        "rodada": aleatorio.choice(RODADAS),
+        "data_investimento": talvez(f"{aleatorio.randint(2015, 2024)}-0{aleatorio.randint(1, 9)}", 0.5),
+        "vc_investidor": vc,
+        "descricao_breve": f"Plataforma {i} de {aleatorio.choice(SETORES).lower()} para pequenas empresas.",
+        "linkedin_fundador": talvez(f"https://linkedin.com/in/fundador{i}", 0.3)
+    }
+
+
+def gerar_historico(total, semente=7):
+    """Linhas `resultado` do banco (uma string JSON por pesquisa)"""
+    aleatorio = random.Random(semente)
+    linhas, gerados = [], 0
+    while gerados < total:
+        vc = aleatorio.choice(VCS)
+        quantidade = min(aleatorio.randint(10, 30), total - gerados)
+        startups = [startup_sintetica(aleatorio, vc, gerados + i) for i in range(quantidade)]
+        linhas.append(json.dumps(startups, ensure_ascii=False))
+        gerados += quantidade
+    return linhas
+
+
+def medir_carga(linhas, carregar):
+    """(objetos, bytes retidos, segundos) para carregar todo o histórico"""
+    # Tempo medido sem tracemalloc, que deixa as alocações bem mais lentas
+    inicio = time.perf_counter()
+    historico = [carregar(linha) for linha in linhas]
+    duracao = time.perf_counter() - inicio
+    del historico
+
+    gc.collect()
+    tracemalloc.start()
+    historico = [carregar(linha) for linha in linhas]
+    retidos, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return historico, retidos, duracao
+
+
+def medir_escrita(historico, serializar):
+    inicio = time.perf_counter()
+    for pesquisa in historico:
+        serializar(pesquisa)
+    return time.perf_counter() - inicio
+
+
+def medir_pontuacao(historico):
+    """(segundos de calcular_scores, segundos de pontuar_startups) sobre todas as startups"""
+    startups = [startup for pesquisa in historico for startup in pesquisa]
+    tempos = []
+    for pontuar in (calcular_scores, pontuar_startups):
+        inicio = time.perf_counter()
+        pontuar(startups)
+        tempos.append(time.perf_counter() - inicio)
+    return tempos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--startups", type=int, default=200000)
+    args = parser.parse_args()
+
+    linhas = gerar_historico(args.startups)
+    print(f"📦 {args.startups} startups em {len(linhas)} pesquisas "
+          f"({sum(map(len, linhas)) / 1e6:.1f} MB de JSON)")
+    print(f"  {'modo':<12}{'memória (MB)':>14}{'bytes/startup':>15}{'leitura (s)':>13}{'escrita (s)':>13}"
+          f"{'scores (s)':>12}{'pontuar (s)':>13}")
+
+    resultados = {}
+    for modo, carregar, serializar in (
+        ("dicts", json.loads, lambda p: json.dumps(p, ensure_ascii=False)),
+        ("registros", de_json, para_json),
+    ):
+        historico, retidos, leitura = medir_carga(linhas, carregar)
+        escrita = medir_escrita(historico, serializar)
+        scores, pontuacao = medir_pontuacao(historico)
+        resultados[modo] = retidos
+        print(f"  {modo:<12}{retidos / 1e6:>14.1f}{retidos / args.startups:>15.0f}{leitura:>13.2f}{escrita:>13.2f}"
+              f"{scores:>12.2f}{pontuacao:>13.2f}")
+        del historico
+
+    print(f"\n  economia de memória: {(1 - resultados['registros'] / resultados['dicts']) * 100:.0f}%")
+
+    # Mesmo conteúdo nos dois caminhos
+    amostra = linhas[: min(50, len(linhas))]
+    assert all(json.loads(para_json(de_json(linha))) == json.loads(linha) for linha in amostra)
+    for linha in amostra:
+        assert calcular_scores(de_json(linha)) == calcular_scores(json.loads(linha))
+        assert pontuar_startups(de_json(linha)) == pontuar_startups(json.loads(linha))
+
+
+if __name__ == "__main__":
+    main()
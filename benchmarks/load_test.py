@@ -0,0 +1,377 @@
+# arquivo: benchmarks/load_test.py
+"""
+Teste de carga dos endpoints Flask com pipelines simulados
+
+Sobe o app.py em um subprocesso com pesquisar_startups_por_vcs e
+pesquisar_startups_profundo trocados por stubs com latência configurável,
+usando um banco SQLite separado populado com histórico sintético. Depois
+dispara tráfego misto (/pesquisar, /pesquisar-profundo, /historico, /status)
+em níveis crescentes de concorrência e mede vazão, latência p50/p95/p99 e
+taxa de erro por endpoint. O resultado é salvo em benchmarks/resultados/
+com o commit atual, para comparação entre versões.
+
+Uso:
+    python benchmarks/load_test.py
+    python benchmarks/load_test.py --concorrencia 1 8 32 --duracao 20 --historico 5000
+    python benchmarks/load_test.py --comparar benchmarks/resultados/load_<commit>_<data>.json
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import types
+import urllib.parse
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+RESULTADOS_DIR = os.path.join(BENCH_DIR, "resultados")
+
+# Peso de cada endpoint no tráfego misto
+MIX_PADRAO = {
+    "/pesquisar": 3,
+    "/pesquisar-profundo": 1,
+    "/historico": 2,
+    "/status": 4
+}
+
+VCS = ["Sequoia Capital", "SoftBank", "a16z", "Kaszek", "Monashees", "Accel", "Tiger Global"]
+SETORES = ["Fintech", "HealthTech", "SaaS", "E-commerce", "EdTech", "PropTech", "Logística"]
+RODADAS = ["Seed", "Série A", "Série B", "Série C"]
+
+
+def startup_sintetica(vc, i):
+    return {
+        "nome": f"{vc.split()[0]} Startup {i}",
+        "site": f"https://startup{i}.com",
+        "setor": random.choice(SETORES),
+        "ano_fundacao": str(random.randint(2010, 2023)),
+        "valor_investimento": f"US$ {random.randint(1, 200)} milhões",
+        "rodada": random.choice(RODADAS),
+        "data_investimento": f"{random.randint(2015, 2024)}-0{random.randint(1, 9)}-1{random.randint(0, 9)}",
+        "vc_investidor": vc,
+        "descricao_breve": "Plataforma de pagamentos e infraestrutura para pequenas empresas.",
+        "linkedin_fundador": "Não informado"
+    }
+
+
+# ---------------------------------------------------------------------------
+# Servidor (subprocesso)
+# ---------------------------------------------------------------------------
+
+def instalar_stubs(latencia_normal, latencia_profunda):
+    """Registra módulos de pipeline falsos antes de importar o app"""
+    def pesquisar_startups_por_vcs(lista_vcs):
+        time.sleep(latencia_normal)
+        return {
+            "resultado": [startup_sintetica(vc, i) for vc in lista_vcs for i in range(10)],
+            "por_vc": {vc: {"startups_encontradas": 10, "cache": False} for vc in lista_vcs}
+        }
+    
+    def pesquisar_startups_profundo(lista_vcs, **opcoes):
+        time.sleep(latencia_profunda)
+        return {
+            "resultado": [startup_sintetica(vc, i) for vc in lista_vcs for i in range(10)],
+            "metadados": {"vcs_pesquisadas": lista_vcs, "total_fontes": 12, "total_startups": 10 * len(lista_vcs)}
+        }
+    
+    def pesquisar_atualizacao_incremental(snapshots_anteriores, **opcoes):
+        time.sleep(latencia_normal)
+        delta = [startup_sintetica(vc, 10) for vc in snapshots_anteriores]
+        return {
+            "resultado": [s for anteriores in snapshots_anteriores.values() for s in anteriores] + delta,
+            "delta": delta,
+            "metadados": {"vcs_pesquisadas": list(snapshots_anteriores), "total_delta": len(delta)}
+        }
+    
+    def pesquisar_vc_individual(vc_name, ignorar_cache=False, origem="pesquisa"):
+        time.sleep(latencia_normal)
+        return {"startups": [startup_sintetica(vc_name, i) for i in range(10)], "cache": False}
+    
+    # Mesma interface usada pelo app e pelo aquecimento de cache (pipelines.cache_warming)
+    normal = types.ModuleType("pipelines.pipeline_manager")
+    normal.pesquisar_startups_por_vcs = pesquisar_startups_por_vcs
+    normal.pesquisar_vc_individual = pesquisar_vc_individual
+    normal.idade_cache = lambda vc_name: None
+    normal.CACHE_TTL_SEGUNDOS = 86400
+    profundo = types.ModuleType("pipelines.deep_pipeline_manager")
+    profundo.pesquisar_startups_profundo = pesquisar_startups_profundo
+    profundo.pesquisar_atualizacao_incremental = pesquisar_atualizacao_incremental
+    profundo.aplicar_delta = lambda portfolio, delta: portfolio + delta
+    sys.modules["pipelines.pipeline_manager"] = normal
+    sys.modules["pipelines.deep_pipeline_manager"] = profundo
+
+
+def popular_historico(app_module, total):
+    """Insere `total` pesquisas sintéticas (em lotes) se o banco estiver vazio"""
+    with app_module.app.app_context():
+        if app_module.Pesquisa.query.count() >= total:
+            return
+        lote = []
+        for i in range(total):
+            vcs = random.sample(VCS, random.randint(1, 3))
+            tipo = random.choice(["normal", "profunda"])
+            startups = [startup_sintetica(vc, j) for vc in vcs for j in range(10)]
+            lote.append(app_module.Pesquisa(
+                vc_list=",".join(vcs),
+                resultado=json.dumps(startups, ensure_ascii=False),
+                tipo_pesquisa=tipo,
+                metadados=json.dumps({"vcs_pesquisadas": vcs}, ensure_ascii=False) if tipo == "profunda" else None
+            ))
+            if len(lote) >= 500:
+                app_module.db.session.add_all(lote)
+                app_module.db.session.commit()
+                lote = []
+        if lote:
+            app_module.db.session.add_all(lote)
+            app_module.db.session.commit()
+
+
+def rodar_servidor(args):
+    os.chdir(ROOT_DIR)
+    sys.path.insert(0, ROOT_DIR)
+    sys.path.insert(0, os.path.join(ROOT_DIR, "src"))
+    os.environ.setdefault("EXA_API_KEY", "stub")
+    os.environ.setdefault("CEREBRAS_API_KEY", "stub")
+    
+    instalar_stubs(args.latencia_normal, args.latencia_profunda)
+    import app as app_module
+    
+    popular_historico(app_module, args.historico)
+    print("SERVIDOR_PRONTO", flush=True)
+    app_module.app.run(host="127.0.0.1", port=args.porta, debug=False, threaded=True)
+
+
+# ---------------------------------------------------------------------------
+# Gerador de carga
+# ---------------------------------------------------------------------------
+
+def requisicao(base_url, endpoint, origem="127.0.0.1"):
+    """
+    Uma requisição ao servidor de teste
+
+    O app identifica o cliente pelo IP de origem; cada cliente simulado usa
+    um endereço próprio de loopback (127.0.0.x) em `origem`.
+    """
+    url = urllib.parse.urlsplit(base_url)
+    headers = {}
+    corpo = None
+    if endpoint in ("/pesquisar", "/pesquisar-profundo"):
+        corpo = json.dumps({"vc_list": random.sample(VCS, random.randint(1, 2))}).encode("utf-8")
+        headers["Content-Type"] = "application/json"
+    
+    inicio = time.perf_counter()
+    conexao = http.client.HTTPConnection(url.hostname, url.port, timeout=120, source_address=(origem, 0))
+    try:
+        conexao.request("POST" if corpo is not None else "GET", endpoint, body=corpo, headers=headers)
+        resp = conexao.getresponse()
+        resp.read()
+        status = resp.status
+    except Exception:
+        status = 0
+    finally:
+        conexao.close()
+    return time.perf_counter() - inicio, status
+
+
+def percentil(valores, p):
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))]
+
+
+def rodar_nivel(base_url, concorrencia, duracao, mix):
+    endpoints = [e for e, peso in mix.items() for _ in range(peso)]
+    amostras = {e: [] for e in mix}
+    lock = threading.Lock()
+    fim = time.time() + duracao
+    
+    def trabalhador(origem):
+        while time.time() < fim:
+            endpoint = random.choice(endpoints)
+            latencia, status = requisicao(base_url, endpoint, origem)
+            with lock:
+                amostras[endpoint].append((latencia, status))
+    
+    # Cada thread é um cliente diferente: um IP de loopback próprio (127.0.0.2, 127.0.0.3, ...)
+    threads = [
+        threading.Thread(target=trabalhador, args=(f"127.0.{(i + 2) // 256}.{(i + 2) % 256}",))
+        for i in range(concorrencia)
+    ]
+    inicio = time.time()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    decorrido = time.time() - inicio
+    
+    resumo = {}
+    for endpoint, lista in amostras.items():
+        latencias = [l for l, _ in lista]
+        erros = sum(1 for _, s in lista if s == 0 or s >= 500)
+        recusadas = sum(1 for _, s in lista if s == 429)
+        resumo[endpoint] = {
+            "requisicoes": len(lista),
+            "vazao_rps": round(len(lista) / decorrido, 2),
+            "p50_ms": round(percentil(latencias, 50) * 1000, 1),
+            "p95_ms": round(percentil(latencias, 95) * 1000, 1),
+            "p99_ms": round(percentil(latencias, 99) * 1000, 1),
+            "taxa_erro": round(erros / len(lista) * 100, 2) if lista else 0,
+            "taxa_429": round(recusadas / len(lista) * 100, 2) if lista else 0
+        }
+    return resumo
+
+
+def commit_atual():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, text=True
+        ).strip()
+    except Exception:
+        return "desconhecido"
+
+
+def imprimir(resultado):
+    for nivel in resultado["niveis"]:
+        print(f"\nConcorrência {nivel['concorrencia']}:")
+        print(f"  {'endpoint':22s} {'req':>6s} {'rps':>8s} {'p50':>9s} {'p95':>9s} {'p99':>9s} {'erro%':>7s} {'429%':>7s}")
+        for endpoint, r in nivel["endpoints"].items():
+            print(f"  {endpoint:22s} {r['requisicoes']:6d} {r['vazao_rps']:8.2f} "
+                  f"{r['p50_ms']:8.1f}ms {r['p95_ms']:8.1f}ms {r['p99_ms']:8.1f}ms {r['taxa_erro']:7.2f} "
+                  f"{r.get('taxa_429', 0):7.2f}")
+
+
+def comparar(atual, caminho_anterior):
+    with open(caminho_anterior, encoding="utf-8") as f:
+        anterior = json.load(f)
+    print(f"\nComparação com {anterior['commit']} ({os.path.basename(caminho_anterior)}):")
+    niveis_anteriores = {n["concorrencia"]: n["endpoints"] for n in anterior["niveis"]}
+    for nivel in atual["niveis"]:
+        antes = niveis_anteriores.get(nivel["concorrencia"])
+        if not antes:
+            continue
+        print(f"  Concorrência {nivel['concorrencia']}:")
+        for endpoint, r in nivel["endpoints"].items():
+            if endpoint not in antes:
+                continue
+            a = antes[endpoint]
+            print(f"    {endpoint:22s} rps {a['vazao_rps']:8.2f} -> {r['vazao_rps']:8.2f}   "
+                  f"p95 {a['p95_ms']:8.1f} -> {r['p95_ms']:8.1f}ms   "
+                  f"erro {a['taxa_erro']:.2f} -> {r['taxa_erro']:.2f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga dos endpoints Flask")
+    parser.add_argument("--servidor", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--concorrencia", type=int, nargs="+", default=[1, 4, 16, 32])
+    parser.add_argument("--duracao", type=float, default=10, help="segundos por nível de concorrência")
+    parser.add_argument("--historico", type=int, default=2000, help="pesquisas sintéticas no banco")
+    parser.add_argument("--latencia-normal", type=float, default=0.5)
+    parser.add_argument("--latencia-profunda", type=float, default=2.0)
+    parser.add_argument("--db", default=None, help="banco SQLite a usar (padrão: arquivo temporário)")
+    parser.add_argument("--comparar", default=None, help="resultado anterior (.json) para comparar")
+    args = parser.parse_args()
+    
+    if args.servidor:
+        rodar_servidor(args)
+        return
+    
+    db_path = args.db or os.path.join(tempfile.mkdtemp(prefix="load_test_"), "pesquisas.db")
+    env = dict(
+        os.environ,
+        PESQUISAS_DB_PATH=db_path,
+        FONTES_DB_PATH=os.path.join(os.path.dirname(db_path), "fontes.db"),
+        ATRIBUTOS_DB_PATH=os.path.join(os.path.dirname(db_path), "atributos.db"),
+        TRACE_PATH=os.path.join(os.path.dirname(db_path), "traces.jsonl")
+    )
+    # Logs do servidor em arquivo: fora da saída do teste, mas disponíveis se ele cair
+    caminho_log = os.path.join(os.path.dirname(db_path), "servidor.log")
+    comando = [
+        sys.executable, os.path.abspath(__file__), "--servidor",
+        "--porta", str(args.porta),
+        "--historico", str(args.historico),
+        "--latencia-normal", str(args.latencia_normal),
+        "--latencia-profunda", str(args.latencia_profunda)
+    ]
+    
+    print(f"Subindo servidor com {args.historico} pesquisas sintéticas em {db_path} (logs em {caminho_log})...")
+    log_servidor = open(caminho_log, "w", encoding="utf-8")
+    servidor = subprocess.Popen(comando, env=env, stdout=subprocess.PIPE, stderr=log_servidor, text=True)
+    pronto = threading.Event()
+    
+    def drenar_saida():
+        # O pipe precisa ser lido até o fim: cheio (~64 KB), ele bloquearia o
+        # print do console do rastreamento, e os spans passariam a ser descartados
+        for linha in servidor.stdout:
+            if "SERVIDOR_PRONTO" in linha:
+                pronto.set()
+            log_servidor.write(linha)
+            log_servidor.flush()
+    
+    leitor_saida = threading.Thread(target=drenar_saida, name="saida-servidor", daemon=True)
+    leitor_saida.start()
+    try:
+        while not pronto.wait(timeout=0.1) and servidor.poll() is None:
+            pass
+        if not pronto.is_set():
+            leitor_saida.join()
+            with open(caminho_log, encoding="utf-8") as f:
+                ultimas = f.readlines()[-20:]
+            print("❌ Servidor encerrou antes de ficar pronto. Últimas linhas do log:")
+            print("".join(ultimas), end="")
+            sys.exit(1)
+        
+        base_url = f"http://127.0.0.1:{args.porta}"
+        for _ in range(50):
+            if requisicao(base_url, "/status")[1] == 200:
+                break
+            time.sleep(0.1)
+        
+        resultado = {
+            "commit": commit_atual(),
+            "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "parametros": {
+                "duracao": args.duracao,
+                "historico": args.historico,
+                "latencia_normal": args.latencia_normal,
+                "latencia_profunda": args.latencia_profunda,
+                "mix": MIX_PADRAO
+            },
+            "niveis": []
+        }
+        for concorrencia in args.concorrencia:
+            print(f"Rodando concorrência {concorrencia} por {args.duracao}s...")
+            resultado["niveis"].append({
+                "concorrencia": concorrencia,
+                "endpoints": rodar_nivel(base_url, concorrencia, args.duracao, MIX_PADRAO)
+            })
+    finally:
+        servidor.terminate()
+        servidor.wait()
+        leitor_saida.join(timeout=5)
+        log_servidor.close()
+    
+    imprimir(resultado)
+    
+    os.makedirs(RESULTADOS_DIR, exist_ok=True)
+    caminho = os.path.join(
+        RESULTADOS_DIR,
+        f"load_{resultado['commit']}_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(resultado, f, indent=2, ensure_ascii=False)
+    print(f"\nResultado salvo em {caminho}")
+    
+    if args.comparar:
+        comparar(resultado, args.comparar)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,18 @@
 # arquivo: src/agents/deep_research_agent.py
 from crewai import Agent, LLM
 import os
+import time
+
+from utils.model_router import resolver_rota, registrar_chamada
+from utils.source_store import salvar_fontes, registrar_proveniencia
+from utils.quality_scoring import pontuar_startups, campo_preenchido, MINIMO_CAMPOS_COMPLETA
+from utils import tracing
+from utils import entity_cache
+from utils.deadline import PrazoEsgotado, executar_com_prazo, limitar_timeout
+from utils.hedging import executar_com_hedge, executar_com_hedge_contando
+from utils.circuit_breaker import CircuitoAberto, obter_disjuntor
+
+log = tracing.obter_logger("deep_research_agent")
 
 try:
     from exa_py import Exa
@@ -8,7 +20,7 @@ try:
     DEPENDENCIES_AVAILABLE = True
 except ImportError:
     DEPENDENCIES_AVAILABLE = False
-    print("⚠️ Deep Research dependencies not available. Install: pip install exa-py cerebras-cloud-sdk")
+    log.warning("⚠️ Deep Research dependencies not available. Install: pip install exa-py cerebras-cloud-sdk")
 
 # Inicializar clientes apenas se dependências disponíveis
 if DEPENDENCIES_AVAILABLE:
@@ -44,6 +56,7 @@ deep_research_agent = Agent(
 ) if DEPENDENCIES_AVAILABLE else None
 
 
+@tracing.rastreado("busca_exa", "query", "num_results")
 def search_web_exa(query, num_results=10):
     """
     Busca na web usando a API da Exa
@@ -52,9 +65,16 @@ def search_web_exa(query, num_results=10):
         raise RuntimeError("Exa API not available. Install exa-py.")
     
     try:
-        print(f"🔍 Buscando Exa: '{query}' (num_results={num_results})")
+        log.debug(f"🔍 Buscando Exa: '{query}' (num_results={num_results})")
         
-        result = exa_client.search_and_contents(
+        # Com prazo, a chamada é abandonada quando o tempo acaba; se demorar
+        # mais que o percentil recente, uma cópia é disparada (hedging).
+        # Com o disjuntor aberto, falha na hora (CircuitoAberto)
+        result = executar_com_prazo(
+            obter_disjuntor("exa").executar,
+            executar_com_hedge,
+            "exa",
+            exa_client.search_and_contents,
             query,
             type="neural",  # MUDOU: de "auto" para "neural"
             num_results=num_results,
@@ -75,23 +95,39 @@ def search_web_exa(query, num_results=10):
                     "score": getattr(r, 'score', 0)
                 })
         
-        print(f"✓ Exa retornou {len(sources)} fontes")
+        tracing.anotar(fontes=len(sources))
+        log.debug(f"✓ Exa retornou {len(sources)} fontes")
         
         if not sources:
-            print(f"⚠️ AVISO: Nenhuma fonte com conteúdo para query: {query}")
+            log.warning(f"⚠️ AVISO: Nenhuma fonte com conteúdo para query: {query}")
         
         sources.sort(key=lambda x: x.get('score', 0), reverse=True)
+        
+        # Persistir fontes no armazenamento comprimido (anota "hash" em cada fonte)
+        try:
+            salvar_fontes(sources)
+        except Exception as e:
+            log.warning(f"⚠️ Não foi possível persistir fontes: {str(e)}")
+        
         return sources
         
+    except PrazoEsgotado:
+        tracing.anotar(cortado_por_prazo=True)
+        log.warning("⏱️ Busca Exa cancelada pelo prazo", query=query)
+        return []
+    except CircuitoAberto as e:
+        tracing.anotar(circuito_aberto=True)
+        log.warning(f"⚡ Busca Exa ignorada: {e}", query=query)
+        return []
     except Exception as e:
-        print(f"❌ ERRO na busca Exa: {str(e)}")
-        print(f"   Query: {query}")
         import traceback
-        traceback.print_exc()
+        tracing.anotar(erro=str(e))
+        log.error(f"❌ ERRO na busca Exa: {str(e)}", query=query, traceback=traceback.format_exc())
         return []
 
 
-def analyze_with_cerebras(prompt, max_tokens=1000, temperature=0.1):
+@tracing.rastreado("llm", "rota")
+def analyze_with_cerebras(prompt, max_tokens=None, temperature=0.1, rota="padrao"):
     """
     Analisa texto usando a API da Cerebras
     
@@ -99,17 +135,35 @@ def analyze_with_cerebras(prompt, max_tokens=1000, temperature=0.1):
     
     Args:
         prompt (str): Prompt para análise
-        max_tokens (int): Número máximo de tokens na resposta (aumentado de 600)
+        max_tokens (int): Sobrescreve o max_tokens definido pela rota
         temperature (float): Temperatura para geração (reduzida de 0.2 para 0.1)
+        rota (str): Tipo de chamada em config.json > roteamento_llm
+            (define modelo, max_tokens e timeout)
     
     Returns:
         str: Resposta da IA
+
+    Com hedge, uma cópia da chamada pode ser disparada: as duas são cobradas
+    (registradas em `requisicoes` da rota), e a que perde não é cancelada,
+    continua rodando até a Cerebras responder.
     """
     if not DEPENDENCIES_AVAILABLE or not cerebras_client:
         raise RuntimeError("Cerebras API not available. Install cerebras-cloud-sdk.")
     
+    config_rota = resolver_rota(rota)
     try:
-        chat_completion = cerebras_client.chat.completions.create(
+        timeout = limitar_timeout(config_rota["timeout"])
+    except PrazoEsgotado:
+        tracing.anotar(cortado_por_prazo=True)
+        log.warning(f"⏱️ Análise Cerebras ({rota}) não iniciada: prazo esgotado", rota=rota)
+        return ""
+    inicio = time.perf_counter()
+    
+    try:
+        chat_completion, tentativas = obter_disjuntor("cerebras").executar(
+            executar_com_hedge_contando,
+            f"cerebras:{rota}",
+            cerebras_client.chat.completions.create,
             messages=[
                 {
                     "role": "system",
@@ -124,16 +178,39 @@ def analyze_with_cerebras(prompt, max_tokens=1000, temperature=0.1):
                     "content": prompt,
                 }
             ],
-            model="llama-4-scout-17b-16e-instruct",
-            max_tokens=max_tokens,
-            temperature=temperature
+            model=config_rota["model"],
+            max_tokens=max_tokens or config_rota["max_tokens"],
+            temperature=temperature,
+            timeout=timeout
+        )
+        
+        usage = getattr(chat_completion, "usage", None)
+        tracing.anotar(
+            modelo=config_rota["model"],
+            tokens_prompt=getattr(usage, "prompt_tokens", 0),
+            tokens_resposta=getattr(usage, "completion_tokens", 0)
+        )
+        registrar_chamada(
+            rota,
+            time.perf_counter() - inicio,
+            tokens_prompt=getattr(usage, "prompt_tokens", 0),
+            tokens_resposta=getattr(usage, "completion_tokens", 0),
+            tentativas=tentativas
         )
         return chat_completion.choices[0].message.content
+    except CircuitoAberto as e:
+        tracing.anotar(circuito_aberto=True)
+        log.warning(f"⚡ Análise Cerebras ({rota}) ignorada: {e}", rota=rota)
+        return ""
     except Exception as e:
-        print(f"Erro na análise Cerebras: {str(e)}")
+        registrar_chamada(rota, time.perf_counter() - inicio, erro=True,
+                          tentativas=getattr(e, "tentativas_hedge", 1))
+        tracing.anotar(erro=str(e))
+        log.error(f"Erro na análise Cerebras ({rota}): {str(e)}", rota=rota)
         return ""
 
 
+@tracing.rastreado("busca_campo", "startup_nome", "campo_faltante")
 def buscar_informacao_especifica(startup_nome, campo_faltante, vc_name):
     """
     NOVA FUNÇÃO: Busca informação específica para um campo faltante
@@ -146,6 +223,17 @@ def buscar_informacao_especifica(startup_nome, campo_faltante, vc_name):
     Returns:
         str: Valor encontrado ou None
     """
+    # Atributos da própria startup (site, ano, LinkedIn) podem já ter sido encontrados em outra pesquisa
+    try:
+        em_cache = entity_cache.consultar([startup_nome], [campo_faltante])
+    except Exception as e:
+        log.warning(f"⚠️ Cache de atributos indisponível: {str(e)}", startup=startup_nome)
+        em_cache = {}
+    atributo = em_cache.get(entity_cache.identidade_startup(startup_nome), {}).get(campo_faltante)
+    if atributo:
+        tracing.anotar(cache_atributos=True)
+        return atributo["valor"]
+    
     if not DEPENDENCIES_AVAILABLE or not exa_client:
         return None
     
@@ -181,15 +269,26 @@ Return ONLY the value, nothing else. If not found, return "Not found".
 
 Value:"""
         
-        resultado = analyze_with_cerebras(extraction_prompt, max_tokens=100, temperature=0.0)
+        resultado = analyze_with_cerebras(extraction_prompt, temperature=0.0, rota="busca_campo")
         
         if resultado and "not found" not in resultado.lower():
-            return resultado.strip()
+            valor = resultado.strip()
+            registrar_proveniencia(
+                startup_nome,
+                vc_name,
+                {campo_faltante: (valor, [s["hash"] for s in sources[:2] if s.get("hash")])}
+            )
+            try:
+                entity_cache.memorizar_startups([{"nome": startup_nome, campo_faltante: valor}], "busca_campo",
+                                                sources[:2], [campo_faltante])
+            except Exception as e:
+                log.warning(f"⚠️ Não foi possível gravar no cache de atributos: {str(e)}", startup=startup_nome)
+            return valor
         
         return None
         
     except Exception as e:
-        print(f"Erro ao buscar {campo_faltante}: {str(e)}")
+        log.warning(f"Erro ao buscar {campo_faltante}: {str(e)}", startup=startup_nome)
         return None
 
 
@@ -206,39 +305,13 @@ def verificar_completude_dados(startups):
     if not startups:
         return {"total": 0, "completas": 0, "percentual": 0}
     
-    campos_importantes = [
-        'nome', 'site', 'setor', 'ano_fundacao', 'valor_investimento',
-        'rodada', 'data_investimento', 'vc_investidor', 'descricao_breve',
-        'linkedin_fundador'
-    ]
-    
-    completas = 0
-    total_campos = len(campos_importantes)
-    
-    for startup in startups:
-        campos_preenchidos = sum(
-            1 for campo in campos_importantes
-            if startup.get(campo) and startup.get(campo) not in ["Não informado", "—", ""]
-        )
-        
-        # Considerar completa se tiver pelo menos 7 dos 10 campos
-        if campos_preenchidos >= 7:
-            completas += 1
+    stats = pontuar_startups(startups)
     
     return {
-        "total": len(startups),
-        "completas": completas,
-        "percentual": round((completas / len(startups)) * 100, 1) if startups else 0,
-        "media_campos_preenchidos": round(
-            sum(
-                sum(
-                    1 for campo in campos_importantes
-                    if s.get(campo) and s.get(campo) not in ["Não informado", "—", ""]
-                )
-                for s in startups
-            ) / len(startups),
-            1
-        ) if startups else 0
+        "total": stats["total"],
+        "completas": stats["completas"],
+        "percentual": stats["percentual"],
+        "media_campos_preenchidos": stats["media_campos_preenchidos"]
     }
 
 
@@ -255,25 +328,9 @@ def gerar_relatorio_qualidade(startups):
     if not startups:
         return "Nenhuma startup para análise"
     
-    stats = verificar_completude_dados(startups)
-    
-    # Análise por campo
-    campos_importantes = [
-        'nome', 'site', 'setor', 'ano_fundacao', 'valor_investimento',
-        'rodada', 'data_investimento', 'vc_investidor', 'descricao_breve',
-        'linkedin_fundador'
-    ]
-    
-    campo_stats = {}
-    for campo in campos_importantes:
-        preenchidos = sum(
-            1 for s in startups
-            if s.get(campo) and s.get(campo) not in ["Não informado", "—", ""]
-        )
-        campo_stats[campo] = {
-            "preenchidos": preenchidos,
-            "percentual": round((preenchidos / len(startups)) * 100, 1)
-        }
+    # Estatísticas gerais e por campo em uma única passada
+    stats = pontuar_startups(startups)
+    campo_stats = stats["por_campo"]
     
     relatorio = f"""
 ╔══════════════════════════════════════════════════════════╗
@@ -282,7 +339,7 @@ def gerar_relatorio_qualidade(startups):
 
 📊 ESTATÍSTICAS GERAIS:
    • Total de startups: {stats['total']}
-   • Startups completas (≥7 campos): {stats['completas']} ({stats['percentual']}%)
+   • Startups completas (≥{MINIMO_CAMPOS_COMPLETA} campos): {stats['completas']} ({stats['percentual']}%)
    • Média de campos preenchidos: {stats['media_campos_preenchidos']}/10
 
 📋 COMPLETUDE POR CAMPO:
@@ -427,14 +484,13 @@ def enriquecer_startup_individual(startup, search_func, analyze_func):
     
     # Identificar campos vazios ou genéricos
     for campo in ['valor_investimento', 'data_investimento', 'rodada', 'linkedin_fundador', 'site']:
-        valor = startup.get(campo, "")
-        if not valor or valor in ["Não informado", "—", ""]:
+        if not campo_preenchido(startup.get(campo)):
             campos_para_enriquecer.append(campo)
     
     if not campos_para_enriquecer:
         return startup
     
-    print(f"    🔍 Enriquecendo {startup['nome']}: {len(campos_para_enriquecer)} campos vazios")
+    log.debug(f"🔍 Enriquecendo {startup['nome']}: {len(campos_para_enriquecer)} campos vazios")
     
     # Buscar cada campo individualmente
     for campo in campos_para_enriquecer[:3]:  # Limitar a 3 campos para não sobrecarregar
@@ -455,6 +511,6 @@ def enriquecer_startup_individual(startup, search_func, analyze_func):
                     continue
             
             startup[campo] = valor_encontrado
-            print(f"      ✓ {campo}: {valor_encontrado[:50]}...")
+            log.debug(f"✓ {campo}: {valor_encontrado[:50]}", startup=startup["nome"], campo=campo)
     
     return startup
\ No newline at end of file
@@ -0,0 +1,247 @@
+# arquivo: src/pipelines/cache_warming.py
+"""
+Aquecimento do cache da pesquisa normal para as VCs mais procuradas
+
+Uma thread verifica, a cada `intervalo_verificacao_segundos`, se está em
+uma janela de baixo uso (`janelas`, horário local). Dentro da janela, ela
+pesquisa as VCs populares e deixa a resposta no cache de
+pipeline_manager, gastando no máximo `orcamento_chamadas_por_janela`
+chamadas. A primeira pesquisa do dia dessas VCs já sai do cache, e
+metadados.por_vc indica a idade da resposta e se ela veio do aquecimento.
+
+VCs populares são as sugestões da tela inicial (sampleSuggestions em
+static/script.js), as de `vcs_fixas` e as que mais aparecem no histórico.
+A VC com resposta mais nova que `renovar_apos_segundos` é pulada. O ciclo
+para se chegar uma pesquisa de usuário (`somente_ocioso`) ou se o
+disjuntor da Perplexity estiver aberto.
+"""
+import json
+import os
+import re
+import threading
+import time
+
+from utils import tracing
+from utils.circuit_breaker import provedores_indisponiveis
+from utils.config_loader import BASE_DIR, load_section
+from pipelines.pipeline_manager import CACHE_TTL_SEGUNDOS, idade_cache, pesquisar_vc_individual
+
+CONFIG_PADRAO = {
+    "habilitado": False,
+    "janelas": [{"inicio": "03:00", "fim": "06:00"}],
+    "intervalo_verificacao_segundos": 300,
+    "orcamento_chamadas_por_janela": 20,
+    "max_vcs": 15,
+    "min_pesquisas": 2,
+    "renovar_apos_segundos": CACHE_TTL_SEGUNDOS // 2,
+    "pausa_entre_vcs_segundos": 5,
+    "somente_ocioso": True,
+    "usar_sugestoes_front": True,
+    "vcs_fixas": []
+}
+
+SCRIPT_FRONT = os.path.join(BASE_DIR, "static", "script.js")
+
+log = tracing.obter_logger("aquecimento_cache")
+
+
+def carregar_config():
+    return {**CONFIG_PADRAO, **(load_section("aquecimento_cache", {}) or {})}
+
+
+def ler_sugestoes_front(caminho=SCRIPT_FRONT):
+    """VCs sugeridas na tela inicial (const sampleSuggestions = [...] em static/script.js)"""
+    try:
+        with open(caminho, encoding="utf-8") as f:
+            encontrado = re.search(r"sampleSuggestions\s*=\s*(\[[^\]]*\])", f.read())
+        return [vc for vc in json.loads(encontrado.group(1)) if isinstance(vc, str)] if encontrado else []
+    except (OSError, ValueError):
+        return []
+
+
+def _minutos(hora):
+    horas, minutos = hora.split(":")
+    return int(horas) * 60 + int(minutos)
+
+
+def janela_ativa(janelas, agora=None):
+    """
+    Identificador da janela de baixo uso em andamento (None fora das janelas)
+
+    Janelas que passam da meia-noite ("23:00" a "05:00") contam como do dia
+    em que começaram, para que o orçamento não zere à meia-noite.
+    """
+    agora = agora if agora is not None else time.time()
+    local = time.localtime(agora)
+    minuto = local.tm_hour * 60 + local.tm_min
+    for janela in janelas:
+        inicio, fim = _minutos(janela["inicio"]), _minutos(janela["fim"])
+        if inicio <= fim:
+            ativa, dia = inicio <= minuto < fim, agora
+        elif minuto >= inicio:
+            ativa, dia = True, agora
+        else:
+            ativa, dia = minuto < fim, agora - 86400
+        if ativa:
+            return f"{time.strftime('%Y-%m-%d', time.localtime(dia))} {janela['inicio']}"
+    return None
+
+
+class AquecedorCache(threading.Thread):
+    """
+    Thread que aquece o cache da pesquisa normal nas janelas de baixo uso
+
+    Args:
+        listar_populares: função (limite, minimo) -> [(vc, pesquisas)] com
+            as VCs mais frequentes do histórico
+        esta_ocioso: função sem argumentos; False quando há pesquisas de
+            usuários em andamento
+        config (dict): Seção `aquecimento_cache` do config.json
+    """
+
+    def __init__(self, listar_populares, esta_ocioso=None, config=None):
+        super().__init__(daemon=True, name="aquecimento-cache")
+        self.listar_populares = listar_populares
+        self.esta_ocioso = esta_ocioso
+        self.config = {**CONFIG_PADRAO, **(config or {})}
+        self._parar = threading.Event()
+        self._lock = threading.Lock()
+        self.janela_atual = None
+        self.chamadas_janela = 0
+        self.ultimo_ciclo = None
+        self.vcs = {}  # vc -> último aquecimento
+        self.contadores = {
+            "ciclos": 0,
+            "vcs_aquecidas": 0,
+            "falhas": 0,
+            "puladas_recentes": 0,
+            "ciclos_interrompidos_por_uso": 0,
+            "ciclos_sem_orcamento": 0
+        }
+
+    def run(self):
+        while not self._parar.is_set():
+            if janela_ativa(self.config["janelas"]):
+                try:
+                    self.executar_ciclo()
+                except Exception as e:
+                    log.error(f"❌ Erro no aquecimento do cache: {str(e)}")
+            self._parar.wait(self.config["intervalo_verificacao_segundos"])
+
+    def encerrar(self):
+        self._parar.set()
+
+    def selecionar_vcs(self):
+        """VCs a aquecer, sem repetição: fixas, sugestões da tela e mais pesquisadas"""
+        candidatas = list(self.config["vcs_fixas"])
+        if self.config["usar_sugestoes_front"]:
+            candidatas += ler_sugestoes_front()
+        try:
+            candidatas += [vc for vc, _ in self.listar_populares(self.config["max_vcs"], self.config["min_pesquisas"])]
+        except Exception as e:
+            log.warning(f"⚠️ Não foi possível listar as VCs mais pesquisadas: {str(e)}")
+
+        vistas, selecionadas = set(), []
+        for vc in candidatas:
+            chave = " ".join(vc.lower().split())
+            if chave and chave not in vistas:
+                vistas.add(chave)
+                selecionadas.append(vc.strip())
+        return selecionadas[:self.config["max_vcs"]]
+
+    def executar_ciclo(self, agora=None):
+        """
+        Aquece as VCs que estão sem resposta recente, dentro do orçamento da janela
+
+        Returns:
+            list: VCs aquecidas neste ciclo
+        """
+        janela = janela_ativa(self.config["janelas"], agora) or "manual"
+        with self._lock:
+            if janela != self.janela_atual:
+                self.janela_atual = janela
+                self.chamadas_janela = 0
+            self.contadores["ciclos"] += 1
+            self.ultimo_ciclo = time.time()
+
+        aquecidas = []
+        with tracing.span("aquecimento_cache", janela=janela) as raiz:
+            for vc_name in self.selecionar_vcs():
+                if self.chamadas_janela >= self.config["orcamento_chamadas_por_janela"]:
+                    self._contar("ciclos_sem_orcamento")
+                    log.info(f"💤 Orçamento de aquecimento da janela esgotado ({self.chamadas_janela} chamadas)")
+                    break
+                if self.config["somente_ocioso"] and self.esta_ocioso and not self.esta_ocioso():
+                    self._contar("ciclos_interrompidos_por_uso")
+                    log.info("💤 Aquecimento adiado: há pesquisas de usuários em andamento")
+                    break
+                if provedores_indisponiveis(("perplexity",)):
+                    log.warning("⚡ Aquecimento interrompido: circuito da Perplexity aberto")
+                    break
+                idade = idade_cache(vc_name)
+                if idade is not None and idade < self.config["renovar_apos_segundos"]:
+                    self._contar("puladas_recentes")
+                    continue
+
+                self._aquecer(vc_name)
+                aquecidas.append(vc_name)
+                if self._parar.wait(self.config["pausa_entre_vcs_segundos"]):
+                    break
+            raiz.anotar(vcs_aquecidas=aquecidas, chamadas_janela=self.chamadas_janela)
+
+        if aquecidas:
+            log.info(f"🔥 Cache aquecido: {', '.join(aquecidas)}")
+        return aquecidas
+
+    def _aquecer(self, vc_name):
+        inicio = time.perf_counter()
+        resultado = pesquisar_vc_individual(vc_name, ignorar_cache=True, origem="aquecimento")
+        with self._lock:
+            self.chamadas_janela += 1
+            registro = {
+                "aquecida_em": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "startups": len(resultado["startups"]),
+                "duracao_s": round(time.perf_counter() - inicio, 1)
+            }
+            if resultado.get("erro"):
+                registro["erro"] = resultado["erro"]
+                self.contadores["falhas"] += 1
+            else:
+                self.contadores["vcs_aquecidas"] += 1
+            self.vcs[vc_name] = registro
+
+    def _contar(self, contador):
+        with self._lock:
+            self.contadores[contador] += 1
+
+    def metricas(self):
+        with self._lock:
+            vcs = {}
+            for vc_name, registro in self.vcs.items():
+                idade = idade_cache(vc_name)
+                vcs[vc_name] = {**registro, "idade_cache_segundos": round(idade) if idade is not None else None}
+            return {
+                "habilitado": self.config["habilitado"],
+                "ativo": self.is_alive(),
+                "em_janela": janela_ativa(self.config["janelas"]) is not None,
+                "janela_atual": self.janela_atual,
+                "chamadas_janela": self.chamadas_janela,
+                "orcamento_chamadas_por_janela": self.config["orcamento_chamadas_por_janela"],
+                "ultimo_ciclo": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.ultimo_ciclo))
+                if self.ultimo_ciclo else None,
+                **self.contadores,
+                "vcs": vcs
+            }
+
+
+def iniciar_aquecimento(listar_populares, esta_ocioso=None, config=None, iniciar=True):
+    """
+    Cria o aquecedor e inicia a thread se `habilitado` e `iniciar` (sem
+    isso, só expõe as métricas)
+    """
+    aquecedor = AquecedorCache(listar_populares, esta_ocioso, config if config is not None else carregar_config())
+    if aquecedor.config["habilitado"] and iniciar:
+        aquecedor.start()
+        log.info(f"🔥 Aquecimento de cache ativo nas janelas "
+                 f"{', '.join(j['inicio'] + '-' + j['fim'] for j in aquecedor.config['janelas'])}")
+    return aquecedor
@@ -2,26 +2,60 @@
 import os
 import json
 import re
+import heapq
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturoTimeout
 
-def pesquisar_startups_profundo(lista_vcs: list):
+from utils.json_repair import reparar_json
+from utils.quality_scoring import calcular_scores, campo_preenchido
+from utils.config_loader import BASE_DIR, load_section
+from utils.source_store import carregar_fontes, registrar_proveniencia
+from utils import tracing
+from utils import entity_cache
+from utils.relevance_filter import filtrar_fontes
+from utils import deadline
+from utils.deadline import PrazoEsgotado
+from utils.circuit_breaker import provedores_indisponiveis
+from utils.startup_record import Startup, json_padrao
+from pipelines.enrichment_scheduler import (
+    AgendadorEnriquecimento,
+    calcular_orcamento,
+    carregar_config_enriquecimento
+)
+
+# Onde o modo de memória limitada grava os resultados de cada VC (JSONL). O
+# arquivo é apagado ao fim da pesquisa; os que sobram de pesquisas
+# interrompidas são removidos depois de IDADE_MAXIMA_PARCIAIS_SEGUNDOS
+RESULTADOS_PARCIAIS_DIR = os.path.join(BASE_DIR, "data", "resultados_parciais")
+IDADE_MAXIMA_PARCIAIS_SEGUNDOS = 3600
+
+# Tamanho do trecho mantido de cada fonte para o índice de busca textual
+TAMANHO_TRECHO = 300
+
+log = tracing.obter_logger("deep_pipeline")
+
+# Tempo mínimo restante para começar cada etapa opcional quando há prazo
+CONFIG_PRAZO_PADRAO = {
+    "reserva_camada2_segundos": 20,
+    "reserva_camada3_segundos": 15,
+    "reserva_enriquecimento_segundos": 5
+}
+CONFIG_PRAZO = {**CONFIG_PRAZO_PADRAO, **(load_section("prazo", {}) or {})}
+
+# Provedores da pesquisa profunda; com o disjuntor de um deles aberto, as VCs
+# restantes seguem pelo caminho normal (Perplexity)
+PROVEDORES_PESQUISA = ("exa", "cerebras")
+
+def carregar_funcoes_pesquisa():
     """
-    Realiza pesquisa profunda em múltiplas camadas sobre startups investidas por VCs
-    
-    VERSÃO REFINADA: Implementa busca iterativa por VC individual com enriquecimento
-    de dados faltantes através de queries específicas.
-    
-    Args:
-        lista_vcs (list): Lista de nomes de Venture Capitals para pesquisar
+    Importa as funções de busca (Exa) e análise (Cerebras) e valida as chaves
     
     Returns:
-        dict: Resultado da pesquisa com dados estruturados em JSON
+        dict: {"search_func", "analyze_func"} ou {"erro": mensagem}
     """
-    print(f"🔍 Iniciando pesquisa profunda REFINADA para VCs: {', '.join(lista_vcs)}")
-    
     # Importar funções necessárias
     try:
         # Importação relativa ao diretório src
-        import os
         import sys
         
         # Adicionar diretório src ao path
@@ -36,8 +70,7 @@ def pesquisar_startups_profundo(lista_vcs: list):
             DEPENDENCIES_AVAILABLE
         )
     except ImportError as e:
-        print(f"ERRO DE IMPORTAÇÃO: {e}")
-        print(f"Tentando importação alternativa...")
+        log.warning(f"Erro de importação: {e}; tentando importação alternativa")
         try:
             from src.agents.deep_research_agent import (
                 search_web_exa,
@@ -45,70 +78,273 @@ def pesquisar_startups_profundo(lista_vcs: list):
                 DEPENDENCIES_AVAILABLE
             )
         except ImportError as e2:
-            print(f"ERRO NA IMPORTAÇÃO ALTERNATIVA: {e2}")
-
-    except ImportError as e:
-        return {
-            "erro": f"Erro ao importar módulos de Deep Research: {str(e)}",
-            "resultado": []
-        }
+            log.error(f"Erro na importação alternativa: {e2}")
+            return {"erro": f"Erro ao importar módulos de Deep Research: {str(e2)}"}
     
     if not DEPENDENCIES_AVAILABLE:
-        return {
-            "erro": "Deep Research dependencies não instaladas. Execute: pip install exa-py cerebras-cloud-sdk",
-            "resultado": []
-        }
+        return {"erro": "Deep Research dependencies não instaladas. Execute: pip install exa-py cerebras-cloud-sdk"}
     
     # Verificar API keys
     if not os.environ.get("EXA_API_KEY"):
-        return {
-            "erro": "EXA_API_KEY não configurada no arquivo keys.env",
-            "resultado": []
-        }
+        return {"erro": "EXA_API_KEY não configurada no arquivo keys.env"}
     
     if not os.environ.get("CEREBRAS_API_KEY"):
-        return {
-            "erro": "CEREBRAS_API_KEY não configurada no arquivo keys.env",
-            "resultado": []
-        }
+        return {"erro": "CEREBRAS_API_KEY não configurada no arquivo keys.env"}
+    
+    return {"search_func": search_web_exa, "analyze_func": analyze_with_cerebras}
+
+
+def pesquisar_startups_profundo(lista_vcs: list, especulativo: bool = False, memoria_limitada: bool = False,
+                                orcamento_enriquecimento: int = None, prazo_segundos: float = None):
+    """
+    Realiza pesquisa profunda em múltiplas camadas sobre startups investidas por VCs
+    
+    VERSÃO REFINADA: Implementa busca iterativa por VC individual com enriquecimento
+    de dados faltantes através de queries específicas.
+    
+    Args:
+        lista_vcs (list): Lista de nomes de Venture Capitals para pesquisar
+        especulativo (bool): Se True, executa a busca complementar (Camada 3)
+            em paralelo com a Camada 1 e só usa o resultado se necessário
+        memoria_limitada (bool): Se True, reduz fontes a referências logo após
+            a extração e grava os resultados de cada VC em disco
+        orcamento_enriquecimento (int): Total de buscas/chamadas de IA do
+            enriquecimento global (padrão: calculado pelo config.json)
+        prazo_segundos (float): Orçamento de latência; etapas opcionais são
+            cortadas para devolver o que houver dentro do prazo
+    
+    Returns:
+        dict: Resultado da pesquisa com dados estruturados em JSON
+    """
+    log.info(f"🔍 Iniciando pesquisa profunda REFINADA para VCs: {', '.join(lista_vcs)}", vcs=lista_vcs)
+    
+    funcoes = carregar_funcoes_pesquisa()
+    if "erro" in funcoes:
+        return {"erro": funcoes["erro"], "resultado": []}
+    
+    return executar_pesquisa_profunda(
+        lista_vcs,
+        funcoes["search_func"],
+        funcoes["analyze_func"],
+        especulativo=especulativo,
+        memoria_limitada=memoria_limitada,
+        orcamento_enriquecimento=orcamento_enriquecimento,
+        prazo_segundos=prazo_segundos
+    )
+
+
+@tracing.rastreado("pesquisa_profunda", "lista_vcs", "especulativo", "memoria_limitada", "prazo_segundos")
+def executar_pesquisa_profunda(lista_vcs, search_func, analyze_func, especulativo=False, memoria_limitada=False,
+                               orcamento_enriquecimento=None, prazo_segundos=None):
+    """
+    Executa a pesquisa profunda, opcionalmente dentro de um prazo
+    
+    O prazo vale para todas as etapas e chamadas externas (ver utils.deadline).
+    Ao esgotar, o resultado parcial é devolvido e `detalhes_por_vc[vc]
+    .etapas_cortadas` indica o que não foi executado.
+    """
+    with deadline.com_prazo(prazo_segundos) as prazo:
+        resultado = executar_camadas_por_vc(
+            lista_vcs,
+            search_func,
+            analyze_func,
+            especulativo=especulativo,
+            memoria_limitada=memoria_limitada,
+            orcamento_enriquecimento=orcamento_enriquecimento
+        )
+        if prazo:
+            resultado.setdefault("metadados", {})["prazo"] = {
+                "segundos": prazo.segundos,
+                "decorrido_s": round(prazo.decorrido(), 3),
+                "esgotado": prazo.esgotado()
+            }
+    return resultado
+
+
+def executar_camadas_por_vc(lista_vcs, search_func, analyze_func, especulativo=False, memoria_limitada=False,
+                            orcamento_enriquecimento=None):
+    """
+    Executa as camadas de pesquisa para cada VC e consolida os resultados
+    
+    Args:
+        lista_vcs (list): Lista de nomes de VCs
+        search_func: Função de busca web
+        analyze_func: Função de análise com IA
+        especulativo (bool): Camada 3 especulativa (ver processar_vc_individual)
+        memoria_limitada (bool): Mantém só referências às fontes e grava as
+            startups de cada VC em um arquivo JSONL assim que a VC termina;
+            o enriquecimento passa a ser feito por VC, para que nunca haja
+            mais de uma VC de startups em memória durante a pesquisa
+        orcamento_enriquecimento (int): Total de buscas/chamadas de IA para o
+            enriquecimento global (padrão: config.json > enriquecimento)
+    
+    Returns:
+        dict: Resultado da pesquisa com dados estruturados em JSON
+    """
+    # Enriquecimento global: todas as VCs disputam um único orçamento
+    config_enriquecimento = carregar_config_enriquecimento()
+    agendamento_global = config_enriquecimento["agendamento_global"] or orcamento_enriquecimento is not None
+    if memoria_limitada and agendamento_global:
+        # O agendamento global guarda todas as VCs até o fim; no modo limitado
+        # cada VC é enriquecida e gravada assim que termina
+        log.info("💾 Memória limitada: enriquecimento por VC em vez do orçamento global")
+        agendamento_global = False
+    startups_por_vc = {}
     
     # ESTRUTURA PRINCIPAL: Iterar por cada VC individualmente
     todas_startups = []
     todas_fontes = []
+    total_startups = 0
     metadados_completos = {
         "vcs_pesquisadas": lista_vcs,
         "total_fontes": 0,
         "detalhes_por_vc": {}
     }
     
+    arquivo_parcial = None
+    if memoria_limitada:
+        os.makedirs(RESULTADOS_PARCIAIS_DIR, exist_ok=True)
+        limpar_resultados_parciais()
+        caminho_parcial = os.path.join(
+            RESULTADOS_PARCIAIS_DIR,
+            f"pesquisa_{time.strftime('%Y%m%d_%H%M%S')}_{os.getpid()}_{id(lista_vcs)}.jsonl"
+        )
+        arquivo_parcial = open(caminho_parcial, "w", encoding="utf-8")
+        # Maior número de startups mantidas em memória ao fim de uma VC
+        metadados_completos["pico_startups_em_memoria"] = 0
+    
+    if especulativo:
+        metadados_completos["especulacao"] = {
+            "execucoes": 0,
+            "aproveitadas": 0,
+            "desperdicadas": 0,
+            "chamadas_desperdicadas": 0
+        }
+    
+    vcs_degradadas = []
     for vc_name in lista_vcs:
-        print(f"\n{'='*60}")
-        print(f"🎯 PESQUISANDO: {vc_name}")
-        print(f"{'='*60}")
+        if provedores_indisponiveis(PROVEDORES_PESQUISA):
+            vcs_degradadas.append(vc_name)
+            continue
+        
+        if not deadline.permite(0.001):
+            log.warning(f"⏱️ {vc_name}: prazo esgotado, VC não pesquisada", vc=vc_name)
+            metadados_completos["detalhes_por_vc"][vc_name] = {
+                "erro": "Prazo esgotado",
+                "etapas_cortadas": ["camada1", "camada2", "camada3"]
+            }
+            continue
+        
+        log.info(f"🎯 PESQUISANDO: {vc_name}", vc=vc_name)
         
         startups_vc = processar_vc_individual(
             vc_name,
-            search_web_exa,
-            analyze_with_cerebras
+            search_func,
+            analyze_func,
+            especulativo=especulativo,
+            memoria_limitada=memoria_limitada,
+            enriquecer=not agendamento_global
         )
         
+        especulacao_vc = startups_vc.get("camada3_especulativa")
+        if especulacao_vc:
+            resumo = metadados_completos["especulacao"]
+            resumo["execucoes"] += 1
+            if especulacao_vc["aproveitada"]:
+                resumo["aproveitadas"] += 1
+            else:
+                resumo["desperdicadas"] += 1
+                resumo["chamadas_desperdicadas"] += especulacao_vc["chamadas"]
+        
         if startups_vc["sucesso"]:
-            todas_startups.extend(startups_vc["startups"])
+            metadados_completos["detalhes_por_vc"][vc_name] = resumir_resultado_vc(startups_vc)
+            total_startups += len(startups_vc["startups"])
+            if agendamento_global:
+                # Enriquecidas depois, quando todas as VCs estiverem prontas
+                startups_por_vc[vc_name] = startups_vc["startups"]
+            elif arquivo_parcial:
+                # Grava a VC concluída e libera as startups da memória
+                for startup in startups_vc["startups"]:
+                    arquivo_parcial.write(json.dumps(startup, ensure_ascii=False, default=json_padrao) + "\n")
+                arquivo_parcial.flush()
+            else:
+                todas_startups.extend(startups_vc["startups"])
+            if arquivo_parcial:
+                metadados_completos["pico_startups_em_memoria"] = max(
+                    metadados_completos["pico_startups_em_memoria"],
+                    len(startups_vc["startups"]) + len(todas_startups)
+                    + sum(len(startups) for startups in startups_por_vc.values())
+                )
             todas_fontes.extend(startups_vc["fontes"])
-            metadados_completos["detalhes_por_vc"][vc_name] = {
-                "startups_encontradas": len(startups_vc["startups"]),
-                "fontes_utilizadas": len(startups_vc["fontes"]),
-                "queries_executadas": startups_vc["queries_executadas"]
-            }
-            print(f"✅ {vc_name}: {len(startups_vc['startups'])} startups encontradas")
+            log.info(f"✅ {vc_name}: {len(startups_vc['startups'])} startups encontradas",
+                     vc=vc_name, startups=len(startups_vc["startups"]))
+        elif provedores_indisponiveis(PROVEDORES_PESQUISA):
+            # O disjuntor abriu durante a VC: ela também vai para o caminho normal
+            vcs_degradadas.append(vc_name)
         else:
-            print(f"⚠️ {vc_name}: Erro na pesquisa - {startups_vc.get('erro', 'Desconhecido')}")
-            metadados_completos["detalhes_por_vc"][vc_name] = {
-                "erro": startups_vc.get("erro", "Erro desconhecido")
-            }
+            log.warning(f"⚠️ {vc_name}: Erro na pesquisa - {startups_vc.get('erro', 'Desconhecido')}", vc=vc_name)
+            metadados_completos["detalhes_por_vc"][vc_name] = resumir_resultado_vc(startups_vc)
+    
+    if agendamento_global and startups_por_vc:
+        orcamento = calcular_orcamento(len(startups_por_vc), config_enriquecimento, orcamento_enriquecimento)
+        resumo_enriquecimento, queries_por_vc = enriquecer_com_orcamento_global(
+            startups_por_vc,
+            search_func,
+            analyze_func,
+            orcamento,
+            config_enriquecimento
+        )
+        metadados_completos["enriquecimento"] = resumo_enriquecimento
+        vcs_cortadas = set(resumo_enriquecimento.get("vcs_cortadas_por_prazo", []))
+        
+        for vc_name, startups in startups_por_vc.items():
+            detalhes_vc = metadados_completos["detalhes_por_vc"][vc_name]
+            detalhes_vc["queries_executadas"].extend(queries_por_vc.get(vc_name, []))
+            if vc_name in vcs_cortadas:
+                detalhes_vc.setdefault("etapas_cortadas", []).append("camada2")
+            if arquivo_parcial:
+                for startup in startups:
+                    arquivo_parcial.write(json.dumps(startup, ensure_ascii=False, default=json_padrao) + "\n")
+            else:
+                todas_startups.extend(startups)
+        startups_por_vc = {}
+    
+    if vcs_degradadas:
+        indisponiveis = provedores_indisponiveis(PROVEDORES_PESQUISA)
+        degradacao = pesquisar_pelo_caminho_normal(vcs_degradadas, indisponiveis)
+        metadados_completos["degradacao"] = {
+            "caminho": "perplexity",
+            "provedores_indisponiveis": indisponiveis,
+            "vcs": vcs_degradadas
+        }
+        if degradacao.get("erro"):
+            metadados_completos["degradacao"]["erro"] = degradacao["erro"]
+        for vc_name in vcs_degradadas:
+            metadados_completos["detalhes_por_vc"][vc_name] = resumir_resultado_degradado(degradacao, vc_name)
+        total_startups += len(degradacao["resultado"])
+        if arquivo_parcial:
+            for startup in degradacao["resultado"]:
+                arquivo_parcial.write(json.dumps(startup, ensure_ascii=False, default=json_padrao) + "\n")
+        else:
+            todas_startups.extend(degradacao["resultado"])
+    
+    if arquivo_parcial:
+        arquivo_parcial.close()
+        with open(caminho_parcial, encoding="utf-8") as f:
+            todas_startups = [Startup.de_dict(json.loads(linha)) for linha in f]
+        os.remove(caminho_parcial)
     
     metadados_completos["total_fontes"] = len(todas_fontes)
-    metadados_completos["total_startups"] = len(todas_startups)
+    metadados_completos["fontes"] = [
+        {
+            "titulo": fonte.get("title", ""),
+            "url": fonte.get("url", ""),
+            "hash": fonte.get("hash", ""),
+            "trecho": fonte["trecho"] if "trecho" in fonte else fonte.get("content", "")[:TAMANHO_TRECHO]
+        }
+        for fonte in todas_fontes
+    ]
+    metadados_completos["total_startups"] = total_startups
     
     if not todas_startups:
         return {
@@ -117,11 +353,8 @@ def pesquisar_startups_profundo(lista_vcs: list):
             "metadados": metadados_completos
         }
     
-    print(f"\n{'='*60}")
-    print(f"✨ PESQUISA COMPLETA")
-    print(f"Total de startups: {len(todas_startups)}")
-    print(f"Total de fontes: {len(todas_fontes)}")
-    print(f"{'='*60}\n")
+    tracing.anotar(startups=len(todas_startups), fontes=len(todas_fontes))
+    log.info(f"✨ PESQUISA COMPLETA: {len(todas_startups)} startups, {len(todas_fontes)} fontes")
     
     return {
         "resultado": todas_startups,
@@ -129,7 +362,257 @@ def pesquisar_startups_profundo(lista_vcs: list):
     }
 
 
-def processar_vc_individual(vc_name, search_func, analyze_func):
+def limpar_resultados_parciais(idade_maxima=IDADE_MAXIMA_PARCIAIS_SEGUNDOS):
+    """Remove arquivos de resultados parciais esquecidos (pesquisas interrompidas)"""
+    limite = time.time() - idade_maxima
+    for nome in os.listdir(RESULTADOS_PARCIAIS_DIR):
+        caminho = os.path.join(RESULTADOS_PARCIAIS_DIR, nome)
+        try:
+            if nome.endswith(".jsonl") and os.path.getmtime(caminho) < limite:
+                os.remove(caminho)
+        except OSError:
+            pass
+
+
+def resumir_resultado_vc(startups_vc):
+    """Entrada de detalhes_por_vc a partir do retorno de processar_vc_individual"""
+    if startups_vc["sucesso"]:
+        detalhes = {
+            "startups_encontradas": len(startups_vc["startups"]),
+            "fontes_utilizadas": len(startups_vc["fontes"]),
+            "queries_executadas": startups_vc["queries_executadas"],
+            "fontes_hashes": startups_vc.get("fontes_hashes", [])
+        }
+        if startups_vc.get("camada3_especulativa"):
+            detalhes["camada3_especulativa"] = startups_vc["camada3_especulativa"]
+    else:
+        detalhes = {"erro": startups_vc.get("erro", "Erro desconhecido")}
+    if startups_vc.get("etapas_cortadas"):
+        detalhes["etapas_cortadas"] = startups_vc["etapas_cortadas"]
+    return detalhes
+
+
+def resumir_resultado_degradado(degradacao, vc_name):
+    """Entrada de detalhes_por_vc de uma VC pesquisada pelo caminho normal"""
+    return {
+        **degradacao["por_vc"].get(vc_name, {"erro": degradacao.get("erro", "Erro desconhecido")}),
+        "caminho": "perplexity"
+    }
+
+
+def pesquisar_pelo_caminho_normal(lista_vcs, provedores):
+    """
+    Pesquisa as VCs pelo caminho normal (Perplexity) quando Exa ou Cerebras
+    estão com o disjuntor aberto
+    
+    Args:
+        lista_vcs (list): VCs que não passaram pela pesquisa profunda
+        provedores (list): Provedores indisponíveis (para o log)
+    
+    Returns:
+        dict: {"resultado": [startups], "por_vc": {vc: detalhes}, "erro": opcional}
+    """
+    log.warning(f"⚡ Circuito aberto ({', '.join(provedores)}): {len(lista_vcs)} VC(s) pelo caminho normal",
+                vcs=lista_vcs, provedores=provedores)
+    tracing.anotar(degradado=True, provedores_indisponiveis=provedores)
+    try:
+        # Importado aqui: pipeline_manager importa este módulo
+        from pipelines.pipeline_manager import pesquisar_startups_por_vcs
+    except ImportError as e:
+        log.error(f"❌ Caminho normal indisponível: {e}")
+        return {"resultado": [], "por_vc": {}, "erro": f"Caminho normal indisponível: {e}"}
+    return pesquisar_startups_por_vcs(lista_vcs)
+
+
+# Campos de rodada: um valor novo diferente do anterior conta como alteração
+CAMPOS_RODADA = ('rodada', 'valor_investimento', 'data_investimento')
+
+
+def pesquisar_atualizacao_incremental(snapshots_anteriores: dict, orcamento_enriquecimento: int = None):
+    """
+    Atualiza portfólios já pesquisados buscando apenas investimentos recentes
+    
+    Args:
+        snapshots_anteriores (dict): {vc: [startups do último snapshot]};
+            lista vazia faz a pesquisa completa da VC
+        orcamento_enriquecimento (int): Total de buscas/chamadas de IA do enriquecimento
+    
+    Returns:
+        dict: resultado (portfólio atualizado), delta (startups novas ou
+            alteradas) e metadados
+    """
+    log.info(f"🔁 Atualização incremental para VCs: {', '.join(snapshots_anteriores)}")
+    
+    funcoes = carregar_funcoes_pesquisa()
+    if "erro" in funcoes:
+        return {"erro": funcoes["erro"], "resultado": []}
+    
+    return executar_atualizacao_incremental(
+        snapshots_anteriores,
+        funcoes["search_func"],
+        funcoes["analyze_func"],
+        orcamento_enriquecimento=orcamento_enriquecimento
+    )
+
+
+@tracing.rastreado("atualizacao_incremental")
+def executar_atualizacao_incremental(snapshots_anteriores, search_func, analyze_func, orcamento_enriquecimento=None):
+    """
+    Compara com o snapshot anterior de cada VC e devolve só o que mudou
+    
+    Para VCs com histórico, faz uma única busca focada em investimentos
+    recentes e mescla o que foi extraído com o portfólio anterior. Só
+    startups com campos faltantes entram no enriquecimento (novas e
+    alteradas primeiro).
+    
+    Returns:
+        dict: {"resultado": portfólio completo, "delta": novas/alteradas, "metadados"}
+    """
+    portfolios = {}
+    anteriores_por_chave = {}
+    detalhes_por_vc = {}
+    
+    for vc_name, anteriores in snapshots_anteriores.items():
+        log.info(f"🎯 ATUALIZANDO: {vc_name} ({len(anteriores)} startups no snapshot anterior)", vc=vc_name)
+        anteriores_por_chave[vc_name] = {chave_nome(s.get("nome", "")): Startup.de_dict(s) for s in anteriores}
+        
+        if not anteriores:
+            # Sem histórico: pesquisa completa (enriquecimento fica para o agendador)
+            resultado_vc = processar_vc_individual(vc_name, search_func, analyze_func, enriquecer=False)
+            portfolios[vc_name] = resultado_vc["startups"]
+            detalhes_por_vc[vc_name] = {
+                "modo": "completo",
+                "queries_executadas": resultado_vc["queries_executadas"]
+            }
+            if not resultado_vc["sucesso"]:
+                detalhes_por_vc[vc_name]["erro"] = resultado_vc.get("erro", "Erro desconhecido")
+            continue
+        
+        query = gerar_query_investimentos_recentes(vc_name)
+        fontes = search_func(query, num_results=10)
+        extraidas = extrair_startups_de_fontes(fontes, vc_name, analyze_func, contexto_maximo=True) if fontes else []
+        log.info(f"✓ {len(extraidas)} startups nas fontes recentes", vc=vc_name)
+        
+        portfolios[vc_name] = mesclar_portfolio(anteriores, extraidas)
+        detalhes_por_vc[vc_name] = {"modo": "incremental", "queries_executadas": [query]}
+    
+    # Enriquecimento: startups completas são ignoradas; novas/alteradas têm prioridade
+    para_enriquecer = {}
+    for vc_name, portfolio in portfolios.items():
+        anteriores = anteriores_por_chave[vc_name]
+        mudou = lambda s: anteriores.get(chave_nome(s.get("nome", ""))) != s
+        para_enriquecer[vc_name] = sorted(portfolio, key=lambda s: 0 if mudou(s) else 1)
+    
+    resumo_enriquecimento = None
+    if any(para_enriquecer.values()):
+        orcamento = calcular_orcamento(len(para_enriquecer), total=orcamento_enriquecimento)
+        resumo_enriquecimento, queries_por_vc = enriquecer_com_orcamento_global(
+            para_enriquecer, search_func, analyze_func, orcamento
+        )
+        for vc_name, queries in queries_por_vc.items():
+            detalhes_por_vc[vc_name]["queries_executadas"].extend(queries)
+    
+    # Delta: startups novas ou com qualquer campo diferente do snapshot anterior
+    todas_startups = []
+    delta = []
+    for vc_name, portfolio in portfolios.items():
+        anteriores = anteriores_por_chave[vc_name]
+        adicionadas, alteradas = [], []
+        for startup in portfolio:
+            anterior = anteriores.get(chave_nome(startup.get("nome", "")))
+            if anterior is None:
+                adicionadas.append(startup["nome"])
+                delta.append(startup)
+            elif anterior != startup:
+                alteradas.append(startup["nome"])
+                delta.append(startup)
+        todas_startups.extend(portfolio)
+        detalhes_por_vc[vc_name].update({
+            "adicionadas": adicionadas,
+            "alteradas": alteradas,
+            "inalteradas": len(portfolio) - len(adicionadas) - len(alteradas)
+        })
+        log.info(f"✅ {vc_name}: +{len(adicionadas)} novas, {len(alteradas)} alteradas", vc=vc_name)
+    
+    metadados = {
+        "vcs_pesquisadas": list(snapshots_anteriores),
+        "detalhes_por_vc": detalhes_por_vc,
+        "total_startups": len(todas_startups),
+        "total_delta": len(delta)
+    }
+    if resumo_enriquecimento:
+        metadados["enriquecimento"] = resumo_enriquecimento
+    
+    return {"resultado": todas_startups, "delta": delta, "metadados": metadados}
+
+
+def chave_nome(nome):
+    """Nome normalizado usado para casar startups entre snapshots"""
+    return " ".join(str(nome or "").lower().split())
+
+
+def gerar_query_investimentos_recentes(vc_name):
+    """Query focada em anúncios de investimento do último ano"""
+    ano = time.localtime().tm_year
+    return f"{vc_name} leads new investment round {ano - 1} {ano} startup raises funding announcement"
+
+
+def mesclar_portfolio(anteriores, novas):
+    """
+    Mescla startups recém-extraídas no portfólio anterior (sem alterar os originais)
+    
+    Startups desconhecidas são adicionadas. Para as conhecidas, preenche
+    campos que estavam vazios e atualiza campos de rodada que mudaram.
+    """
+    portfolio = [Startup.de_dict(s) for s in anteriores]
+    por_chave = {chave_nome(s.get("nome", "")): s for s in portfolio}
+    
+    for nova in novas:
+        chave = chave_nome(nova.get("nome", ""))
+        atual = por_chave.get(chave)
+        if atual is None:
+            startup = Startup.de_dict(nova)
+            portfolio.append(startup)
+            por_chave[chave] = startup
+            continue
+        for campo, valor in nova.items():
+            if not campo_preenchido(valor):
+                continue
+            if not campo_preenchido(atual.get(campo)) or (campo in CAMPOS_RODADA and valor != atual.get(campo)):
+                atual[campo] = valor
+    
+    return portfolio
+
+
+def aplicar_delta(portfolio, delta):
+    """Aplica um delta salvo (startups novas/alteradas) sobre um portfólio"""
+    resultado = [Startup.de_dict(s) for s in portfolio]
+    indice = {chave_nome(s.get("nome", "")): i for i, s in enumerate(resultado)}
+    for startup in delta:
+        chave = chave_nome(startup.get("nome", ""))
+        if chave in indice:
+            resultado[indice[chave]] = Startup.de_dict(startup)
+        else:
+            indice[chave] = len(resultado)
+            resultado.append(Startup.de_dict(startup))
+    return resultado
+
+
+def referencia_fonte(fonte):
+    """Versão leve de uma fonte: o conteúdo completo fica no armazenamento de fontes"""
+    conteudo = fonte.get("content", "")
+    return {
+        "title": fonte.get("title", ""),
+        "url": fonte.get("url", ""),
+        "hash": fonte.get("hash", ""),
+        "tamanho": len(conteudo),
+        "trecho": conteudo[:TAMANHO_TRECHO]
+    }
+
+
+@tracing.rastreado("vc", "vc_name")
+def processar_vc_individual(vc_name, search_func, analyze_func, especulativo=False, memoria_limitada=False,
+                            enriquecer=True):
     """
     Processa um VC individual com pesquisa em camadas e enriquecimento
     
@@ -137,104 +620,239 @@ def processar_vc_individual(vc_name, search_func, analyze_func):
         vc_name (str): Nome do VC
         search_func: Função de busca web
         analyze_func: Função de análise com IA
+        especulativo (bool): Se True, dispara a Camada 3 junto com a Camada 1
+        memoria_limitada (bool): Se True, troca as fontes por referências
+            (referencia_fonte) assim que a extração termina
+        enriquecer (bool): Se False, pula a Camada 2 (o enriquecimento é
+            feito depois pelo agendador global)
     
     Returns:
-        dict: Resultado com startups e metadados
+        dict: Resultado com startups e metadados (etapas_cortadas lista as
+            camadas puladas ou interrompidas pelo prazo)
     """
+    executor = None
+    futuro_complementar = None
+    etapas_cortadas = []
+    
     try:
+        # ===== CAMADA 3 ESPECULATIVA: dispara em paralelo com a Camada 1 =====
+        if especulativo:
+            log.info(f"⚡ CAMADA 3 especulativa iniciada em paralelo para {vc_name}", vc=vc_name)
+            executor = ThreadPoolExecutor(max_workers=1)
+            futuro_complementar = executor.submit(
+                tracing.propagar(buscar_startups_complementares),
+                vc_name,
+                search_func,
+                analyze_func
+            )
+        
         # ===== CAMADA 1: PESQUISA INICIAL AMPLIADA =====
-        print(f"\n📊 CAMADA 1: Pesquisa inicial ampliada para {vc_name}...")
+        with tracing.span("camada1", vc=vc_name):
+            log.info(f"📊 CAMADA 1: Pesquisa inicial ampliada para {vc_name}", vc=vc_name)
         
-        initial_query = f"{vc_name} portfolio investments startups"
+            initial_query = f"{vc_name} portfolio investments startups"
         
-        # AUMENTADO: de 6 para 12 resultados
-        initial_sources = search_func(initial_query, num_results=12)
-        print(f"✓ Encontradas {len(initial_sources)} fontes na pesquisa inicial")
+            # AUMENTADO: de 6 para 12 resultados
+            initial_sources = search_func(initial_query, num_results=12)
+            log.info(f"✓ Encontradas {len(initial_sources)} fontes na pesquisa inicial", vc=vc_name)
         
-        if not initial_sources:
-            return {
-                "sucesso": False,
-                "erro": f"Nenhuma fonte encontrada para {vc_name}",
-                "startups": [],
-                "fontes": [],
-                "queries_executadas": [initial_query]
-            }
+            if not initial_sources:
+                if not deadline.permite(0.001):
+                    etapas_cortadas = ["camada1", "camada2", "camada3"]
+                resultado = {
+                    "sucesso": False,
+                    "erro": f"Nenhuma fonte encontrada para {vc_name}",
+                    "startups": [],
+                    "fontes": [],
+                    "queries_executadas": [initial_query],
+                    "etapas_cortadas": etapas_cortadas
+                }
+                especulacao = descartar_especulacao(futuro_complementar)
+                if especulacao:
+                    resultado["camada3_especulativa"] = especulacao
+                return resultado
         
-        # ===== EXTRAÇÃO INICIAL (com contexto completo) =====
-        print(f"\n🧠 Extraindo dados iniciais...")
-        startups_iniciais = extrair_startups_de_fontes(
-            initial_sources,
-            vc_name,
-            analyze_func,
-            contexto_maximo=True  # SEM truncamento
-        )
+            # ===== EXTRAÇÃO INICIAL (com contexto completo) =====
+            log.info("🧠 Extraindo dados iniciais", vc=vc_name)
+            startups_iniciais = extrair_startups_de_fontes(
+                initial_sources,
+                vc_name,
+                analyze_func,
+                contexto_maximo=True  # SEM truncamento
+            )
         
-        print(f"✓ Extração inicial: {len(startups_iniciais)} startups")
+            log.info(f"✓ Extração inicial: {len(startups_iniciais)} startups", vc=vc_name)
         
-        # ===== CAMADA 2: ANÁLISE DE LACUNAS E ENRIQUECIMENTO =====
-        print(f"\n🔍 CAMADA 2: Análise de lacunas e enriquecimento...")
+        if memoria_limitada:
+            initial_sources = [referencia_fonte(f) for f in initial_sources]
         
-        startups_enriquecidas, queries_enriquecimento = enriquecer_dados_faltantes(
-            startups_iniciais,
-            vc_name,
-            search_func,
-            analyze_func,
-            max_iteracoes=3
-        )
+        # ===== CAMADA 2: ANÁLISE DE LACUNAS E ENRIQUECIMENTO =====
+        if enriquecer and not deadline.permite(CONFIG_PRAZO["reserva_camada2_segundos"]):
+            log.warning("⏱️ CAMADA 2 pulada: pouco tempo restante no prazo", vc=vc_name)
+            etapas_cortadas.append("camada2")
+            startups_enriquecidas, queries_enriquecimento = startups_iniciais, []
+        elif enriquecer:
+            log.info("🔍 CAMADA 2: Análise de lacunas e enriquecimento", vc=vc_name)
+            
+            startups_enriquecidas, queries_enriquecimento = enriquecer_dados_faltantes(
+                startups_iniciais,
+                vc_name,
+                search_func,
+                analyze_func,
+                max_iteracoes=3
+            )
+        else:
+            startups_enriquecidas, queries_enriquecimento = startups_iniciais, []
         
         # ===== CAMADA 3: BUSCA COMPLEMENTAR SE NECESSÁRIO =====
         queries_executadas = [initial_query] + queries_enriquecimento
+        especulacao = None
+        necessita_complementar = len(startups_enriquecidas) < 10
         
-        if len(startups_enriquecidas) < 10:
-            print(f"\n📈 CAMADA 3: Busca complementar (meta: 10 startups)...")
-            
-            # Busca adicional com query alternativa
-            complementary_query = (
-                f"{vc_name} recent investments 2020-2024 "
-                f"startup funding details portfolio"
+        if futuro_complementar is not None:
+            try:
+                complementary_query, complementary_sources, startups_complementares = futuro_complementar.result(
+                    timeout=deadline.tempo_restante()
+                )
+            except FuturoTimeout:
+                complementary_query, complementary_sources, startups_complementares = None, [], []
+            especulacao = {
+                "aproveitada": necessita_complementar and complementary_query is not None,
+                "chamadas": 2 if complementary_sources else 1
+            }
+            if complementary_query is None:
+                log.warning("⏱️ CAMADA 3 especulativa interrompida pelo prazo", vc=vc_name)
+                if necessita_complementar:
+                    etapas_cortadas.append("camada3")
+            elif necessita_complementar:
+                queries_executadas.append(complementary_query)
+                log.info("📈 CAMADA 3: Usando resultado especulativo (meta: 10 startups)", vc=vc_name)
+            else:
+                queries_executadas.append(complementary_query)
+                log.info("⚡ CAMADA 3 especulativa descartada: meta de 10 startups já atingida", vc=vc_name)
+                startups_complementares = []
+        elif necessita_complementar and not deadline.permite(CONFIG_PRAZO["reserva_camada3_segundos"]):
+            log.warning("⏱️ CAMADA 3 pulada: pouco tempo restante no prazo", vc=vc_name)
+            etapas_cortadas.append("camada3")
+            startups_complementares = []
+        elif necessita_complementar:
+            log.info("📈 CAMADA 3: Busca complementar (meta: 10 startups)", vc=vc_name)
+            complementary_query, complementary_sources, startups_complementares = buscar_startups_complementares(
+                vc_name,
+                search_func,
+                analyze_func
             )
-            
-            complementary_sources = search_func(complementary_query, num_results=8)
             queries_executadas.append(complementary_query)
+        else:
+            startups_complementares = []
+        
+        fontes_extracao = list(initial_sources)
+        if startups_complementares:
+            fontes_extracao.extend(
+                [referencia_fonte(f) for f in complementary_sources] if memoria_limitada
+                else complementary_sources
+            )
             
-            if complementary_sources:
-                startups_complementares = extrair_startups_de_fontes(
-                    complementary_sources,
-                    vc_name,
-                    analyze_func,
-                    contexto_maximo=True
-                )
-                
-                # Adicionar startups que ainda não existem
-                nomes_existentes = {s['nome'].lower() for s in startups_enriquecidas}
-                for startup in startups_complementares:
-                    if startup['nome'].lower() not in nomes_existentes:
-                        startups_enriquecidas.append(startup)
-                        nomes_existentes.add(startup['nome'].lower())
-                
-                print(f"✓ Busca complementar: +{len(startups_complementares)} startups")
+            # Adicionar startups que ainda não existem
+            nomes_existentes = {s['nome'].lower() for s in startups_enriquecidas}
+            for startup in startups_complementares:
+                if startup['nome'].lower() not in nomes_existentes:
+                    startups_enriquecidas.append(startup)
+                    nomes_existentes.add(startup['nome'].lower())
+            
+            log.info(f"✓ Busca complementar: +{len(startups_complementares)} startups", vc=vc_name)
         
         # Limitar a 10 startups mais completas
         startups_finais = selecionar_melhores_startups(startups_enriquecidas, limite=10)
         
-        return {
+        resultado = {
             "sucesso": True,
             "startups": startups_finais,
             "fontes": initial_sources,
+            "fontes_hashes": [f["hash"] for f in fontes_extracao if f.get("hash")],
             "queries_executadas": queries_executadas
         }
+        if especulacao:
+            resultado["camada3_especulativa"] = especulacao
+        if etapas_cortadas:
+            resultado["etapas_cortadas"] = etapas_cortadas
+            tracing.anotar(etapas_cortadas=etapas_cortadas)
+        
+        return resultado
         
     except Exception as e:
-        print(f"❌ Erro ao processar {vc_name}: {str(e)}")
-        return {
+        tracing.anotar(erro=str(e))
+        log.error(f"❌ Erro ao processar {vc_name}: {str(e)}", vc=vc_name)
+        resultado = {
             "sucesso": False,
             "erro": str(e),
             "startups": [],
             "fontes": [],
             "queries_executadas": []
         }
+        especulacao = descartar_especulacao(futuro_complementar)
+        if especulacao:
+            resultado["camada3_especulativa"] = especulacao
+        return resultado
+    
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
 
 
+def descartar_especulacao(futuro):
+    """
+    Registro da Camada 3 especulativa de uma VC que terminou sem usá-la
+    
+    Se a especulação ainda não começou, é cancelada e não gera registro. Se já
+    está rodando, segue até o fim em segundo plano (não é interrompida) e conta
+    como no caso do prazo: a busca já disparada.
+    
+    Returns:
+        dict ou None: {"aproveitada": False, "chamadas"} ou None sem especulação
+    """
+    if futuro is None or futuro.cancel():
+        return None
+    chamadas = 1
+    if futuro.done() and futuro.exception() is None:
+        _query, fontes, _startups = futuro.result()
+        chamadas = 2 if fontes else 1
+    return {"aproveitada": False, "chamadas": chamadas}
+
+
+@tracing.rastreado("camada3", "vc_name")
+def buscar_startups_complementares(vc_name, search_func, analyze_func):
+    """
+    Executa a busca complementar da Camada 3 com query alternativa
+    
+    Args:
+        vc_name (str): Nome do VC
+        search_func: Função de busca web
+        analyze_func: Função de análise com IA
+    
+    Returns:
+        tuple: (query_executada, fontes, startups_extraidas)
+    """
+    complementary_query = (
+        f"{vc_name} recent investments 2020-2024 "
+        f"startup funding details portfolio"
+    )
+    
+    complementary_sources = search_func(complementary_query, num_results=8)
+    
+    startups_complementares = []
+    if complementary_sources:
+        startups_complementares = extrair_startups_de_fontes(
+            complementary_sources,
+            vc_name,
+            analyze_func,
+            contexto_maximo=True
+        )
+    
+    return complementary_query, complementary_sources, startups_complementares
+
+
+@tracing.rastreado("extracao", "vc_name")
 def extrair_startups_de_fontes(sources, vc_name, analyze_func, contexto_maximo=False):
     """
     Extrai informações de startups das fontes coletadas
@@ -251,6 +869,10 @@ def extrair_startups_de_fontes(sources, vc_name, analyze_func, contexto_maximo=F
     if not sources:
         return []
     
+    # Pré-filtro local: descarta/trunca fontes pouco relevantes e ordena por relevância
+    sources, resumo_filtro = filtrar_fontes(sources, vc_name, limite_caracteres=4000 if contexto_maximo else 1000)
+    tracing.anotar(filtro_relevancia=resumo_filtro)
+    
     # Preparar contexto das fontes (SEM TRUNCAMENTO se contexto_maximo=True)
     context = f"VC Investidor: {vc_name}\n\nFontes coletadas:\n\n"
     
@@ -304,17 +926,25 @@ IMPORTANTE: Seja COMPLETO e PRECISO. Extraia o máximo de informações possíve
 Retorne o JSON agora:"""
     
     try:
-        response = analyze_func(prompt, max_tokens=5000, temperature=0.1)
+        response = analyze_func(prompt, temperature=0.1, rota="extracao")
         startups = processar_resposta_json(response)
         
         # Validar e normalizar
-        return validar_startups(startups, vc_name)
+        validadas = validar_startups(startups, vc_name)
+        
+        for startup in validadas:
+            vincular_campos_as_fontes(startup, startup.keys(), sources[:10])
+        memorizar_atributos(validadas, f"extracao:{vc_name}", sources[:10])
+        
+        return validadas
         
     except Exception as e:
-        print(f"⚠️ Erro na extração: {str(e)}")
+        tracing.anotar(erro=str(e))
+        log.warning(f"⚠️ Erro na extração: {str(e)}", vc=vc_name)
         return []
 
 
+@tracing.rastreado("camada2", "vc_name")
 def enriquecer_dados_faltantes(startups, vc_name, search_func, analyze_func, max_iteracoes=3):
     """
     Enriquece startups com dados faltantes através de buscas específicas
@@ -331,8 +961,11 @@ def enriquecer_dados_faltantes(startups, vc_name, search_func, analyze_func, max
     """
     queries_executadas = []
     
+    # Site, ano e LinkedIn já conhecidos de outras pesquisas dispensam a busca
+    preencher_do_cache(startups, vc_name)
+    
     for iteracao in range(max_iteracoes):
-        print(f"\n🔄 Ciclo de enriquecimento {iteracao + 1}/{max_iteracoes}")
+        log.info(f"🔄 Ciclo de enriquecimento {iteracao + 1}/{max_iteracoes}", vc=vc_name)
         
         # Identificar startups com dados faltantes
         startups_incompletas = []
@@ -345,10 +978,10 @@ def enriquecer_dados_faltantes(startups, vc_name, search_func, analyze_func, max
                 })
         
         if not startups_incompletas:
-            print("✅ Todas as startups estão completas!")
+            log.info("✅ Todas as startups estão completas!", vc=vc_name)
             break
         
-        print(f"📋 {len(startups_incompletas)} startups necessitam enriquecimento")
+        log.info(f"📋 {len(startups_incompletas)} startups necessitam enriquecimento", vc=vc_name)
         
         # Processar até 5 startups por iteração (para não sobrecarregar)
         for item in startups_incompletas[:5]:
@@ -359,7 +992,8 @@ def enriquecer_dados_faltantes(startups, vc_name, search_func, analyze_func, max
             query = gerar_query_enriquecimento(startup, campos_vazios, vc_name)
             queries_executadas.append(query)
             
-            print(f"  🔎 Buscando: {startup['nome']} - Campos: {', '.join(campos_vazios)}")
+            log.debug(f"🔎 Buscando: {startup['nome']} - Campos: {', '.join(campos_vazios)}",
+                      vc=vc_name, startup=startup["nome"], campos=campos_vazios)
             
             try:
                 # Busca específica
@@ -375,18 +1009,353 @@ def enriquecer_dados_faltantes(startups, vc_name, search_func, analyze_func, max
                     )
                     
                     # Atualizar startup
-                    for campo, valor in dados_novos.items():
-                        if valor and valor != "Não informado":
-                            startup[campo] = valor
-                            print(f"    ✓ {campo}: {valor[:50]}...")
+                    aplicar_dados_novos(startup, dados_novos, fontes_especificas)
                 
             except Exception as e:
-                print(f"    ⚠️ Erro ao enriquecer: {str(e)}")
+                log.warning(f"⚠️ Erro ao enriquecer: {str(e)}", vc=vc_name, startup=startup["nome"])
                 continue
     
     return startups, queries_executadas
 
 
+def aplicar_dados_novos(startup, dados_novos, fontes):
+    """Copia para a startup os valores encontrados e registra de onde vieram"""
+    campos_atualizados = []
+    for campo, valor in dados_novos.items():
+        if valor and valor != "Não informado":
+            startup[campo] = valor
+            campos_atualizados.append(campo)
+            log.debug(f"✓ {campo}: {str(valor)[:50]}", startup=startup.get("nome"), campo=campo)
+    
+    vincular_campos_as_fontes(startup, campos_atualizados, fontes)
+    if campos_atualizados:
+        memorizar_atributos([startup], "enriquecimento", fontes, campos_atualizados)
+    return campos_atualizados
+
+
+def preencher_do_cache(startups, vc_name=None):
+    """Preenche campos vazios com o cache de atributos (entity_cache) antes de buscar"""
+    try:
+        resumo = entity_cache.preencher_startups(startups)
+    except Exception as e:
+        log.warning(f"⚠️ Cache de atributos indisponível: {str(e)}", vc=vc_name)
+        return {"startups": 0, "campos": 0}
+    if resumo["campos"]:
+        tracing.anotar(cache_atributos=resumo)
+        log.info(f"⚡ Cache de atributos: {resumo['campos']} campos de {resumo['startups']} startups "
+                 f"preenchidos sem busca", vc=vc_name)
+    return resumo
+
+
+def memorizar_atributos(startups, fonte, fontes=None, campos=None):
+    """Guarda no cache de atributos os valores recém-obtidos (falha só gera aviso)"""
+    try:
+        entity_cache.memorizar_startups(startups, fonte, fontes, campos)
+    except Exception as e:
+        log.warning(f"⚠️ Não foi possível gravar no cache de atributos: {str(e)}")
+
+
+@tracing.rastreado("camada2_global")
+def enriquecer_com_orcamento_global(startups_por_vc, search_func, analyze_func, orcamento, config=None):
+    """
+    Enriquece startups de todas as VCs com um único orçamento de buscas/IA
+    
+    Args:
+        startups_por_vc (dict): {vc: [startups em ordem de relevância]}
+        search_func: Função de busca
+        analyze_func: Função de análise
+        orcamento (dict): {"buscas": int, "llm": int}
+        config (dict): Configuração de enriquecimento
+    
+    Returns:
+        tuple: (resumo_do_agendador, {vc: [queries_executadas]})
+    """
+    log.info(f"🔍 CAMADA 2 (global): enriquecimento com orçamento de "
+             f"{orcamento['buscas']} buscas / {orcamento['llm']} chamadas de IA", orcamento=orcamento)
+    
+    agendador = AgendadorEnriquecimento(orcamento, config)
+    queries_por_vc = {vc: [] for vc in startups_por_vc}
+    
+    # Site, ano e LinkedIn já conhecidos de outras pesquisas dispensam a busca
+    resumo_cache = preencher_do_cache([s for startups in startups_por_vc.values() for s in startups])
+    
+    # Com prazo, nenhuma busca começa sem a reserva mínima de tempo
+    reserva = CONFIG_PRAZO["reserva_enriquecimento_segundos"]
+    # Sem Exa/Cerebras (disjuntor aberto), as buscas restantes falhariam na hora
+    deve_parar = lambda: not deadline.permite(reserva) or bool(provedores_indisponiveis(PROVEDORES_PESQUISA))
+    
+    # Primeiro, buscas combinadas para startups com os mesmos campos faltantes
+    resumo_lote = None
+    if agendador.config["busca_em_lote"]:
+        resumo_lote = enriquecer_em_lote(startups_por_vc, search_func, analyze_func, agendador, queries_por_vc,
+                                         deve_parar)
+    ids_pendentes_lote = resumo_lote.pop("ids_pendentes") if resumo_lote else set()
+    campos_agrupaveis = set(agendador.config["campos_agrupaveis"])
+    
+    # O que continuou faltando segue para buscas individuais
+    for vc_name, startups in startups_por_vc.items():
+        for rank, startup in enumerate(startups):
+            agendador.adicionar(startup, identificar_campos_vazios(startup), rank, identificador=vc_name)
+    
+    def executar_tarefa(tarefa, campos):
+        startup = tarefa["startup"]
+        vc_name = tarefa["id"]
+        query = gerar_query_enriquecimento(startup, campos, vc_name)
+        queries_por_vc[vc_name].append(query)
+        if id(startup) in ids_pendentes_lote and campos_agrupaveis.intersection(campos):
+            resumo_lote["buscas_fallback"] += 1
+        log.debug(f"🔎 Buscando: {startup['nome']} ({vc_name}) - Campos: {', '.join(campos)}",
+                  vc=vc_name, startup=startup["nome"], campos=campos)
+        
+        try:
+            fontes_especificas = search_func(query, num_results=3)
+            if not fontes_especificas:
+                return [], 1, 0
+            dados_novos = extrair_dados_especificos(fontes_especificas, startup, campos, analyze_func)
+            atualizados = aplicar_dados_novos(startup, dados_novos, fontes_especificas)
+            return [c for c in atualizados if c in campos], 1, 1
+        except Exception as e:
+            log.warning(f"⚠️ Erro ao enriquecer: {str(e)}", vc=vc_name, startup=startup["nome"])
+            return [], 1, 0
+    
+    resumo = agendador.executar(executar_tarefa, deve_parar=deve_parar)
+    resumo["orcamento"] = dict(orcamento)
+    resumo["cache_atributos"] = resumo_cache
+    if resumo["interrompido"]:
+        vcs_cortadas = sorted({tarefa["id"] for tarefa in agendador.pendentes})
+        indisponiveis = provedores_indisponiveis(PROVEDORES_PESQUISA)
+        if indisponiveis:
+            resumo["provedores_indisponiveis"] = indisponiveis
+            resumo["vcs_cortadas_por_circuito"] = vcs_cortadas
+            log.warning(f"⚡ Enriquecimento interrompido (circuito aberto: {', '.join(indisponiveis)}): "
+                        f"{resumo['tarefas_nao_atendidas']} tarefas pendentes")
+        else:
+            resumo["vcs_cortadas_por_prazo"] = vcs_cortadas
+            log.warning(f"⏱️ Enriquecimento interrompido pelo prazo: {resumo['tarefas_nao_atendidas']} tarefas pendentes")
+    if resumo_lote:
+        # Sem lote, cada startup do lote teria as buscas individuais pelos seus campos
+        # (campos_por_busca por busca); fallback = buscas individuais por campos do
+        # lote que ele não resolveu. Um lote que não resolveu nada não economiza
+        resumo_lote["buscas_economizadas"] = max(0, (
+            resumo_lote["buscas_individuais_equivalentes"] - resumo_lote["buscas_lote"]
+            - resumo_lote["buscas_fallback"]
+        ))
+        resumo["busca_em_lote"] = resumo_lote
+        tracing.anotar(busca_em_lote=resumo_lote)
+    tracing.anotar(campos_preenchidos=resumo["campos_preenchidos"], buscas=resumo["tarefas_executadas"])
+    log.info(f"✓ Enriquecimento global: {resumo['campos_preenchidos']} campos preenchidos "
+             f"em {resumo['tarefas_executadas']} buscas")
+    
+    return resumo, queries_por_vc
+
+
+def enriquecer_em_lote(startups_por_vc, search_func, analyze_func, agendador, queries_por_vc, deve_parar=None):
+    """
+    Busca combinada: startups da mesma VC com os mesmos campos faltantes
+    (ex: rodada e data, que costumam estar no mesmo anúncio) dividem uma
+    busca e uma chamada de IA
+    
+    Args:
+        startups_por_vc (dict): {vc: [startups]}
+        search_func: Função de busca
+        analyze_func: Função de análise
+        agendador (AgendadorEnriquecimento): Orçamento compartilhado
+        queries_por_vc (dict): Recebe as queries executadas
+        deve_parar: função consultada antes de cada lote (prazo)
+    
+    Returns:
+        dict: Métricas do lote; ids_pendentes (startups que continuaram
+            sem algum campo do lote) é removido pelo chamador
+    """
+    config = agendador.config
+    tamanho_lote = max(2, config["startups_por_lote"])
+    campos_por_busca = max(1, config["campos_por_busca"])
+    resumo = {
+        "lotes": 0,
+        "buscas_lote": 0,
+        "startups_em_lote": 0,
+        "buscas_individuais_equivalentes": 0,
+        "startups_resolvidas": 0,
+        "campos_preenchidos": 0,
+        "buscas_fallback": 0,
+        "ids_pendentes": set()
+    }
+    
+    for vc_name, startups in startups_por_vc.items():
+        for campos, grupo in agrupar_por_campos_faltantes(startups, config["campos_agrupaveis"]):
+            for inicio in range(0, len(grupo), tamanho_lote):
+                lote = grupo[inicio:inicio + tamanho_lote]
+                if len(lote) < 2 or not agendador.tem_orcamento() or (deve_parar and deve_parar()):
+                    continue
+                
+                query = gerar_query_lote(lote, campos, vc_name)
+                queries_por_vc[vc_name].append(query)
+                log.debug(f"🔎 Busca em lote: {', '.join(s['nome'] for s in lote)} - Campos: {', '.join(campos)}",
+                          vc=vc_name, startups=len(lote), campos=list(campos))
+                
+                try:
+                    fontes = search_func(query, num_results=min(10, 3 * len(lote)))
+                    fontes_por_startup = mapear_fontes_para_startups(lote, fontes)
+                    com_fontes = [s for s in lote if fontes_por_startup[s["nome"]]]
+                    dados = extrair_dados_em_lote(com_fontes, fontes_por_startup, campos, vc_name, analyze_func) \
+                        if com_fontes else {}
+                except Exception as e:
+                    log.warning(f"⚠️ Erro na busca em lote: {str(e)}", vc=vc_name)
+                    fontes_por_startup, com_fontes, dados = {s["nome"]: [] for s in lote}, [], {}
+                
+                agendador.registrar_custo(1, 1 if com_fontes else 0)
+                resumo["lotes"] += 1
+                resumo["buscas_lote"] += 1
+                resumo["startups_em_lote"] += len(lote)
+                resumo["buscas_individuais_equivalentes"] += len(lote) * -(-len(campos) // campos_por_busca)
+                
+                for startup in lote:
+                    valores = {c: v for c, v in dados.get(chave_nome(startup["nome"]), {}).items() if c in campos}
+                    atualizados = aplicar_dados_novos(startup, valores, fontes_por_startup[startup["nome"]])
+                    agendador.registrar_campos(campos, atualizados)
+                    resumo["campos_preenchidos"] += len(atualizados)
+                    if set(campos) <= set(atualizados):
+                        resumo["startups_resolvidas"] += 1
+                    else:
+                        resumo["ids_pendentes"].add(id(startup))
+    
+    log.info(f"✓ Busca em lote: {resumo['lotes']} buscas para {resumo['startups_em_lote']} startups, "
+             f"{resumo['startups_resolvidas']} resolvidas sem busca individual")
+    return resumo
+
+
+def agrupar_por_campos_faltantes(startups, campos_agrupaveis):
+    """
+    Agrupa startups pelo conjunto de campos agrupáveis que ainda faltam
+    
+    Returns:
+        list: [(tupla de campos, [startups])], grupos na ordem em que aparecem
+    """
+    grupos = {}
+    for startup in startups:
+        campos = tuple(c for c in campos_agrupaveis if c in identificar_campos_vazios(startup))
+        if campos:
+            grupos.setdefault(campos, []).append(startup)
+    return list(grupos.items())
+
+
+def gerar_query_lote(startups, campos, vc_name):
+    """
+    Uma query para várias startups da mesma VC
+
+    A Exa é chamada com type="neural", que ignora operadores booleanos; por
+    isso a query é uma frase ("funding round and investment date of A, B and
+    C backed by VC"), não "A" OR "B".
+    """
+    termos = {
+        'valor_investimento': 'funding amount',
+        'data_investimento': 'investment date',
+        'rodada': 'funding round'
+    }
+    nomes = [s["nome"] for s in startups]
+    lista_nomes = f'{", ".join(nomes[:-1])} and {nomes[-1]}' if len(nomes) > 1 else nomes[0]
+    termos_busca = ' and '.join(termos.get(campo, campo) for campo in campos)
+    return f'{termos_busca} of {lista_nomes} backed by {vc_name}'
+
+
+def mapear_fontes_para_startups(startups, fontes):
+    """Liga cada fonte às startups do lote cujo nome ela menciona"""
+    textos = [f"{f.get('title', '')}\n{f.get('content', '')}".lower() for f in fontes]
+    return {
+        startup["nome"]: [f for f, texto in zip(fontes, textos) if startup["nome"].lower() in texto]
+        for startup in startups
+    }
+
+
+@tracing.rastreado("extracao_campos_lote", "vc_name")
+def extrair_dados_em_lote(startups, fontes_por_startup, campos, vc_name, analyze_func):
+    """
+    Extrai os campos de várias startups em uma única chamada de IA
+    
+    Returns:
+        dict: {nome normalizado (chave_nome): {campo: valor}}
+    """
+    fontes_unicas = []
+    vistas = set()
+    for startup in startups:
+        for fonte in fontes_por_startup[startup["nome"]]:
+            if id(fonte) not in vistas:
+                vistas.add(id(fonte))
+                fontes_unicas.append(fonte)
+    
+    context = f"VC Investidor: {vc_name}\nStartups:\n"
+    context += "\n".join(f"- {s['nome']}" for s in startups)
+    context += f"\nCampos a preencher: {', '.join(campos)}\n\nFontes:\n\n"
+    for i, fonte in enumerate(fontes_unicas, 1):
+        context += f"=== FONTE {i} ===\n{fonte['content'][:2000]}\n\n"
+    
+    prompt = f"""{context}
+
+TAREFA: Para CADA startup listada, extraia APENAS os campos: {', '.join(campos)}.
+
+Retorne um objeto JSON cujas chaves são os nomes das startups exatamente como listados:
+{{
+  "Nome da Startup": {{"campo1": "valor encontrado"}}
+}}
+
+Inclua somente campos com informação válida nas fontes. Omita startups sem informação.
+Retorne {{}} se nada for encontrado.
+
+JSON:"""
+    
+    try:
+        response = analyze_func(prompt, temperature=0.1, rota="enriquecimento_lote")
+        dados = processar_resposta_json(response)
+    except Exception:
+        return {}
+    if not isinstance(dados, dict):
+        return {}
+    return {chave_nome(nome): valores for nome, valores in dados.items() if isinstance(valores, dict)}
+
+
+def vincular_campos_as_fontes(startup, campos, sources):
+    """
+    Registra a proveniência dos campos de uma startup
+    
+    Cada campo é ligado às fontes cujo conteúdo menciona o valor; se nenhuma
+    menciona (ex: valor reformatado pela IA), liga a todas as fontes usadas.
+    """
+    hashes_disponiveis = [(s["hash"], s.get("content", "").lower()) for s in sources if s.get("hash")]
+    if not hashes_disponiveis:
+        return
+    
+    campos_por_hash = {}
+    for campo in campos:
+        valor = startup.get(campo)
+        if campo == "vc_investidor" or not valor or valor in ["Não informado", "—"]:
+            continue
+        
+        valor_busca = str(valor).lower()
+        hashes = [h for h, conteudo in hashes_disponiveis if valor_busca in conteudo]
+        campos_por_hash[campo] = (valor, hashes or [h for h, _ in hashes_disponiveis])
+    
+    try:
+        registrar_proveniencia(startup.get("nome", ""), startup.get("vc_investidor", ""), campos_por_hash)
+    except Exception as e:
+        log.warning(f"⚠️ Não foi possível registrar proveniência: {str(e)}")
+
+
+def reextrair_startups_armazenadas(hashes, vc_name, analyze_func):
+    """
+    Refaz a extração a partir de fontes já armazenadas, sem chamadas de busca
+    
+    Args:
+        hashes (list): Hashes das fontes (ex: detalhes_por_vc[vc]["fontes_hashes"])
+        vc_name (str): Nome do VC
+        analyze_func: Função de análise
+    
+    Returns:
+        list: Lista de startups extraídas
+    """
+    fontes = carregar_fontes(hashes)
+    return extrair_startups_de_fontes(fontes, vc_name, analyze_func, contexto_maximo=True)
+
+
 def identificar_campos_vazios(startup):
     """Identifica campos vazios ou com 'Não informado'"""
     campos_importantes = [
@@ -394,13 +1363,7 @@ def identificar_campos_vazios(startup):
         'linkedin_fundador', 'site', 'ano_fundacao'
     ]
     
-    vazios = []
-    for campo in campos_importantes:
-        valor = startup.get(campo, "")
-        if not valor or valor == "Não informado" or valor == "—":
-            vazios.append(campo)
-    
-    return vazios
+    return [campo for campo in campos_importantes if not campo_preenchido(startup.get(campo))]
 
 
 def gerar_query_enriquecimento(startup, campos_vazios, vc_name):
@@ -425,6 +1388,7 @@ def gerar_query_enriquecimento(startup, campos_vazios, vc_name):
     return query
 
 
+@tracing.rastreado("extracao_campos")
 def extrair_dados_especificos(sources, startup, campos_vazios, analyze_func):
     """Extrai dados específicos para preencher campos faltantes"""
     if not sources:
@@ -453,7 +1417,7 @@ Retorne {{}} se nenhuma informação foi encontrada.
 JSON:"""
     
     try:
-        response = analyze_func(prompt, max_tokens=500, temperature=0.1)
+        response = analyze_func(prompt, temperature=0.1, rota="enriquecimento")
         dados = processar_resposta_json(response)
         return dados if isinstance(dados, dict) else {}
     except:
@@ -465,50 +1429,27 @@ def selecionar_melhores_startups(startups, limite=10):
     if len(startups) <= limite:
         return startups
     
-    # Calcular score de completude
-    for startup in startups:
-        campos_preenchidos = sum(
-            1 for v in startup.values()
-            if v and v != "Não informado" and v != "—"
-        )
-        startup['_completude_score'] = campos_preenchidos
-    
-    # Ordenar por completude e pegar top N
-    startups_ordenadas = sorted(
-        startups,
-        key=lambda x: x.get('_completude_score', 0),
-        reverse=True
-    )
+    # Score de completude calculado uma vez, sem alterar os dicts
+    scores = calcular_scores(startups)
     
-    # Remover score temporário
-    melhores = startups_ordenadas[:limite]
-    for s in melhores:
-        s.pop('_completude_score', None)
+    # Ordenar por completude (estável: empates mantêm a ordem original) e pegar top N
+    ordem = heapq.nlargest(limite, range(len(startups)), key=scores.__getitem__)
     
-    return melhores
+    return [startups[i] for i in ordem]
 
 
 def validar_startups(startups, vc_name):
-    """Valida e normaliza estrutura das startups"""
+    """Valida e normaliza estrutura das startups (registros Startup com os 10 campos)"""
     if not isinstance(startups, list):
         return []
     
-    campos_obrigatorios = [
-        'nome', 'site', 'setor', 'ano_fundacao', 'valor_investimento',
-        'rodada', 'data_investimento', 'vc_investidor', 'descricao_breve',
-        'linkedin_fundador'
-    ]
-    
     validadas = []
     for item in startups:
         if not isinstance(item, dict):
             continue
         
-        # Garantir todos os campos
-        startup_validada = {}
-        for campo in campos_obrigatorios:
-            valor = item.get(campo, "Não informado")
-            startup_validada[campo] = valor if valor else "Não informado"
+        # Garantir todos os campos (vazios viram "Não informado")
+        startup_validada = Startup.de_dict(item, preencher_vazios=True, com_extras=False)
         
         # Garantir que vc_investidor está correto
         startup_validada['vc_investidor'] = vc_name
@@ -521,24 +1462,9 @@ def validar_startups(startups, vc_name):
 
 
 def processar_resposta_json(response):
-    """Processa resposta da IA e extrai JSON"""
-    try:
-        # Limpar resposta
-        cleaned = response.strip()
-        
-        # Remover markdown
-        if cleaned.startswith('```'):
-            lines = cleaned.split('\n')
-            cleaned = '\n'.join(lines[1:-1] if len(lines) > 2 else lines[1:])
-        
-        # Encontrar JSON
-        json_start = cleaned.find('[') if '[' in cleaned else cleaned.find('{')
-        json_end = cleaned.rfind(']') + 1 if ']' in cleaned else cleaned.rfind('}') + 1
-        
-        if json_start != -1 and json_end > json_start:
-            json_string = cleaned[json_start:json_end]
-            return json.loads(json_string)
-        
-        return []
-    except:
-        return []
\ No newline at end of file
+    """Processa resposta da IA e extrai JSON (recupera objetos de respostas malformadas)"""
+    dados, qualidade = reparar_json(response)
+    if qualidade["status"] != "valido":
+        log.info(f"🩹 JSON {qualidade['status']}: {qualidade['objetos']} objetos recuperados "
+                 f"({', '.join(qualidade['reparos']) or 'sem reparos'})", status=qualidade["status"])
+    return dados
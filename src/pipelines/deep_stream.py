@@ -0,0 +1,264 @@
+# arquivo: src/pipelines/deep_stream.py
+"""
+Pesquisa profunda em fluxo (biblioteca e CLI)
+
+Em vez de um dict no final, devolve um iterador (ou iterador assíncrono) de
+eventos, um por VC concluída, e opcionalmente um por startup:
+
+    {"tipo": "startup", "vc": ..., "startup": {...}}           (por_startup=True)
+    {"tipo": "vc", "vc": ..., "startups": [...], "detalhes": {...}}
+    {"tipo": "fim", "vcs_concluidas": [...], "vcs_nao_pesquisadas": [...],
+     "total_startups": n, "cancelado": bool, "prazo_esgotado": bool, "duracao_s": s}
+
+Com por_startup=True, o evento "vc" vem sem "startups". `detalhes` tem o
+mesmo formato de metadados.detalhes_por_vc. As VCs são pesquisadas uma a uma,
+cada uma com seu próprio enriquecimento (Camada 2), para que o evento já saia
+com os dados finais. As fontes não ficam em memória entre VCs.
+
+Uso:
+    from pipelines.deep_stream import pesquisar_startups_profundo_stream
+
+    with pesquisar_startups_profundo_stream(["Kaszek", "Monashees"], por_startup=True) as fluxo:
+        for evento in fluxo:          # ou: async for evento in fluxo
+            ...
+            if basta:
+                fluxo.cancelar()      # a VC em andamento para na próxima etapa
+
+CLI (um evento JSON por linha):
+    PYTHONPATH=src python -m pipelines.deep_stream Kaszek Monashees -o resultado.jsonl
+"""
+import argparse
+import asyncio
+import contextvars
+import json
+import signal
+import sys
+import threading
+import time
+
+from utils import deadline
+from utils import tracing
+from utils.circuit_breaker import provedores_indisponiveis
+from utils.startup_record import json_padrao
+from pipelines.deep_pipeline_manager import (
+    PROVEDORES_PESQUISA,
+    carregar_funcoes_pesquisa,
+    pesquisar_pelo_caminho_normal,
+    processar_vc_individual,
+    resumir_resultado_degradado,
+    resumir_resultado_vc
+)
+
+log = tracing.obter_logger("deep_stream")
+
+
+class FluxoPesquisaProfunda:
+    """
+    Iterador de eventos de uma pesquisa profunda
+
+    O prazo (e o cancelamento) valem para todas as etapas e chamadas externas,
+    como em executar_pesquisa_profunda. O fluxo roda em um contexto próprio,
+    então pode ser consumido de qualquer thread ou de um loop asyncio.
+    """
+
+    def __init__(self, lista_vcs, search_func=None, analyze_func=None, por_startup=False, especulativo=False,
+                 prazo_segundos=None):
+        self.lista_vcs = list(dict.fromkeys(lista_vcs))
+        self.search_func = search_func
+        self.analyze_func = analyze_func
+        self.por_startup = por_startup
+        self.especulativo = especulativo
+        # Sem prazo_segundos, o prazo só serve para cancelar
+        self.prazo = deadline.Prazo(prazo_segundos)
+        self._contexto = contextvars.copy_context()
+        self._contexto.run(deadline.definir_prazo, self.prazo)
+        self._gerador = self._eventos()
+        self._lock = threading.Lock()
+
+    # -- consumo -----------------------------------------------------------
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        with self._lock:
+            return self._contexto.run(next, self._gerador)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return await asyncio.to_thread(self._proximo_assincrono)
+        except asyncio.CancelledError:
+            # Tarefa cancelada: a thread em andamento termina na próxima etapa
+            self.cancelar()
+            raise
+
+    def _proximo_assincrono(self):
+        try:
+            return next(self)
+        except StopIteration:
+            raise StopAsyncIteration
+
+    def cancelar(self):
+        """Interrompe a pesquisa: nenhuma VC nova começa e a atual para na próxima etapa"""
+        self.prazo.cancelar()
+
+    @property
+    def cancelado(self):
+        return self.prazo.cancelado
+
+    def close(self):
+        """Cancela e encerra o gerador (espera a etapa em andamento)"""
+        self.cancelar()
+        with self._lock:
+            self._contexto.run(self._gerador.close)
+
+    async def aclose(self):
+        await asyncio.to_thread(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *excecao):
+        await self.aclose()
+
+    # -- produção ----------------------------------------------------------
+
+    def _eventos(self):
+        inicio = time.perf_counter()
+        raiz, token = tracing.iniciar_span("pesquisa_profunda_stream", lista_vcs=self.lista_vcs,
+                                           por_startup=self.por_startup)
+        concluidas = []
+        total_startups = 0
+        try:
+            if self.search_func is None or self.analyze_func is None:
+                funcoes = carregar_funcoes_pesquisa()
+                if "erro" in funcoes:
+                    raiz.anotar(erro=funcoes["erro"])
+                    yield {"tipo": "erro", "erro": funcoes["erro"]}
+                    return
+                self.search_func = self.search_func or funcoes["search_func"]
+                self.analyze_func = self.analyze_func or funcoes["analyze_func"]
+
+            for vc_name in self.lista_vcs:
+                if self.prazo.esgotado():
+                    break
+                startups, detalhes = self._pesquisar_vc(vc_name)
+                if self.prazo.cancelado:
+                    # Resultado parcial de quem já pediu para parar
+                    break
+
+                concluidas.append(vc_name)
+                total_startups += len(startups)
+                if self.por_startup:
+                    for startup in startups:
+                        yield {"tipo": "startup", "vc": vc_name, "startup": startup}
+                    yield {"tipo": "vc", "vc": vc_name, "detalhes": detalhes}
+                else:
+                    yield {"tipo": "vc", "vc": vc_name, "startups": startups, "detalhes": detalhes}
+
+            raiz.anotar(vcs_concluidas=len(concluidas), startups=total_startups, cancelado=self.prazo.cancelado)
+            yield {
+                "tipo": "fim",
+                "vcs_concluidas": concluidas,
+                "vcs_nao_pesquisadas": [vc for vc in self.lista_vcs if vc not in concluidas],
+                "total_startups": total_startups,
+                "cancelado": self.prazo.cancelado,
+                "prazo_esgotado": self.prazo.esgotado() and not self.prazo.cancelado,
+                "duracao_s": round(time.perf_counter() - inicio, 3)
+            }
+        finally:
+            try:
+                tracing.finalizar_span(raiz, token)
+            except ValueError:
+                # Gerador descartado sem close(), fora do contexto do fluxo
+                pass
+
+    def _pesquisar_vc(self, vc_name):
+        """(startups, detalhes) de uma VC, pelo caminho normal se Exa/Cerebras estiverem fora"""
+        indisponiveis = provedores_indisponiveis(PROVEDORES_PESQUISA)
+        if not indisponiveis:
+            log.info(f"🎯 PESQUISANDO: {vc_name}", vc=vc_name)
+            startups_vc = processar_vc_individual(
+                vc_name,
+                self.search_func,
+                self.analyze_func,
+                especulativo=self.especulativo,
+                memoria_limitada=True
+            )
+            indisponiveis = provedores_indisponiveis(PROVEDORES_PESQUISA)
+            if startups_vc["sucesso"] or not indisponiveis:
+                return startups_vc["startups"], resumir_resultado_vc(startups_vc)
+
+        degradacao = pesquisar_pelo_caminho_normal([vc_name], indisponiveis)
+        return degradacao["resultado"], resumir_resultado_degradado(degradacao, vc_name)
+
+
+def pesquisar_startups_profundo_stream(lista_vcs, por_startup=False, especulativo=False, prazo_segundos=None):
+    """
+    Versão em fluxo de pesquisar_startups_profundo
+
+    Args:
+        lista_vcs (list): Nomes das VCs
+        por_startup (bool): Emite um evento por startup, além do evento da VC
+        especulativo (bool): Camada 3 especulativa (ver processar_vc_individual)
+        prazo_segundos (float): Orçamento de latência da pesquisa inteira
+
+    Returns:
+        FluxoPesquisaProfunda: iterável com `for` ou `async for`
+    """
+    return FluxoPesquisaProfunda(lista_vcs, por_startup=por_startup, especulativo=especulativo,
+                                 prazo_segundos=prazo_segundos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pesquisa profunda em fluxo, gravada como JSONL")
+    parser.add_argument("vcs", nargs="+", help="Nomes das VCs")
+    parser.add_argument("-o", "--saida", default="-", help="Arquivo JSONL (padrão: stdout)")
+    parser.add_argument("--por-startup", action="store_true", help="Um evento por startup")
+    parser.add_argument("--especulativo", action="store_true")
+    parser.add_argument("--prazo", type=float, default=None, help="Prazo da pesquisa em segundos")
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+    load_dotenv("keys.env")
+
+    # O JSONL fica sozinho no stdout; logs e prints vão para o stderr
+    arquivo = None if args.saida == "-" else open(args.saida, "w", encoding="utf-8")
+    saida = arquivo or sys.stdout
+    sys.stdout = sys.stderr
+
+    fluxo = pesquisar_startups_profundo_stream(args.vcs, por_startup=args.por_startup,
+                                               especulativo=args.especulativo, prazo_segundos=args.prazo)
+
+    def interromper(sinal, quadro):
+        # 1º Ctrl+C cancela e ainda grava o evento "fim"; o 2º encerra na hora
+        if fluxo.cancelado:
+            raise KeyboardInterrupt
+        log.warning("⏹️ Cancelando pesquisa (Ctrl+C de novo para sair)...")
+        fluxo.cancelar()
+
+    signal.signal(signal.SIGINT, interromper)
+    evento = {}
+    try:
+        for evento in fluxo:
+            saida.write(json.dumps(evento, ensure_ascii=False, default=json_padrao) + "\n")
+            saida.flush()
+    finally:
+        fluxo.close()
+        if arquivo:
+            arquivo.close()
+
+    return 1 if evento.get("tipo") == "erro" else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+# arquivo: src/pipelines/enrichment_scheduler.py
+"""
+Agendador global de enriquecimento
+
+Em vez de um orçamento fixo por VC (5 startups x 3 ciclos), todas as
+startups da pesquisa disputam um único orçamento de buscas e chamadas de IA.
+A cada passo é executada a startup cujos campos faltantes têm maior valor
+esperado: importância do campo x taxa de acerto observada até agora para
+esse campo x peso pela posição da startup no ranking da sua VC.
+"""
+
+from utils.config_loader import load_section
+
+IMPORTANCIA_PADRAO = {
+    'valor_investimento': 1.0,
+    'data_investimento': 0.8,
+    'rodada': 0.8,
+    'site': 0.6,
+    'ano_fundacao': 0.5,
+    'linkedin_fundador': 0.4
+}
+
+CONFIG_PADRAO = {
+    "agendamento_global": True,
+    "orcamento_buscas_por_vc": 8,
+    "orcamento_llm_por_vc": 8,
+    "orcamento_maximo_buscas": 120,
+    "orcamento_maximo_llm": 120,
+    "campos_por_busca": 3,
+    "busca_em_lote": True,
+    "startups_por_lote": 4,
+    "campos_agrupaveis": ["valor_investimento", "data_investimento", "rodada"],
+    "max_tentativas_por_startup": 3,
+    "taxa_acerto_inicial": 0.5,
+    "valor_minimo": 0.05,
+    "importancia_campos": IMPORTANCIA_PADRAO
+}
+
+
+def carregar_config_enriquecimento():
+    config = dict(CONFIG_PADRAO)
+    config.update(load_section("enriquecimento", {}) or {})
+    return config
+
+
+def calcular_orcamento(num_vcs, config=None, total=None):
+    """
+    Orçamento da requisição: proporcional ao número de VCs, com teto
+    
+    Args:
+        num_vcs (int): Número de VCs na pesquisa
+        config (dict): Configuração de enriquecimento
+        total (int): Se informado, sobrescreve o orçamento de buscas e de IA
+    
+    Returns:
+        dict: {"buscas": int, "llm": int}
+    """
+    config = config or carregar_config_enriquecimento()
+    if total is not None:
+        return {"buscas": int(total), "llm": int(total)}
+    return {
+        "buscas": min(config["orcamento_buscas_por_vc"] * num_vcs, config["orcamento_maximo_buscas"]),
+        "llm": min(config["orcamento_llm_por_vc"] * num_vcs, config["orcamento_maximo_llm"])
+    }
+
+
+class AgendadorEnriquecimento:
+    """Distribui um orçamento de buscas/IA entre tarefas (startup, campos) por valor esperado"""
+    
+    def __init__(self, orcamento, config=None):
+        self.config = config or carregar_config_enriquecimento()
+        self.importancia = {**IMPORTANCIA_PADRAO, **self.config.get("importancia_campos", {})}
+        self.restante = dict(orcamento)
+        self.gasto = {"buscas": 0, "llm": 0}
+        self.tentativas_campo = {}
+        self.acertos_campo = {}
+        self.pendentes = []
+    
+    def adicionar(self, startup, campos_vazios, rank, identificador=None):
+        """Registra uma startup com campos faltantes; rank 0 = mais relevante da VC"""
+        if campos_vazios:
+            self.pendentes.append({
+                "startup": startup,
+                "campos": list(campos_vazios),
+                "rank": rank,
+                "id": identificador,
+                "tentativas": 0
+            })
+    
+    def taxa_acerto(self, campo):
+        """Taxa de acerto suavizada (começa em taxa_acerto_inicial e converge para a observada)"""
+        inicial = self.config["taxa_acerto_inicial"]
+        tentativas = self.tentativas_campo.get(campo, 0)
+        acertos = self.acertos_campo.get(campo, 0)
+        return (acertos + 2 * inicial) / (tentativas + 2)
+    
+    def valor_campo(self, campo, rank):
+        return self.importancia.get(campo, 0.3) * self.taxa_acerto(campo) / (1 + 0.15 * rank)
+    
+    def _melhores_campos(self, tarefa):
+        campos = sorted(tarefa["campos"], key=lambda c: self.valor_campo(c, tarefa["rank"]), reverse=True)
+        return campos[:self.config["campos_por_busca"]]
+    
+    def valor_esperado(self, tarefa):
+        """Valor esperado de uma busca para a tarefa, decaindo a cada nova tentativa"""
+        valor = sum(self.valor_campo(c, tarefa["rank"]) for c in self._melhores_campos(tarefa))
+        return valor / (1 + tarefa["tentativas"])
+    
+    def tem_orcamento(self):
+        return self.restante["buscas"] > 0 and self.restante["llm"] > 0
+    
+    def proxima(self):
+        """Remove e retorna a tarefa de maior valor esperado, ou None"""
+        if not self.pendentes or not self.tem_orcamento():
+            return None
+        melhor = max(self.pendentes, key=self.valor_esperado)
+        if self.valor_esperado(melhor) < self.config["valor_minimo"]:
+            return None
+        self.pendentes.remove(melhor)
+        return melhor
+    
+    def registrar_custo(self, buscas=1, chamadas_llm=1):
+        """Desconta buscas/chamadas de IA do orçamento"""
+        self.restante["buscas"] -= buscas
+        self.restante["llm"] -= chamadas_llm
+        self.gasto["buscas"] += buscas
+        self.gasto["llm"] += chamadas_llm
+    
+    def registrar_campos(self, campos_tentados, campos_preenchidos):
+        """Atualiza as taxas de acerto por campo"""
+        for campo in campos_tentados:
+            self.tentativas_campo[campo] = self.tentativas_campo.get(campo, 0) + 1
+            if campo in campos_preenchidos:
+                self.acertos_campo[campo] = self.acertos_campo.get(campo, 0) + 1
+    
+    def registrar(self, tarefa, campos_tentados, campos_preenchidos, buscas=1, chamadas_llm=1):
+        """Contabiliza o custo, atualiza taxas de acerto e recoloca a tarefa se ainda faltar algo"""
+        self.registrar_custo(buscas, chamadas_llm)
+        self.registrar_campos(campos_tentados, campos_preenchidos)
+        
+        tarefa["tentativas"] += 1
+        tarefa["campos"] = [c for c in tarefa["campos"] if c not in campos_preenchidos]
+        if tarefa["campos"] and tarefa["tentativas"] < self.config["max_tentativas_por_startup"]:
+            self.pendentes.append(tarefa)
+    
+    def executar(self, executar_tarefa, deve_parar=None):
+        """
+        Executa tarefas em ordem de prioridade até esgotar orçamento ou tarefas
+        
+        Args:
+            executar_tarefa: função (tarefa, campos) -> (campos_preenchidos,
+                buscas_usadas, chamadas_llm_usadas)
+            deve_parar: função sem argumentos consultada antes de cada tarefa
+                (ex: prazo da pesquisa); True interrompe a execução
+        
+        Returns:
+            dict: Resumo do gasto e das taxas de acerto por campo
+        """
+        tarefas_executadas = 0
+        campos_preenchidos_total = 0
+        interrompido = False
+        
+        while True:
+            if deve_parar and self.pendentes and self.tem_orcamento() and deve_parar():
+                interrompido = True
+                break
+            tarefa = self.proxima()
+            if tarefa is None:
+                break
+            campos = self._melhores_campos(tarefa)
+            preenchidos, buscas, chamadas_llm = executar_tarefa(tarefa, campos)
+            self.registrar(tarefa, campos, preenchidos, buscas, chamadas_llm)
+            tarefas_executadas += 1
+            campos_preenchidos_total += len(preenchidos)
+        
+        return {
+            "orcamento_restante": dict(self.restante),
+            "gasto": dict(self.gasto),
+            "tarefas_executadas": tarefas_executadas,
+            "campos_preenchidos": campos_preenchidos_total,
+            "tarefas_nao_atendidas": len(self.pendentes),
+            "interrompido": interrompido,
+            "taxa_acerto_por_campo": {
+                campo: round(self.taxa_acerto(campo), 3) for campo in sorted(self.tentativas_campo)
+            }
+        }
@@ -1,10 +1,19 @@
 # arquivo: src/pipelines/pipeline_manager.py
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 from crewai import Crew, Task, LLM  # Importe LLM do crewai
 
 # Importe seus agentes e tarefas
 from src.agents.vc_research_agent import vc_research_agent
 # Se você tiver mais agentes, importe-os aqui
+from pipelines.deep_pipeline_manager import processar_resposta_json
+from utils import tracing
+from utils.circuit_breaker import obter_disjuntor
+from utils.config_loader import load_section
+from utils.startup_record import Startup
 
 # 1. Crie a instância do LLM da Perplexity (método do notebook)
 #    Certifique-se de que load_dotenv() já foi chamado no app.py
@@ -19,26 +28,149 @@ vc_research_agent.llm = perplexity_llm
 # Se tiver outros agentes, atribua o LLM a eles também
 # ex: outro_agente.llm = perplexity_llm
 
-# 3. Defina sua função de pipeline (o resto do código)
+# 3. Tarefa e Crew criados uma única vez; cada VC usa uma cópia com {vc_name} interpolado
+pesquisa_task = Task(
+    description="""Pesquise e liste 10 startups que foram investidas pela venture
+    capital: {vc_name}. Retorne os dados em uma lista de
+    dicionários JSON, sem CSV e sem texto extra. Cada dicionário deve conter
+    as chaves: ['nome', 'site', 'setor', 'ano_fundacao', 'valor_investimento',
+    'rodada', 'data_investimento', 'vc_investidor', 'descricao_breve',
+    'linkedin_fundador'].""",
+    expected_output="Uma lista de dicionários JSON com os dados das startups.",
+    agent=vc_research_agent
+)
+
+crew_vc = Crew(
+    agents=[vc_research_agent],
+    tasks=[pesquisa_task],
+    verbose=True
+)
+
+# Configuração do fan-out por VC (config.json > pesquisa_normal)
+_config = load_section("pesquisa_normal", {}) or {}
+MAX_WORKERS = _config.get("max_workers", 4)
+CACHE_TTL_SEGUNDOS = _config.get("cache_ttl_segundos", 86400)
+
+log = tracing.obter_logger("pipeline_normal")
+
+# Cache em memória das respostas por VC: {nome_normalizado: (timestamp, startups, origem)}
+# origem: "pesquisa" (requisição de usuário) ou "aquecimento" (pipelines.cache_warming)
+_cache_vcs = {}
+_cache_lock = threading.Lock()
+
+
+def _chave_vc(vc_name):
+    return " ".join(vc_name.lower().split())
+
+
+def _buscar_cache(vc_name):
+    """(timestamp, startups, origem) dentro do TTL, ou None"""
+    with _cache_lock:
+        item = _cache_vcs.get(_chave_vc(vc_name))
+    if item and time.time() - item[0] < CACHE_TTL_SEGUNDOS:
+        return item
+    return None
+
+
+def _salvar_cache(vc_name, startups, origem="pesquisa"):
+    with _cache_lock:
+        _cache_vcs[_chave_vc(vc_name)] = (time.time(), startups, origem)
+
+
+def idade_cache(vc_name):
+    """Segundos desde que a resposta em cache da VC foi obtida (None se não há cache válido)"""
+    item = _buscar_cache(vc_name)
+    return time.time() - item[0] if item else None
+
+
+def frescor_cache(atualizado_em, origem):
+    """Campos de frescor de uma resposta servida do cache (metadados.por_vc)"""
+    return {
+        "atualizado_em": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(atualizado_em)),
+        "idade_segundos": round(time.time() - atualizado_em),
+        "aquecido": origem == "aquecimento"
+    }
+
+
+@tracing.rastreado("vc", "vc_name")
+def pesquisar_vc_individual(vc_name: str, ignorar_cache: bool = False, origem: str = "pesquisa"):
+    """
+    Executa a pesquisa normal (Perplexity) para uma única VC
+    
+    Args:
+        vc_name (str): Nome da VC
+        ignorar_cache (bool): Pesquisa mesmo com resposta válida em cache (renovação)
+        origem (str): Quem pediu ("pesquisa" ou "aquecimento"), guardado no cache
+    
+    Returns:
+        dict: {"startups": [...], "cache": bool, "frescor": dict (se cache),
+            "erro": str opcional}
+    """
+    em_cache = None if ignorar_cache else _buscar_cache(vc_name)
+    if em_cache is not None:
+        atualizado_em, startups_cache, origem_cache = em_cache
+        tracing.anotar(cache=True, aquecido=origem_cache == "aquecimento")
+        log.info(f"⚡ {vc_name}: resposta reutilizada do cache", vc=vc_name)
+        return {
+            "startups": [s.copy() for s in startups_cache],
+            "cache": True,
+            "frescor": frescor_cache(atualizado_em, origem_cache)
+        }
+    
+    try:
+        with tracing.span("crew_kickoff", vc=vc_name):
+            resultado_vc = obter_disjuntor("perplexity").executar(
+                crew_vc.copy().kickoff, inputs={"vc_name": vc_name}
+            )
+    except Exception as e:
+        log.error(f"❌ Erro ao pesquisar {vc_name}: {str(e)}", vc=vc_name)
+        return {"startups": [], "cache": False, "erro": str(e)}
+    
+    resultado_raw = getattr(resultado_vc, "raw", None) or ""
+    startups = processar_resposta_json(resultado_raw)
+    if not isinstance(startups, list) or not startups:
+        return {
+            "startups": [],
+            "cache": False,
+            "erro": "A resposta do agente não é um JSON válido.",
+            "saida_bruta": resultado_raw
+        }
+    
+    startups = [Startup.de_dict({"vc_investidor": vc_name, **s}) for s in startups if isinstance(s, dict)]
+    
+    _salvar_cache(vc_name, startups, origem)
+    return {"startups": startups, "cache": False}
+
+
+# 4. Defina sua função de pipeline (o resto do código)
+@tracing.rastreado("pesquisa_normal", "lista_vcs")
 def pesquisar_startups_por_vcs(lista_vcs: list):
-    # Crie a tarefa para o agente
-    pesquisa_task = Task(
-        description=f"""Pesquise e liste 10 startups que foram investidas por cada venture
-        capital: {lista_vcs}. Retorne os dados em uma lista de
-        dicionários JSON, sem CSV e sem texto extra. Cada dicionário deve conter
-        as chaves: ['nome', 'site', 'setor', 'ano_fundacao', 'valor_investimento',
-        'rodada', 'data_investimento', 'vc_investidor', 'descricao_breve',
-        'linkedin_fundador'].""",
-        expected_output="Uma lista de dicionários JSON com os dados das startups.",
-        agent=vc_research_agent
-    )
-
-    # Monte e execute o Crew
-    crew_vc = Crew(
-        agents=[vc_research_agent],
-        tasks=[pesquisa_task],
-        verbose=True
-    )
-
-    resultado_vc = crew_vc.kickoff()
-    return resultado_vc
\ No newline at end of file
+    """
+    Pesquisa cada VC em paralelo com a mesma Crew e junta os resultados
+    
+    Args:
+        lista_vcs (list): Lista de nomes de VCs
+    
+    Returns:
+        dict: {"resultado": [startups], "por_vc": {vc: detalhes}}
+    """
+    vcs_unicas = list(dict.fromkeys(lista_vcs))
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(MAX_WORKERS, len(vcs_unicas)))) as executor:
+        resultados = list(executor.map(tracing.propagar(pesquisar_vc_individual), vcs_unicas))
+    
+    todas_startups = []
+    por_vc = {}
+    for vc_name, resultado in zip(vcs_unicas, resultados):
+        todas_startups.extend(resultado["startups"])
+        por_vc[vc_name] = {
+            "startups_encontradas": len(resultado["startups"]),
+            "cache": resultado["cache"],
+            **resultado.get("frescor", {})
+        }
+        if resultado.get("erro"):
+            por_vc[vc_name]["erro"] = resultado["erro"]
+            if resultado.get("saida_bruta"):
+                por_vc[vc_name]["saida_bruta"] = resultado["saida_bruta"]
+    
+    return {"resultado": todas_startups, "por_vc": por_vc}
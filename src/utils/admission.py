@@ -0,0 +1,139 @@
+# arquivo: src/utils/admission.py
+"""Controle de admissão: fila limitada com limites global e por cliente"""
+import math
+import threading
+import time
+from collections import deque
+
+# Quantos tempos recentes guardar para estimar espera e Retry-After
+JANELA_METRICAS = 200
+
+
+class FilaCheia(Exception):
+    """Requisição recusada; retry_after é a sugestão em segundos"""
+    
+    def __init__(self, motivo, retry_after):
+        super().__init__(motivo)
+        self.motivo = motivo
+        self.retry_after = retry_after
+
+
+class ControleAdmissao:
+    """
+    Limita execuções simultâneas de um endpoint
+    
+    Até `max_concorrentes` requisições executam ao mesmo tempo; as demais
+    esperam em fila FIFO de até `max_fila` posições por no máximo
+    `max_espera_segundos`. Cada cliente pode ter no máximo `max_por_cliente`
+    requisições entre executando e aguardando. Quando algum limite é
+    atingido, FilaCheia é levantada imediatamente.
+    """
+    
+    def __init__(self, nome, max_concorrentes=2, max_fila=8, max_por_cliente=1, max_espera_segundos=60):
+        self.nome = nome
+        self.max_concorrentes = max_concorrentes
+        self.max_fila = max_fila
+        self.max_por_cliente = max_por_cliente
+        self.max_espera_segundos = max_espera_segundos
+        
+        self._cond = threading.Condition()
+        self._fila = deque()
+        self._executando = 0
+        self._por_cliente = {}
+        
+        self._esperas = deque(maxlen=JANELA_METRICAS)
+        self._duracoes = deque(maxlen=JANELA_METRICAS)
+        self._contadores = {"admitidas": 0, "recusadas_fila": 0, "recusadas_cliente": 0, "expiradas": 0}
+        self._pico_fila = 0
+    
+    def _retry_after(self):
+        """Estimativa (s) de quando haverá vaga: duração média x filas à frente"""
+        media = sum(self._duracoes) / len(self._duracoes) if self._duracoes else 30
+        rodadas = (len(self._fila) + 1) / max(1, self.max_concorrentes)
+        return max(1, math.ceil(media * rodadas))
+    
+    def adquirir(self, cliente):
+        """
+        Aguarda uma vaga para o cliente
+        
+        Returns:
+            dict: {"posicao_fila": posição ao entrar (0 = sem espera), "espera_ms"}
+        
+        Raises:
+            FilaCheia: se a fila ou o limite do cliente estiverem cheios, ou
+                se a espera passar de max_espera_segundos
+        """
+        inicio = time.perf_counter()
+        with self._cond:
+            if self._por_cliente.get(cliente, 0) >= self.max_por_cliente:
+                self._contadores["recusadas_cliente"] += 1
+                raise FilaCheia("Limite de pesquisas simultâneas por cliente atingido", self._retry_after())
+            
+            sem_espera = not self._fila and self._executando < self.max_concorrentes
+            if not sem_espera and len(self._fila) >= self.max_fila:
+                self._contadores["recusadas_fila"] += 1
+                raise FilaCheia("Servidor ocupado: fila de pesquisas cheia", self._retry_after())
+            
+            self._por_cliente[cliente] = self._por_cliente.get(cliente, 0) + 1
+            posicao = 0
+            
+            if not sem_espera:
+                ticket = object()
+                self._fila.append(ticket)
+                posicao = len(self._fila)
+                self._pico_fila = max(self._pico_fila, posicao)
+                limite = time.monotonic() + self.max_espera_segundos
+                
+                while self._fila[0] is not ticket or self._executando >= self.max_concorrentes:
+                    restante = limite - time.monotonic()
+                    if restante <= 0:
+                        self._fila.remove(ticket)
+                        self._liberar_cliente(cliente)
+                        self._contadores["expiradas"] += 1
+                        self._cond.notify_all()
+                        raise FilaCheia("Tempo máximo de espera na fila excedido", self._retry_after())
+                    self._cond.wait(restante)
+                
+                self._fila.popleft()
+            
+            self._executando += 1
+            self._contadores["admitidas"] += 1
+            espera = time.perf_counter() - inicio
+            self._esperas.append(espera)
+            # Acorda o próximo da fila caso ainda haja vaga
+            self._cond.notify_all()
+        
+        return {"posicao_fila": posicao, "espera_ms": round(espera * 1000, 1)}
+    
+    def _liberar_cliente(self, cliente):
+        restante = self._por_cliente.get(cliente, 0) - 1
+        if restante > 0:
+            self._por_cliente[cliente] = restante
+        else:
+            self._por_cliente.pop(cliente, None)
+    
+    def liberar(self, cliente, duracao):
+        """Libera a vaga ao fim da execução (duracao em segundos)"""
+        with self._cond:
+            self._executando -= 1
+            self._liberar_cliente(cliente)
+            self._duracoes.append(duracao)
+            self._cond.notify_all()
+    
+    def metricas(self):
+        with self._cond:
+            esperas = sorted(self._esperas)
+            return {
+                "executando": self._executando,
+                "fila": len(self._fila),
+                "pico_fila": self._pico_fila,
+                "limites": {
+                    "max_concorrentes": self.max_concorrentes,
+                    "max_fila": self.max_fila,
+                    "max_por_cliente": self.max_por_cliente,
+                    "max_espera_segundos": self.max_espera_segundos
+                },
+                **self._contadores,
+                "espera_media_ms": round(sum(esperas) / len(esperas) * 1000, 1) if esperas else 0,
+                "espera_p95_ms": round(esperas[int(0.95 * (len(esperas) - 1))] * 1000, 1) if esperas else 0
+            }
@@ -0,0 +1,309 @@
+# arquivo: src/utils/analytics.py
+"""
+Agregados de analytics mantidos incrementalmente
+
+Uma única tabela guarda, por dimensão (total, tipo de pesquisa, VC, setor,
+ano de fundação), o número de pesquisas, de startups, de startups com valor
+divulgado e o investimento divulgado somado. Cada pesquisa salva soma (e cada
+pesquisa removida subtrai) sua contribuição na mesma transação, então ler os
+totais não depende do tamanho do histórico.
+
+As regras de leitura dos campos (setor vazio = "Outros", valores como
+"US$ 50 milhões") são as mesmas do front-end (static/script.js), para que os
+números batam com o que a tela calculava.
+"""
+import re
+
+TABELA = "analitico_agregados"
+
+DIMENSAO_TOTAL = "total"
+# Contadores mantidos por gatilhos; hoje só o de VCs pesquisadas
+DIMENSAO_CONTAGEM = "contagem"
+CONTAGEM_VCS = "vcs_pesquisadas"
+
+SETOR_OUTROS = "Outros"
+NAO_INFORMADO = "Não informado"
+
+# Mesmos sinônimos de normalizeStartup (static/script.js)
+_CHAVES = {
+    "setor": ("setor", "sector", "industry"),
+    "ano_fundacao": ("ano_fundacao", "year", "founded_year", "founded"),
+    "valor_investimento": ("valor_investimento", "investment_value", "valor", "funding"),
+    "vc_investidor": ("vc_investidor", "vc", "investor")
+}
+
+_NUMERO_COM_SUFIXO = re.compile(r"([0-9]+(?:\.[0-9]+)?)([kKmMbB])?")
+_MULTIPLICADORES = {"K": 1_000, "M": 1_000_000, "B": 1_000_000_000}
+_ANO = re.compile(r"\b(1[89]\d{2}|20\d{2})\b")
+
+
+def criar_tabelas(conn):
+    """Cria a tabela de agregados se ainda não existir"""
+    cursor = conn.cursor()
+    cursor.execute(
+        f"CREATE TABLE IF NOT EXISTS {TABELA} ("
+        f"dimensao TEXT NOT NULL, valor TEXT NOT NULL, "
+        f"pesquisas INTEGER NOT NULL DEFAULT 0, startups INTEGER NOT NULL DEFAULT 0, "
+        f"startups_com_valor INTEGER NOT NULL DEFAULT 0, investimento INTEGER NOT NULL DEFAULT 0, "
+        f"PRIMARY KEY (dimensao, valor))"
+    )
+    cursor.execute(f"CREATE INDEX IF NOT EXISTS {TABELA}_ranking ON {TABELA} (dimensao, startups DESC)")
+
+    # VCs efetivamente pesquisadas (pesquisas > 0): os gatilhos somam 1 quando uma
+    # linha de VC passa a ter pesquisas e subtraem 1 quando deixa de ter, na
+    # mesma transação da pesquisa (o upsert de registrar_pesquisa dispara o UPDATE)
+    contar = (
+        f"INSERT INTO {TABELA} (dimensao, valor, pesquisas) VALUES ('{DIMENSAO_CONTAGEM}', '{CONTAGEM_VCS}', {{}}) "
+        f"ON CONFLICT (dimensao, valor) DO UPDATE SET pesquisas = pesquisas + excluded.pesquisas"
+    )
+    for nome, evento, condicao, variacao in (
+        ("insert", "AFTER INSERT", "new.dimensao = 'vc' AND new.pesquisas > 0", "1"),
+        ("update", "AFTER UPDATE OF pesquisas",
+         "new.dimensao = 'vc' AND (old.pesquisas > 0) != (new.pesquisas > 0)",
+         "CASE WHEN new.pesquisas > 0 THEN 1 ELSE -1 END"),
+        ("delete", "AFTER DELETE", "old.dimensao = 'vc' AND old.pesquisas > 0", "-1")
+    ):
+        cursor.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {TABELA}_vcs_{nome} {evento} ON {TABELA} "
+            f"WHEN {condicao} BEGIN {contar.format(variacao)}; END"
+        )
+    # Bancos anteriores ao contador: uma contagem completa, só na primeira vez
+    cursor.execute(
+        f"INSERT OR IGNORE INTO {TABELA} (dimensao, valor, pesquisas) "
+        f"SELECT ?, ?, COUNT(*) FROM {TABELA} WHERE dimensao = 'vc' AND pesquisas > 0 "
+        f"HAVING COUNT(*) > 0",
+        (DIMENSAO_CONTAGEM, CONTAGEM_VCS)
+    )
+    cursor.close()
+
+
+def tabelas_vazias(conn):
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT 1 FROM {TABELA} WHERE dimensao != ? LIMIT 1", (DIMENSAO_CONTAGEM,))
+    vazio = cursor.fetchone() is None
+    cursor.close()
+    return vazio
+
+
+def interpretar_valor(texto):
+    """
+    Valor numérico de um texto como "US$ 50 milhões", "1,5B" ou "300k"
+
+    Mesma regra de parseMaybeHumanNumber (static/script.js).
+
+    Returns:
+        int ou None: None quando não há número no texto
+    """
+    if not texto:
+        return None
+    limpo = re.sub(r"\s+", "", str(texto)).replace(".", "").replace(",", ".")
+    encontrado = _NUMERO_COM_SUFIXO.search(limpo)
+    if not encontrado:
+        digitos = re.sub(r"\D", "", limpo)
+        return int(digitos) if digitos else None
+    numero = float(encontrado.group(1))
+    sufixo = (encontrado.group(2) or "").upper()
+    return round(numero * _MULTIPLICADORES.get(sufixo, 1))
+
+
+def _campo(startup, campo):
+    for chave in _CHAVES[campo]:
+        valor = startup.get(chave)
+        if valor:
+            return valor
+    return None
+
+
+def _setor(startup):
+    setor = str(_campo(startup, "setor") or "").strip()
+    return SETOR_OUTROS if not setor or setor == NAO_INFORMADO else setor
+
+
+def _ano(startup):
+    encontrado = _ANO.search(str(_campo(startup, "ano_fundacao") or ""))
+    return encontrado.group(1) if encontrado else NAO_INFORMADO
+
+
+def resumir_startups(startups):
+    """
+    Contagens de uma lista de startups (mesmo formato de ler_agregados)
+
+    Args:
+        startups (list): Startups (dicts ou registros); outros itens são ignorados
+
+    Returns:
+        dict: {"startups", "startups_com_valor", "investimento", "por_setor",
+            "por_ano", "por_vc"}; cada "por_*" mapeia valor ->
+            [startups, startups_com_valor, investimento]
+    """
+    resumo = {"startups": 0, "startups_com_valor": 0, "investimento": 0, "por_setor": {}, "por_ano": {},
+              "por_vc": {}}
+    if not isinstance(startups, list):
+        return resumo
+
+    for startup in startups:
+        if not hasattr(startup, "get"):
+            continue
+        valor = interpretar_valor(_campo(startup, "valor_investimento")) or 0
+        resumo["startups"] += 1
+        resumo["startups_com_valor"] += 1 if valor else 0
+        resumo["investimento"] += valor
+        vc = str(_campo(startup, "vc_investidor") or NAO_INFORMADO).strip() or NAO_INFORMADO
+        for dimensao, chave in (("por_setor", _setor(startup)), ("por_ano", _ano(startup)), ("por_vc", vc)):
+            contagem = resumo[dimensao].setdefault(chave, [0, 0, 0])
+            contagem[0] += 1
+            contagem[1] += 1 if valor else 0
+            contagem[2] += valor
+    return resumo
+
+
+def registrar_pesquisa(conn, tipo_pesquisa, vc_list, startups, sinal=1):
+    """
+    Soma (sinal=1) ou subtrai (sinal=-1) uma pesquisa dos agregados
+
+    Args:
+        conn: Conexão DB-API (sqlite3) dentro da transação que salva a pesquisa
+        tipo_pesquisa (str): "normal", "profunda" ou "incremental"
+        vc_list (str): VCs pesquisadas, separadas por vírgula
+        startups (list): Startups do resultado (incremental: só o delta)
+        sinal (int): 1 ao salvar, -1 ao remover
+    """
+    resumo = resumir_startups(startups)
+    com_valor = resumo["startups_com_valor"]
+    # (dimensao, valor) -> [pesquisas, startups, startups_com_valor, investimento]
+    linhas = {
+        (DIMENSAO_TOTAL, ""): [1, resumo["startups"], com_valor, resumo["investimento"]],
+        ("tipo_pesquisa", tipo_pesquisa or "normal"): [1, resumo["startups"], com_valor, resumo["investimento"]]
+    }
+    for vc in dict.fromkeys(v.strip() for v in (vc_list or "").split(",") if v.strip()):
+        linhas[("vc", vc)] = [1, 0, 0, 0]
+    for dimensao, nome in (("setor", "por_setor"), ("ano", "por_ano"), ("vc", "por_vc")):
+        for valor, (quantidade, com_valor_grupo, investimento) in resumo[nome].items():
+            linha = linhas.setdefault((dimensao, valor), [0, 0, 0, 0])
+            linha[1] += quantidade
+            linha[2] += com_valor_grupo
+            linha[3] += investimento
+
+    cursor = conn.cursor()
+    cursor.executemany(
+        f"INSERT INTO {TABELA} (dimensao, valor, pesquisas, startups, startups_com_valor, investimento) "
+        f"VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (dimensao, valor) DO UPDATE SET "
+        f"pesquisas = pesquisas + excluded.pesquisas, startups = startups + excluded.startups, "
+        f"startups_com_valor = startups_com_valor + excluded.startups_com_valor, "
+        f"investimento = investimento + excluded.investimento",
+        [(dimensao, valor, *(sinal * n for n in numeros)) for (dimensao, valor), numeros in linhas.items()]
+    )
+    if sinal < 0:
+        cursor.execute(f"DELETE FROM {TABELA} WHERE pesquisas <= 0 AND startups <= 0")
+    cursor.close()
+
+
+def _linha(pesquisas, startups, startups_com_valor, investimento):
+    return {"pesquisas": pesquisas, "startups": startups, "startups_com_valor": startups_com_valor,
+            "investimento": investimento}
+
+
+def ler_totais(conn):
+    """Totais gerais e por tipo de pesquisa (leituras pela chave primária)"""
+    cursor = conn.cursor()
+    cursor.execute(
+        f"SELECT dimensao, valor, pesquisas, startups, startups_com_valor, investimento FROM {TABELA} "
+        f"WHERE dimensao IN (?, ?)",
+        (DIMENSAO_TOTAL, "tipo_pesquisa")
+    )
+    totais = _linha(0, 0, 0, 0)
+    por_tipo = {}
+    for dimensao, valor, *numeros in cursor.fetchall():
+        if dimensao == DIMENSAO_TOTAL:
+            totais = _linha(*numeros)
+        else:
+            por_tipo[valor] = _linha(*numeros)
+    cursor.close()
+    return {"totais": totais, "por_tipo": por_tipo}
+
+
+def agregados_da_lista(startups):
+    """Agregados de uma lista de startups, no formato de ler_agregados (para a resposta da pesquisa)"""
+    resumo = resumir_startups(startups)
+    agregados = {"totais": _linha(1, resumo["startups"], resumo["startups_com_valor"], resumo["investimento"])}
+    for dimensao in ("vc", "setor", "ano"):
+        agregados[f"por_{dimensao}"] = {
+            valor: _linha(0, *numeros)
+            for valor, numeros in sorted(resumo[f"por_{dimensao}"].items(), key=lambda item: -item[1][0])
+        }
+    return agregados
+
+
+def ler_agregados(conn, limite=20):
+    """
+    Todos os agregados do histórico
+
+    Args:
+        conn: Conexão DB-API (sqlite3)
+        limite (int): Máximo de itens por dimensão (VC, setor), os de mais startups
+
+    Returns:
+        dict: {"totais", "por_tipo", "por_vc", "por_setor", "por_ano"}; cada item tem
+            pesquisas, startups, startups_com_valor e investimento
+    """
+    agregados = ler_totais(conn)
+    cursor = conn.cursor()
+    for dimensao in ("vc", "setor", "ano"):
+        # Anos vêm todos, em ordem; VCs e setores, só os maiores
+        if dimensao == "ano":
+            cursor.execute(
+                f"SELECT valor, pesquisas, startups, startups_com_valor, investimento FROM {TABELA} "
+                f"WHERE dimensao = ? ORDER BY valor",
+                (dimensao,)
+            )
+        else:
+            cursor.execute(
+                f"SELECT valor, pesquisas, startups, startups_com_valor, investimento FROM {TABELA} "
+                f"WHERE dimensao = ? ORDER BY startups DESC, pesquisas DESC LIMIT ?",
+                (dimensao, limite)
+            )
+        agregados[f"por_{dimensao}"] = {valor: _linha(*numeros) for valor, *numeros in cursor.fetchall()}
+    # VCs efetivamente pesquisadas (não as citadas só como investidoras), do contador
+    cursor.execute(
+        f"SELECT pesquisas FROM {TABELA} WHERE dimensao = ? AND valor = ?",
+        (DIMENSAO_CONTAGEM, CONTAGEM_VCS)
+    )
+    contagem = cursor.fetchone()
+    agregados["totais"]["vcs"] = contagem[0] if contagem else 0
+    cursor.close()
+    return agregados
+
+
+def vcs_mais_pesquisadas(conn, limite=10, minimo=1):
+    """
+    VCs que mais aparecem em Pesquisa.vc_list
+
+    Returns:
+        list: [(vc, número de pesquisas)], da mais pesquisada para a menos
+    """
+    cursor = conn.cursor()
+    cursor.execute(
+        f"SELECT valor, pesquisas FROM {TABELA} WHERE dimensao = 'vc' AND pesquisas >= ? "
+        f"ORDER BY pesquisas DESC, valor LIMIT ?",
+        (max(1, minimo), limite)
+    )
+    vcs = cursor.fetchall()
+    cursor.close()
+    return vcs
+
+
+def reconstruir(conn, pesquisas):
+    """
+    Recalcula os agregados do zero
+
+    Args:
+        conn: Conexão DB-API (sqlite3)
+        pesquisas: Iterável de (tipo_pesquisa, vc_list, startups)
+    """
+    cursor = conn.cursor()
+    cursor.execute(f"DELETE FROM {TABELA}")
+    # Os gatilhos de DELETE podem ter recriado o contador no meio da limpeza
+    cursor.execute(f"DELETE FROM {TABELA} WHERE dimensao = ?", (DIMENSAO_CONTAGEM,))
+    cursor.close()
+    for tipo_pesquisa, vc_list, startups in pesquisas:
+        registrar_pesquisa(conn, tipo_pesquisa, vc_list, startups)
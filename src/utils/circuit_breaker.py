@@ -0,0 +1,192 @@
+# arquivo: src/utils/circuit_breaker.py
+"""
+Disjuntores (circuit breakers) por provedor: Exa, Cerebras e Perplexity
+
+Cada disjuntor observa as últimas chamadas do provedor. Se a fração de erros
+ou de chamadas lentas passa do limite, ele abre e as chamadas falham na hora
+(CircuitoAberto) por `tempo_aberto_segundos`. Depois disso, entra em
+meio-aberto e deixa passar `chamadas_teste` chamadas. Se elas funcionam, o
+disjuntor fecha; se falham, ele volta a abrir.
+"""
+import threading
+import time
+from collections import deque
+
+from utils.config_loader import load_section
+
+FECHADO = "fechado"
+ABERTO = "aberto"
+MEIO_ABERTO = "meio_aberto"
+
+CONFIG_PADRAO = {
+    "janela": 20,
+    "min_chamadas": 5,
+    "limiar_erros": 0.5,
+    "limiar_latencia_segundos": 30,
+    "fracao_lentas": 0.5,
+    "tempo_aberto_segundos": 30,
+    "chamadas_teste": 1
+}
+
+_lock = threading.Lock()
+_disjuntores = {}
+_config = None
+
+
+class CircuitoAberto(Exception):
+    """Chamada recusada sem tentar: o provedor está com o disjuntor aberto"""
+
+    def __init__(self, provedor, retry_after):
+        super().__init__(f"circuito aberto: {provedor}")
+        self.provedor = provedor
+        self.retry_after = retry_after
+
+
+class Disjuntor:
+    """Estado do disjuntor de um provedor"""
+
+    def __init__(self, nome, config):
+        self.nome = nome
+        self.config = config
+        self._lock = threading.Lock()
+        self.estado = FECHADO
+        self.resultados = deque(maxlen=config["janela"])  # (sucesso, lenta)
+        self.aberto_em = None
+        self.em_teste = 0
+        self.aberturas = 0
+        self.recusadas = 0
+
+    def _atualizar_estado(self):
+        if self.estado == ABERTO and time.monotonic() - self.aberto_em >= self.config["tempo_aberto_segundos"]:
+            self.estado = MEIO_ABERTO
+            self.em_teste = 0
+
+    def _abrir(self):
+        self.estado = ABERTO
+        self.aberto_em = time.monotonic()
+        self.aberturas += 1
+        self.resultados.clear()
+
+    def disponivel(self):
+        """
+        True se uma chamada agora seria permitida: fechado, ou meio-aberto
+        com vaga de teste livre (sem reservá-la)
+        """
+        with self._lock:
+            self._atualizar_estado()
+            if self.estado == MEIO_ABERTO:
+                return self.em_teste < self.config["chamadas_teste"]
+            return self.estado == FECHADO
+
+    def permitir(self):
+        """
+        Reserva uma chamada
+
+        Raises:
+            CircuitoAberto: se aberto, ou meio-aberto sem vaga de teste
+        """
+        with self._lock:
+            self._atualizar_estado()
+            if self.estado == FECHADO:
+                return
+            if self.estado == MEIO_ABERTO and self.em_teste < self.config["chamadas_teste"]:
+                self.em_teste += 1
+                return
+            self.recusadas += 1
+            restante = self.config["tempo_aberto_segundos"] - (time.monotonic() - self.aberto_em) \
+                if self.estado == ABERTO else 1
+            raise CircuitoAberto(self.nome, max(1, int(restante + 0.999)))
+
+    def registrar(self, sucesso, latencia):
+        """Resultado de uma chamada permitida"""
+        lenta = latencia >= self.config["limiar_latencia_segundos"]
+        with self._lock:
+            if self.estado == MEIO_ABERTO:
+                self.em_teste = max(0, self.em_teste - 1)
+                if sucesso and not lenta:
+                    self.estado = FECHADO
+                    self.resultados.clear()
+                else:
+                    self._abrir()
+                return
+            if self.estado == ABERTO:
+                return
+
+            self.resultados.append((sucesso, lenta))
+            total = len(self.resultados)
+            if total < self.config["min_chamadas"]:
+                return
+            erros = sum(1 for ok, _ in self.resultados if not ok)
+            lentas = sum(1 for _, l in self.resultados if l)
+            if erros / total >= self.config["limiar_erros"] or lentas / total >= self.config["fracao_lentas"]:
+                self._abrir()
+
+    def executar(self, funcao, *args, **kwargs):
+        """Chama `funcao` através do disjuntor (exceções contam como falha e são repassadas)"""
+        self.permitir()
+        inicio = time.perf_counter()
+        try:
+            resultado = funcao(*args, **kwargs)
+        except Exception:
+            self.registrar(False, time.perf_counter() - inicio)
+            raise
+        self.registrar(True, time.perf_counter() - inicio)
+        return resultado
+
+    def situacao(self):
+        with self._lock:
+            self._atualizar_estado()
+            total = len(self.resultados)
+            situacao = {
+                "estado": self.estado,
+                "chamadas_recentes": total,
+                "erros_recentes": sum(1 for ok, _ in self.resultados if not ok),
+                "lentas_recentes": sum(1 for _, l in self.resultados if l),
+                "aberturas": self.aberturas,
+                "chamadas_recusadas": self.recusadas
+            }
+            if self.estado == ABERTO:
+                situacao["reabre_em_segundos"] = round(
+                    self.config["tempo_aberto_segundos"] - (time.monotonic() - self.aberto_em), 1
+                )
+            return situacao
+
+
+def carregar_config():
+    global _config
+    if _config is None:
+        _config = load_section("circuit_breaker", {}) or {}
+    return _config
+
+
+def config_provedor(provedor):
+    """Parâmetros globais da seção `circuit_breaker` + ajustes em `provedores.<nome>`"""
+    config = carregar_config()
+    geral = {k: v for k, v in config.items() if k != "provedores"}
+    return {**CONFIG_PADRAO, **geral, **config.get("provedores", {}).get(provedor, {})}
+
+
+def obter_disjuntor(nome):
+    """Disjuntor do provedor (criado na primeira chamada)"""
+    disjuntor = _disjuntores.get(nome)
+    if disjuntor is None:
+        with _lock:
+            disjuntor = _disjuntores.get(nome)
+            if disjuntor is None:
+                disjuntor = Disjuntor(nome, config_provedor(nome))
+                _disjuntores[nome] = disjuntor
+    return disjuntor
+
+
+def provedores_indisponiveis(nomes):
+    """Quais dos provedores recusariam uma chamada agora (aberto, ou meio-aberto sem vaga de teste)"""
+    return [nome for nome in nomes if not obter_disjuntor(nome).disponivel()]
+
+
+def obter_estados_disjuntores():
+    """Estado de cada disjuntor, incluindo os configurados ainda sem chamadas (para /status)"""
+    for nome in carregar_config().get("provedores", {}):
+        obter_disjuntor(nome)
+    with _lock:
+        disjuntores = dict(_disjuntores)
+    return {nome: disjuntor.situacao() for nome, disjuntor in sorted(disjuntores.items())}
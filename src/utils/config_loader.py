@@ -1,9 +1,22 @@
 import json
 import os
 
+# Raiz do projeto (onde ficam app.py e config.json)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_CONFIG_PATH = os.path.join(BASE_DIR, "config.json")
+
 def load_config(path="config.json"):
     with open(path, "r") as f:
         config = json.load(f)
     for key, value in config["api_keys"].items():
         os.environ[key] = value
     return config
+
+def load_section(nome, padrao=None, path=DEFAULT_CONFIG_PATH):
+    """Lê uma seção do config.json sem alterar variáveis de ambiente"""
+    try:
+        with open(path, "r") as f:
+            config = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return padrao
+    return config.get(nome, padrao)
@@ -0,0 +1,149 @@
+# arquivo: src/utils/deadline.py
+"""
+Prazo (orçamento de latência) de uma pesquisa, propagado por contexto
+
+O prazo é definido uma vez no início da pesquisa (com_prazo) e lido pelas
+etapas e pelas chamadas externas, inclusive em threads que usam
+tracing.propagar, sem precisar passá-lo de função em função.
+"""
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturoTimeout
+from contextlib import contextmanager
+
+from utils import tracing
+
+_prazo_atual = contextvars.ContextVar("prazo_atual", default=None)
+
+# Chamadas sem timeout próprio rodam aqui para poderem ser abandonadas no prazo
+_executor = None
+_trava_executor = threading.Lock()
+
+# De quanto em quanto tempo uma chamada em andamento confere se o prazo foi cancelado
+INTERVALO_VERIFICACAO = 0.5
+
+
+class PrazoEsgotado(Exception):
+    """O prazo da pesquisa acabou antes (ou durante) a etapa"""
+
+
+class Prazo:
+    """
+    Instante limite (relógio monotônico) de uma pesquisa
+
+    `segundos=None` cria um prazo sem limite que ainda pode ser cancelado:
+    cancelar() esgota o prazo na hora, e as etapas e chamadas que o consultam
+    param como se o tempo tivesse acabado.
+    """
+
+    def __init__(self, segundos):
+        self.segundos = segundos
+        self.inicio = time.monotonic()
+        self.fim = self.inicio + segundos if segundos is not None else float("inf")
+        self.cancelado = False
+
+    def cancelar(self):
+        self.cancelado = True
+        self.fim = time.monotonic()
+
+    def restante(self):
+        return max(0.0, self.fim - time.monotonic())
+
+    def decorrido(self):
+        return time.monotonic() - self.inicio
+
+    def esgotado(self):
+        return self.restante() <= 0
+
+    def permite(self, segundos):
+        """Há pelo menos `segundos` antes do prazo?"""
+        return self.restante() >= segundos
+
+
+@contextmanager
+def com_prazo(segundos):
+    """Define o prazo do contexto atual; `None` mantém a execução sem prazo"""
+    if segundos is None:
+        yield None
+        return
+    prazo = Prazo(segundos)
+    token = _prazo_atual.set(prazo)
+    try:
+        yield prazo
+    finally:
+        _prazo_atual.reset(token)
+
+
+def prazo_atual():
+    return _prazo_atual.get()
+
+
+def tempo_restante():
+    """Segundos até o prazo, ou None sem prazo (ou com prazo sem limite)"""
+    prazo = _prazo_atual.get()
+    if prazo is None or prazo.segundos is None and not prazo.cancelado:
+        return None
+    return prazo.restante()
+
+
+def definir_prazo(prazo):
+    """Define o prazo do contexto atual sem restaurá-lo depois (contextos próprios, ver copy_context)"""
+    return _prazo_atual.set(prazo)
+
+
+def permite(segundos):
+    """True se não há prazo ou se ainda restam `segundos`"""
+    prazo = _prazo_atual.get()
+    return prazo is None or prazo.permite(segundos)
+
+
+def limitar_timeout(timeout):
+    """
+    Timeout de uma chamada externa limitado ao tempo restante
+
+    Raises:
+        PrazoEsgotado: se o prazo já acabou
+    """
+    prazo = _prazo_atual.get()
+    if prazo is None:
+        return timeout
+    restante = prazo.restante()
+    if restante <= 0:
+        raise PrazoEsgotado("prazo esgotado antes da chamada")
+    if restante == float("inf"):
+        return timeout
+    return min(timeout, restante) if timeout else restante
+
+
+def executar_com_prazo(funcao, *args, **kwargs):
+    """
+    Executa uma chamada sem timeout próprio respeitando o prazo
+
+    Sem prazo, chama direto. Com prazo, roda em thread auxiliar e desiste ao
+    fim do tempo restante ou quando o prazo é cancelado (a chamada em
+    andamento termina em segundo plano e seu resultado é descartado).
+
+    Raises:
+        PrazoEsgotado: se o prazo acabou antes do retorno
+    """
+    prazo = _prazo_atual.get()
+    if prazo is None:
+        return funcao(*args, **kwargs)
+    if prazo.esgotado():
+        raise PrazoEsgotado("prazo esgotado antes da chamada")
+
+    global _executor
+    if _executor is None:
+        with _trava_executor:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="chamada-prazo")
+    contexto = contextvars.copy_context()
+    futuro = _executor.submit(tracing.executar_no_contexto, contexto, funcao, *args, **kwargs)
+    while True:
+        try:
+            return futuro.result(timeout=min(prazo.restante(), INTERVALO_VERIFICACAO))
+        except FuturoTimeout:
+            if prazo.esgotado():
+                futuro.cancel()
+                raise PrazoEsgotado("prazo esgotado durante a chamada")
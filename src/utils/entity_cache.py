@@ -0,0 +1,261 @@
+# arquivo: src/utils/entity_cache.py
+"""
+Cache de atributos de startups entre pesquisas
+
+Site, ano de fundação e LinkedIn do fundador pertencem à startup, não à
+pesquisa nem à VC. Cada valor encontrado (na extração ou no enriquecimento)
+é guardado por identidade canônica da startup + campo, com a fonte e o
+horário. Antes de qualquer busca de enriquecimento, os campos vazios são
+preenchidos daqui. Um valor só é usado enquanto estiver dentro do TTL do seu
+campo. Campos do investimento (valor, data, rodada) dependem da VC e não
+entram no cache.
+"""
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+
+from utils.config_loader import BASE_DIR, load_section
+from utils.quality_scoring import campo_preenchido
+
+DB_PATH = os.environ.get("ATRIBUTOS_DB_PATH", os.path.join(BASE_DIR, "data", "atributos.db"))
+
+DIA = 86400
+
+CONFIG_PADRAO = {
+    "habilitado": True,
+    # Só os campos listados aqui são guardados e reaproveitados
+    "ttl_segundos": {
+        "site": 180 * DIA,
+        "ano_fundacao": 365 * DIA,
+        "linkedin_fundador": 60 * DIA
+    }
+}
+
+# Sufixos societários ignorados na identidade ("Nubank S.A." = "nubank")
+_SUFIXOS = re.compile(r"\s+(inc|ltda|ltd|llc|sa|s a|corp|co|gmbh|me|eireli)$")
+
+_lock_schema = threading.Lock()
+_schema_criado = set()
+_lock = threading.Lock()
+_metricas = {"consultas": 0, "campos_preenchidos": 0, "campos_expirados": 0, "campos_gravados": 0}
+_config = None
+
+
+def carregar_config():
+    global _config
+    if _config is None:
+        config = load_section("cache_atributos", {}) or {}
+        _config = {
+            **CONFIG_PADRAO,
+            **config,
+            "ttl_segundos": {**CONFIG_PADRAO["ttl_segundos"], **config.get("ttl_segundos", {})}
+        }
+    return _config
+
+
+def _conectar(db_path=DB_PATH):
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=30)
+    if db_path not in _schema_criado:
+        with _lock_schema:
+            if db_path not in _schema_criado:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS atributos (
+                        startup TEXT NOT NULL,
+                        campo TEXT NOT NULL,
+                        valor TEXT NOT NULL,
+                        fonte TEXT,
+                        atualizado_em REAL NOT NULL,
+                        PRIMARY KEY (startup, campo)
+                    )
+                """)
+                # Entradas por campo para /status, mantidas por gatilho na mesma
+                # transação (o upsert de um par já guardado não dispara o INSERT)
+                conn.executescript("""
+                    CREATE TABLE IF NOT EXISTS atributos_por_campo (
+                        campo TEXT PRIMARY KEY,
+                        entradas INTEGER NOT NULL
+                    );
+                    CREATE TRIGGER IF NOT EXISTS atributos_por_campo_insert AFTER INSERT ON atributos BEGIN
+                        INSERT INTO atributos_por_campo (campo, entradas) VALUES (new.campo, 1)
+                        ON CONFLICT (campo) DO UPDATE SET entradas = entradas + 1;
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS atributos_por_campo_delete AFTER DELETE ON atributos BEGIN
+                        UPDATE atributos_por_campo SET entradas = entradas - 1 WHERE campo = old.campo;
+                    END;
+                """)
+                # Bancos anteriores aos contadores: uma contagem completa, só na primeira vez
+                if conn.execute("SELECT 1 FROM atributos_por_campo LIMIT 1").fetchone() is None:
+                    conn.execute(
+                        "INSERT INTO atributos_por_campo (campo, entradas) "
+                        "SELECT campo, COUNT(*) FROM atributos GROUP BY campo"
+                    )
+                conn.commit()
+                _schema_criado.add(db_path)
+    return conn
+
+
+def identidade_startup(nome):
+    """
+    Identidade canônica de uma startup: sem acentos, pontuação, caixa e
+    sufixo societário ("Nubank S.A." e "NUBANK" viram "nubank")
+    """
+    texto = unicodedata.normalize("NFKD", str(nome or "")).encode("ascii", "ignore").decode("ascii")
+    texto = " ".join(re.sub(r"[^a-z0-9]+", " ", texto.lower()).split())
+    return _SUFIXOS.sub("", texto)
+
+
+def _somar(**valores):
+    with _lock:
+        for chave, valor in valores.items():
+            _metricas[chave] += valor
+
+
+def consultar(nomes, campos=None, db_path=DB_PATH):
+    """
+    Valores dentro do TTL para várias startups
+
+    Args:
+        nomes (list): Nomes das startups
+        campos (list): Campos desejados (padrão: todos os do cache)
+
+    Returns:
+        dict: {identidade: {campo: {"valor", "fonte", "atualizado_em"}}}
+    """
+    ttl = carregar_config()["ttl_segundos"]
+    campos = [c for c in (campos or ttl) if c in ttl]
+    identidades = list(dict.fromkeys(i for i in map(identidade_startup, nomes) if i))
+    if not identidades or not campos:
+        return {}
+
+    conn = _conectar(db_path)
+    try:
+        linhas = conn.execute(
+            f"SELECT startup, campo, valor, fonte, atualizado_em FROM atributos "
+            f"WHERE startup IN ({','.join('?' * len(identidades))}) "
+            f"AND campo IN ({','.join('?' * len(campos))})",
+            identidades + campos
+        ).fetchall()
+    finally:
+        conn.close()
+
+    agora = time.time()
+    encontrados, expirados = {}, 0
+    for startup, campo, valor, fonte, atualizado_em in linhas:
+        if agora - atualizado_em > ttl[campo]:
+            expirados += 1
+            continue
+        encontrados.setdefault(startup, {})[campo] = {"valor": valor, "fonte": fonte, "atualizado_em": atualizado_em}
+    _somar(consultas=1, campos_expirados=expirados)
+    return encontrados
+
+
+def preencher_startups(startups, db_path=DB_PATH):
+    """
+    Preenche, a partir do cache, os campos vazios das startups
+
+    Returns:
+        dict: {"startups": startups alteradas, "campos": campos preenchidos}
+    """
+    config = carregar_config()
+    resumo = {"startups": 0, "campos": 0}
+    if not config["habilitado"] or not startups:
+        return resumo
+
+    campos = config["ttl_segundos"]
+    pendentes = [s for s in startups if any(not campo_preenchido(s.get(c)) for c in campos)]
+    if not pendentes:
+        return resumo
+    em_cache = consultar([s.get("nome") for s in pendentes], db_path=db_path)
+
+    for startup in pendentes:
+        atributos = em_cache.get(identidade_startup(startup.get("nome")))
+        if not atributos:
+            continue
+        preenchidos = 0
+        for campo, atributo in atributos.items():
+            if not campo_preenchido(startup.get(campo)):
+                startup[campo] = atributo["valor"]
+                preenchidos += 1
+        if preenchidos:
+            resumo["startups"] += 1
+            resumo["campos"] += preenchidos
+    _somar(campos_preenchidos=resumo["campos"])
+    return resumo
+
+
+def memorizar_startups(startups, fonte, fontes=None, campos=None, db_path=DB_PATH):
+    """
+    Guarda no cache os valores recém-obtidos das startups
+
+    Args:
+        startups (list): Startups (dicts ou registros)
+        fonte (str): Origem dos valores (ex: "extracao:Kaszek")
+        fontes (list): Fontes usadas; a URL da que menciona o valor
+            substitui a origem
+        campos (list): Só estes campos (ex: os que o enriquecimento acabou
+            de preencher; valores vindos do próprio cache não renovam o TTL)
+
+    Returns:
+        int: Campos gravados
+    """
+    config = carregar_config()
+    if not config["habilitado"] or not startups:
+        return 0
+
+    agora = time.time()
+    campos = [c for c in (config["ttl_segundos"] if campos is None else campos) if c in config["ttl_segundos"]]
+    linhas = []
+    for startup in startups:
+        identidade = identidade_startup(startup.get("nome"))
+        if not identidade:
+            continue
+        for campo in campos:
+            valor = startup.get(campo)
+            if campo_preenchido(valor):
+                linhas.append((identidade, campo, str(valor), _url_da_fonte(valor, fontes or []) or fonte, agora))
+    if not linhas:
+        return 0
+
+    conn = _conectar(db_path)
+    try:
+        with conn:
+            # Valor igual ao guardado só renova o horário (a fonte original fica)
+            conn.executemany(
+                "INSERT INTO atributos (startup, campo, valor, fonte, atualizado_em) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (startup, campo) DO UPDATE SET "
+                "fonte = CASE WHEN valor = excluded.valor THEN fonte ELSE excluded.fonte END, "
+                "valor = excluded.valor, atualizado_em = excluded.atualizado_em",
+                linhas
+            )
+    finally:
+        conn.close()
+    _somar(campos_gravados=len(linhas))
+    return len(linhas)
+
+
+def _url_da_fonte(valor, fontes):
+    """URL da primeira fonte que menciona o valor"""
+    valor_busca = str(valor).lower()
+    for fonte in fontes:
+        if fonte.get("url") and valor_busca in fonte.get("content", "").lower():
+            return fonte["url"]
+    return None
+
+
+def estatisticas(db_path=DB_PATH):
+    """Entradas por campo (dos contadores mantidos por gatilho) e contadores do processo (para /status)"""
+    conn = _conectar(db_path)
+    try:
+        por_campo = dict(conn.execute(
+            "SELECT campo, entradas FROM atributos_por_campo WHERE entradas > 0"
+        ).fetchall())
+    finally:
+        conn.close()
+    with _lock:
+        metricas = dict(_metricas)
+    return {"habilitado": carregar_config()["habilitado"], "entradas_por_campo": por_campo, **metricas}
@@ -0,0 +1,176 @@
+# arquivo: src/utils/fts_index.py
+"""Índice de busca textual (SQLite FTS5) sobre startups e fontes armazenadas"""
+import re
+
+TABELA_STARTUPS = "startups_fts"
+TABELA_FONTES = "fontes_fts"
+
+# remove_diacritics permite buscar "fundacao" e encontrar "fundação"
+TOKENIZER = "unicode61 remove_diacritics 2"
+
+
+def criar_indice(conn):
+    """Cria as tabelas FTS5 se ainda não existirem"""
+    cursor = conn.cursor()
+    cursor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABELA_STARTUPS} USING fts5("
+        f"nome, descricao, setor, vc, pesquisa_id UNINDEXED, tokenize='{TOKENIZER}')"
+    )
+    cursor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABELA_FONTES} USING fts5("
+        f"titulo, trecho, url UNINDEXED, pesquisa_id UNINDEXED, tokenize='{TOKENIZER}')"
+    )
+    cursor.close()
+
+
+def indice_vazio(conn):
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT 1 FROM {TABELA_STARTUPS} LIMIT 1")
+    vazio = cursor.fetchone() is None
+    cursor.close()
+    return vazio
+
+
+def _texto(valor):
+    if not valor or valor in ["Não informado", "—"]:
+        return ""
+    return str(valor)
+
+
+def indexar_pesquisa(conn, pesquisa_id, startups, fontes=None):
+    """
+    Indexa as startups e trechos de fontes de uma pesquisa
+    
+    Args:
+        conn: Conexão DB-API (sqlite3) dentro da transação que salva a pesquisa
+        pesquisa_id (int): Id da Pesquisa
+        startups (list): Lista de startups (dicts); outros formatos são ignorados
+        fontes (list): Lista de fontes com "titulo", "trecho" e "url"
+    """
+    cursor = conn.cursor()
+    
+    if isinstance(startups, list):
+        linhas = [
+            (
+                _texto(s.get("nome")),
+                _texto(s.get("descricao_breve")),
+                _texto(s.get("setor")),
+                _texto(s.get("vc_investidor")),
+                pesquisa_id
+            )
+            for s in startups
+            if isinstance(s, dict) and s.get("nome")
+        ]
+        if linhas:
+            cursor.executemany(
+                f"INSERT INTO {TABELA_STARTUPS} (nome, descricao, setor, vc, pesquisa_id) "
+                f"VALUES (?, ?, ?, ?, ?)",
+                linhas
+            )
+    
+    if fontes:
+        linhas = [
+            (_texto(f.get("titulo")), _texto(f.get("trecho")), f.get("url", ""), pesquisa_id)
+            for f in fontes
+            if isinstance(f, dict)
+        ]
+        if linhas:
+            cursor.executemany(
+                f"INSERT INTO {TABELA_FONTES} (titulo, trecho, url, pesquisa_id) VALUES (?, ?, ?, ?)",
+                linhas
+            )
+    
+    cursor.close()
+
+
+def remover_pesquisa(conn, pesquisa_id):
+    """Remove do índice tudo que pertence a uma pesquisa"""
+    cursor = conn.cursor()
+    cursor.execute(f"DELETE FROM {TABELA_STARTUPS} WHERE pesquisa_id = ?", (pesquisa_id,))
+    cursor.execute(f"DELETE FROM {TABELA_FONTES} WHERE pesquisa_id = ?", (pesquisa_id,))
+    cursor.close()
+
+
+def montar_consulta(texto):
+    """
+    Converte o texto do usuário em uma consulta FTS5 segura
+    
+    Texto entre aspas vira busca por frase; caso contrário, todos os termos
+    precisam aparecer (AND). Operadores do FTS5 digitados pelo usuário são
+    tratados como texto comum.
+    """
+    texto = (texto or "").strip()
+    if not texto:
+        return ""
+    
+    if len(texto) > 1 and texto.startswith('"') and texto.endswith('"'):
+        frase = texto[1:-1].replace('"', '""').strip()
+        return f'"{frase}"' if frase else ""
+    
+    termos = re.findall(r"\w+", texto, re.UNICODE)
+    return " ".join(f'"{t}"' for t in termos)
+
+
+def buscar(conn, texto, limite=20, tipo="todos"):
+    """
+    Busca ranqueada (bm25) com trechos destacados
+    
+    Args:
+        conn: Conexão DB-API (sqlite3)
+        texto (str): Texto da busca
+        limite (int): Máximo de resultados por tipo
+        tipo (str): "startups", "fontes" ou "todos"
+    
+    Returns:
+        dict: {"startups": [...], "fontes": [...]}
+    """
+    consulta = montar_consulta(texto)
+    resultado = {"startups": [], "fontes": []}
+    if not consulta:
+        return resultado
+    
+    cursor = conn.cursor()
+    
+    if tipo in ("startups", "todos"):
+        cursor.execute(
+            f"SELECT nome, setor, vc, pesquisa_id, "
+            f"snippet({TABELA_STARTUPS}, 1, '[', ']', '…', 16), "
+            f"bm25({TABELA_STARTUPS}, 10.0, 2.0, 4.0, 1.0) AS rank "
+            f"FROM {TABELA_STARTUPS} WHERE {TABELA_STARTUPS} MATCH ? "
+            f"ORDER BY rank LIMIT ?",
+            (consulta, limite)
+        )
+        resultado["startups"] = [
+            {
+                "nome": nome,
+                "setor": setor,
+                "vc_investidor": vc,
+                "pesquisa_id": pesquisa_id,
+                "trecho": trecho,
+                "relevancia": round(-rank, 6)
+            }
+            for nome, setor, vc, pesquisa_id, trecho, rank in cursor.fetchall()
+        ]
+    
+    if tipo in ("fontes", "todos"):
+        cursor.execute(
+            f"SELECT titulo, url, pesquisa_id, "
+            f"snippet({TABELA_FONTES}, 1, '[', ']', '…', 24), "
+            f"bm25({TABELA_FONTES}, 4.0, 1.0) AS rank "
+            f"FROM {TABELA_FONTES} WHERE {TABELA_FONTES} MATCH ? "
+            f"ORDER BY rank LIMIT ?",
+            (consulta, limite)
+        )
+        resultado["fontes"] = [
+            {
+                "titulo": titulo,
+                "url": url,
+                "pesquisa_id": pesquisa_id,
+                "trecho": trecho,
+                "relevancia": round(-rank, 6)
+            }
+            for titulo, url, pesquisa_id, trecho, rank in cursor.fetchall()
+        ]
+    
+    cursor.close()
+    return resultado
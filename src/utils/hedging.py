@@ -0,0 +1,208 @@
+# arquivo: src/utils/hedging.py
+"""
+Requisições "hedged" para chamadas idempotentes (Exa, Cerebras)
+
+Se a chamada não retorna até um percentil adaptativo das latências recentes,
+uma cópia é disparada e vale a resposta que chegar primeiro. Um orçamento
+limita quantas cópias podem ser feitas em relação ao total de chamadas.
+"""
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from utils import tracing
+from utils.config_loader import load_section
+
+CONFIG_PADRAO = {
+    "habilitado": False,
+    "percentil": 95,
+    "min_amostras": 20,
+    "atraso_minimo_ms": 200,
+    "orcamento_percentual": 5,
+    "rajada": 2,
+    "janela": 500
+}
+
+_lock = threading.Lock()
+_hedgers = {}
+_config = None
+_executor = None
+
+
+def _percentil(valores, p):
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    indice = min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))
+    return ordenados[indice]
+
+
+def carregar_config():
+    global _config
+    if _config is None:
+        _config = load_section("hedging", {}) or {}
+    return _config
+
+
+def config_provedor(provedor):
+    """Parâmetros globais da seção `hedging` + ajustes em `provedores.<nome>`"""
+    config = carregar_config()
+    geral = {k: v for k, v in config.items() if k != "provedores"}
+    return {**CONFIG_PADRAO, **geral, **config.get("provedores", {}).get(provedor, {})}
+
+
+def _obter_executor():
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="hedge")
+    return _executor
+
+
+class Hedger:
+    """Estado de hedging de um tipo de chamada (ex: "exa", "cerebras:extracao")"""
+
+    def __init__(self, nome, config):
+        self.nome = nome
+        self.config = config
+        self._lock = threading.Lock()
+        # Latência vista por quem chamou (com hedge) e a da chamada original
+        self.latencias = deque(maxlen=config["janela"])
+        self.latencias_primarias = deque(maxlen=config["janela"])
+        self.chamadas = 0
+        self.hedges = 0
+        self.hedges_vencedores = 0
+        self.hedges_negados = 0
+
+    def atraso_hedge(self):
+        """Segundos até disparar a cópia, ou None se ainda não há amostras suficientes"""
+        with self._lock:
+            if len(self.latencias_primarias) < self.config["min_amostras"]:
+                return None
+            atraso = _percentil(self.latencias_primarias, self.config["percentil"])
+        return max(atraso, self.config["atraso_minimo_ms"] / 1000)
+
+    def _reservar_hedge(self):
+        """Consome orçamento: hedges ≤ orcamento_percentual% das chamadas + rajada"""
+        with self._lock:
+            limite = self.chamadas * self.config["orcamento_percentual"] / 100 + self.config["rajada"]
+            if self.hedges + 1 > limite:
+                self.hedges_negados += 1
+                return False
+            self.hedges += 1
+            return True
+
+    def _registrar_primaria(self, inicio):
+        def callback(_futuro):
+            with self._lock:
+                self.latencias_primarias.append(time.perf_counter() - inicio)
+        return callback
+
+    def executar(self, funcao, *args, **kwargs):
+        """
+        Chama `funcao(*args, **kwargs)` com hedge, se habilitado
+
+        Exceções só são propagadas se todas as tentativas falharem.
+        """
+        return self.executar_contando(funcao, *args, **kwargs)[0]
+
+    def executar_contando(self, funcao, *args, **kwargs):
+        """
+        Como executar, mas informa também quantas tentativas foram disparadas
+
+        A tentativa que perde (ou que é abandonada quando a outra falha primeiro
+        e esta também falha) não é cancelada: continua rodando até o fim e, numa
+        API cobrada por chamada, é cobrada do mesmo jeito.
+
+        Returns:
+            tuple: (resultado, tentativas); se todas falharem, a exceção
+                propagada leva o número em `tentativas_hedge`
+        """
+        if not self.config["habilitado"]:
+            return funcao(*args, **kwargs), 1
+
+        with self._lock:
+            self.chamadas += 1
+        executor = _obter_executor()
+        inicio = time.perf_counter()
+
+        primaria = executor.submit(tracing.executar_no_contexto, contextvars.copy_context(), funcao, *args, **kwargs)
+        primaria.add_done_callback(self._registrar_primaria(inicio))
+        pendentes = {primaria}
+
+        atraso = self.atraso_hedge()
+        if atraso is not None:
+            prontas, _ = wait(pendentes, timeout=atraso)
+            if not prontas and self._reservar_hedge():
+                copia = executor.submit(tracing.executar_no_contexto, contextvars.copy_context(), funcao,
+                                        *args, **kwargs)
+                pendentes.add(copia)
+        tentativas = len(pendentes)
+
+        erro = None
+        while pendentes:
+            prontas, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+            for futuro in prontas:
+                if futuro.exception() is None:
+                    with self._lock:
+                        self.latencias.append(time.perf_counter() - inicio)
+                        if futuro is not primaria:
+                            self.hedges_vencedores += 1
+                    return futuro.result(), tentativas
+                erro = futuro.exception()
+        erro.tentativas_hedge = tentativas
+        raise erro
+
+    def metricas(self):
+        with self._lock:
+            latencias = list(self.latencias)
+            primarias = list(self.latencias_primarias)
+            return {
+                "chamadas": self.chamadas,
+                "hedges": self.hedges,
+                "hedges_vencedores": self.hedges_vencedores,
+                "hedges_negados_por_orcamento": self.hedges_negados,
+                "chamadas_extras_percentual": round(self.hedges / self.chamadas * 100, 1) if self.chamadas else 0,
+                "atraso_hedge_ms": round(_percentil(primarias, self.config["percentil"]) * 1000, 1)
+                if len(primarias) >= self.config["min_amostras"] else None,
+                # Sem hedge = latência das chamadas originais; com hedge = a vista pelo chamador
+                "p50_ms": {"sem_hedge": round(_percentil(primarias, 50) * 1000, 1),
+                           "com_hedge": round(_percentil(latencias, 50) * 1000, 1)},
+                "p99_ms": {"sem_hedge": round(_percentil(primarias, 99) * 1000, 1),
+                           "com_hedge": round(_percentil(latencias, 99) * 1000, 1)}
+            }
+
+
+def obter_hedger(nome, provedor=None):
+    """
+    Hedger de um tipo de chamada; a configuração vem do provedor
+    (prefixo antes de ":" se `provedor` não for informado)
+    """
+    hedger = _hedgers.get(nome)
+    if hedger is None:
+        with _lock:
+            hedger = _hedgers.get(nome)
+            if hedger is None:
+                hedger = Hedger(nome, config_provedor(provedor or nome.split(":", 1)[0]))
+                _hedgers[nome] = hedger
+    return hedger
+
+
+def executar_com_hedge(nome, funcao, *args, **kwargs):
+    """Atalho: obter_hedger(nome).executar(funcao, ...)"""
+    return obter_hedger(nome).executar(funcao, *args, **kwargs)
+
+
+def executar_com_hedge_contando(nome, funcao, *args, **kwargs):
+    """Atalho: obter_hedger(nome).executar_contando(funcao, ...) -> (resultado, tentativas)"""
+    return obter_hedger(nome).executar_contando(funcao, *args, **kwargs)
+
+
+def obter_estatisticas_hedging():
+    """Métricas por tipo de chamada (para /status)"""
+    with _lock:
+        hedgers = dict(_hedgers)
+    return {nome: hedger.metricas() for nome, hedger in sorted(hedgers.items())}
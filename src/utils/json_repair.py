@@ -0,0 +1,182 @@
+# arquivo: src/utils/json_repair.py
+"""Parser tolerante para respostas JSON de LLMs (markdown, vírgulas sobrando, truncamento)"""
+import json
+import re
+import threading
+
+_RE_ASPAS_TIPOGRAFICAS = re.compile("[“”„‟″«»]")
+_RE_CERCA_MARKDOWN = re.compile(r"```[a-zA-Z]*")
+
+# Strings JSON completas são consumidas inteiras para que chaves, colchetes e
+# vírgulas dentro delas não sejam confundidos com estrutura
+_RE_STRING = r'"(?:[^"\\]|\\.)*"'
+_RE_TOKEN = re.compile(_RE_STRING + r"|[\[\]{},]")
+_RE_VIRGULA_FINAL = re.compile("(" + _RE_STRING + r")|,\s*([\]}])")
+_RE_VIRGULA_FINAL_SIMPLES = re.compile(r",\s*[\]}]")
+
+# Status possíveis, do melhor para o pior
+VALIDO = "valido"          # json.loads direto no trecho JSON
+REPARADO = "reparado"      # válido após correções (aspas, vírgulas)
+PARCIAL = "parcial"        # apenas objetos completos recuperados
+FALHA = "falha"            # nada recuperado
+
+_lock = threading.Lock()
+_estatisticas = {VALIDO: 0, REPARADO: 0, PARCIAL: 0, FALHA: 0, "objetos_recuperados": 0}
+
+
+def _remover_virgulas_finais(texto):
+    """Remove vírgulas antes de ] ou } fora de strings"""
+    if not _RE_VIRGULA_FINAL_SIMPLES.search(texto):
+        return texto
+    return _RE_VIRGULA_FINAL.sub(lambda m: m.group(1) or m.group(2), texto)
+
+
+def _limpar(texto):
+    texto = _RE_CERCA_MARKDOWN.sub("", _RE_ASPAS_TIPOGRAFICAS.sub('"', texto))
+    return texto.strip()
+
+
+def _inicio_json(texto):
+    """Posição do primeiro [ ou { (o que vier antes)"""
+    posicoes = [p for p in (texto.find("["), texto.find("{")) if p != -1]
+    return min(posicoes) if posicoes else -1
+
+
+def _objetos_completos(texto, inicio):
+    """
+    Percorre o texto a partir de `inicio` e devolve os trechos de cada objeto
+    {...} completo de primeiro nível (dentro de um array) ou do próprio objeto
+    """
+    trechos = []
+    profundidade = 0
+    abertura = None
+    base = 1 if texto[inicio] == "[" else 0
+    
+    for token in _RE_TOKEN.finditer(texto, inicio):
+        c = token.group()
+        if c in "[{":
+            if c == "{" and profundidade == base:
+                abertura = token.start()
+            profundidade += 1
+        elif c in "]}":
+            profundidade -= 1
+            if c == "}" and profundidade == base and abertura is not None:
+                trechos.append(texto[abertura:token.end()])
+                abertura = None
+            if profundidade <= 0:
+                break
+    
+    return trechos
+
+
+def _fechar_objeto_truncado(texto, inicio):
+    """Recupera os pares chave/valor completos de um objeto único truncado"""
+    profundidade = 0
+    ultima_virgula = None
+    for token in _RE_TOKEN.finditer(texto, inicio):
+        c = token.group()
+        if c in "[{":
+            profundidade += 1
+        elif c in "]}":
+            profundidade -= 1
+        elif c == "," and profundidade == 1:
+            ultima_virgula = token.start()
+    if ultima_virgula is None:
+        return None
+    try:
+        return json.loads(texto[inicio:ultima_virgula] + "}")
+    except json.JSONDecodeError:
+        return None
+
+
+def _registrar(status, objetos):
+    with _lock:
+        _estatisticas[status] += 1
+        _estatisticas["objetos_recuperados"] += objetos
+
+
+def reparar_json(resposta):
+    """
+    Extrai JSON de uma resposta de LLM, recuperando o máximo possível
+    
+    Trata texto antes/depois do JSON, cercas de markdown, aspas tipográficas,
+    vírgulas sobrando e arrays truncados (mantém todos os objetos completos).
+    
+    Args:
+        resposta (str): Texto bruto retornado pela IA
+    
+    Returns:
+        tuple: (dados, qualidade) onde dados é list/dict ([] se nada foi
+            recuperado) e qualidade é {"status", "objetos", "reparos"}
+    """
+    reparos = []
+    texto = resposta or ""
+    inicio = _inicio_json(texto)
+    
+    # Caminho rápido: resposta já é JSON válido (com ou sem texto em volta)
+    if inicio != -1:
+        fim = max(texto.rfind("]"), texto.rfind("}")) + 1
+        if fim > inicio:
+            try:
+                dados = json.loads(texto[inicio:fim])
+                return _resultado(dados, VALIDO, reparos)
+            except json.JSONDecodeError:
+                pass
+    
+    limpo = _limpar(texto)
+    if limpo != texto.strip():
+        reparos.append("limpeza")
+    inicio = _inicio_json(limpo)
+    if inicio == -1:
+        return _resultado([], FALHA, reparos)
+    
+    fim = max(limpo.rfind("]"), limpo.rfind("}")) + 1
+    if fim > inicio:
+        candidato = _remover_virgulas_finais(limpo[inicio:fim])
+        if candidato != limpo[inicio:fim]:
+            reparos.append("virgulas_finais")
+        try:
+            return _resultado(json.loads(candidato), REPARADO, reparos)
+        except json.JSONDecodeError:
+            pass
+    
+    # Salvamento: manter cada objeto completo, descartando o resto
+    if limpo[inicio] == "[":
+        recuperados = []
+        for trecho in _objetos_completos(limpo, inicio):
+            try:
+                recuperados.append(json.loads(trecho))
+            except json.JSONDecodeError:
+                try:
+                    recuperados.append(json.loads(_remover_virgulas_finais(trecho)))
+                except json.JSONDecodeError:
+                    reparos.append("objeto_descartado")
+        if recuperados:
+            reparos.append("salvamento")
+            return _resultado(recuperados, PARCIAL, reparos)
+    else:
+        objeto = _fechar_objeto_truncado(_remover_virgulas_finais(limpo), inicio)
+        if objeto is not None:
+            reparos.append("objeto_truncado")
+            return _resultado(objeto, PARCIAL, reparos)
+    
+    return _resultado([], FALHA, reparos)
+
+
+def _resultado(dados, status, reparos):
+    objetos = len(dados) if isinstance(dados, list) else (1 if dados else 0)
+    _registrar(status, objetos)
+    return dados, {"status": status, "objetos": objetos, "reparos": reparos}
+
+
+def obter_estatisticas_parse():
+    """
+    Métrica de qualidade do parse: quantas respostas foram válidas,
+    reparadas, parcialmente salvas ou perdidas
+    """
+    with _lock:
+        stats = dict(_estatisticas)
+    total = sum(stats[s] for s in (VALIDO, REPARADO, PARCIAL, FALHA))
+    stats["total"] = total
+    stats["taxa_aproveitamento"] = round((total - stats[FALHA]) / total * 100, 1) if total else 0
+    return stats
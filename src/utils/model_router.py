@@ -0,0 +1,111 @@
+# arquivo: src/utils/model_router.py
+import threading
+from collections import deque
+
+from utils.config_loader import load_section
+
+# Usado quando config.json não define a seção "roteamento_llm"
+ROTA_PADRAO = {
+    "model": "llama-4-scout-17b-16e-instruct",
+    "max_tokens": 1000,
+    "timeout": 60
+}
+
+# Quantas latências recentes guardar por rota para calcular percentis
+JANELA_LATENCIAS = 500
+
+_lock = threading.Lock()
+_config_rotas = None
+_estatisticas = {}
+
+
+def _carregar_rotas():
+    global _config_rotas
+    if _config_rotas is None:
+        _config_rotas = load_section("roteamento_llm", {}) or {}
+    return _config_rotas
+
+
+def resolver_rota(nome):
+    """
+    Resolve a configuração (model, max_tokens, timeout) de um tipo de chamada
+    
+    Args:
+        nome (str): Nome da rota (ex: "extracao", "busca_campo")
+    
+    Returns:
+        dict: Configuração da rota, completada com os valores padrão
+    """
+    config = _carregar_rotas()
+    rota = dict(ROTA_PADRAO)
+    rota.update(config.get("padrao", {}))
+    rota.update(config.get("rotas", {}).get(nome, {}))
+    return rota
+
+
+def registrar_chamada(nome, latencia, tokens_prompt=0, tokens_resposta=0, erro=False, tentativas=1):
+    """
+    Registra latência (em segundos) e tokens de uma chamada feita por uma rota
+
+    Args:
+        tentativas (int): Requisições cobradas pela chamada (2 quando o hedge
+            disparou uma cópia); os tokens são só os da resposta usada
+    """
+    with _lock:
+        stats = _estatisticas.get(nome)
+        if stats is None:
+            stats = {
+                "chamadas": 0,
+                "requisicoes": 0,
+                "erros": 0,
+                "latencia_total": 0.0,
+                "tokens_prompt": 0,
+                "tokens_resposta": 0,
+                "latencias": deque(maxlen=JANELA_LATENCIAS)
+            }
+            _estatisticas[nome] = stats
+        
+        stats["chamadas"] += 1
+        stats["requisicoes"] += tentativas
+        stats["latencia_total"] += latencia
+        stats["tokens_prompt"] += tokens_prompt or 0
+        stats["tokens_resposta"] += tokens_resposta or 0
+        stats["latencias"].append(latencia)
+        if erro:
+            stats["erros"] += 1
+
+
+def _percentil(valores, p):
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    indice = min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))
+    return ordenados[indice]
+
+
+def obter_estatisticas_rotas():
+    """
+    Retorna a contabilidade de latência e tokens por rota
+    
+    Returns:
+        dict: Estatísticas agregadas por nome de rota
+    """
+    with _lock:
+        resumo = {}
+        for nome, stats in _estatisticas.items():
+            chamadas = stats["chamadas"]
+            latencias = list(stats["latencias"])
+            resumo[nome] = {
+                "modelo": resolver_rota(nome)["model"],
+                "chamadas": chamadas,
+                # Requisições cobradas, incluindo as cópias disparadas pelo hedge
+                "requisicoes": stats["requisicoes"],
+                "erros": stats["erros"],
+                "latencia_media_ms": round(stats["latencia_total"] / chamadas * 1000, 1) if chamadas else 0,
+                "latencia_p50_ms": round(_percentil(latencias, 50) * 1000, 1),
+                "latencia_p95_ms": round(_percentil(latencias, 95) * 1000, 1),
+                "tokens_prompt": stats["tokens_prompt"],
+                "tokens_resposta": stats["tokens_resposta"],
+                "tokens_resposta_media": round(stats["tokens_resposta"] / chamadas, 1) if chamadas else 0
+            }
+        return resumo
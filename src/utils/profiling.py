@@ -0,0 +1,162 @@
+# arquivo: src/utils/profiling.py
+"""Perfilamento sob demanda de requisições (pstats + pilhas colapsadas)"""
+import cProfile
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+from utils.config_loader import BASE_DIR
+from utils import tracing
+
+PERFIS_DIR = os.environ.get("PERFIS_DIR") or os.path.join(BASE_DIR, "data", "perfis")
+
+log = tracing.obter_logger("profiling")
+
+CONFIG_PADRAO = {
+    "habilitado": False,
+    "token": "",
+    "intervalo_amostragem_ms": 5,
+    "max_perfis_mantidos": 50
+}
+
+# Só um perfil por vez: o cProfile não aceita dois profilers ativos
+_trava_perfil = threading.Lock()
+
+
+class Amostrador(threading.Thread):
+    """
+    Amostra periodicamente as pilhas da thread da requisição e das threads
+    de pool enquanto executam trabalho dela (ex.: ThreadPoolExecutor do
+    pipeline, via tracing.propagar); outras requisições ficam de fora
+
+    Args:
+        threads (set): Idents observados, mantido por tracing.observar_threads
+        intervalo (float): Segundos entre amostras
+    """
+
+    def __init__(self, threads, intervalo):
+        super().__init__(daemon=True, name="amostrador-perfil")
+        self.threads = threads
+        self.intervalo = intervalo
+        self.pilhas = Counter()
+        self.amostras = 0
+        self._parar = threading.Event()
+
+    def run(self):
+        while not self._parar.wait(self.intervalo):
+            frames = sys._current_frames()
+            for ident in list(self.threads):
+                frame = frames.get(ident)
+                if frame is not None:
+                    self.pilhas[colapsar_pilha(frame)] += 1
+            self.amostras += 1
+
+    def parar(self):
+        self._parar.set()
+        self.join()
+
+
+def colapsar_pilha(frame):
+    """Pilha no formato 'raiz;...;folha' usado por flamegraph.pl/speedscope"""
+    partes = []
+    while frame is not None:
+        codigo = frame.f_code
+        arquivo = os.path.join(*codigo.co_filename.split(os.sep)[-2:])
+        partes.append(f"{codigo.co_name} ({arquivo}:{codigo.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(partes))
+
+
+def perfil_autorizado(config, token_enviado):
+    """Perfilamento precisa estar habilitado e, se houver token, ele deve bater"""
+    if not config.get("habilitado"):
+        return False
+    token = config.get("token") or ""
+    return not token or token == token_enviado
+
+
+def executar_com_perfil(funcao, config=None):
+    """
+    Executa `funcao()` sob cProfile (thread atual) e um amostrador de pilhas
+
+    Args:
+        funcao: Chamável sem argumentos
+        config (dict): Seção `perfilamento` do config.json
+
+    Returns:
+        tuple: (retorno da função, info do perfil ou None se outro perfil
+            estava em andamento)
+    """
+    config = {**CONFIG_PADRAO, **(config or {})}
+    if not _trava_perfil.acquire(blocking=False):
+        return funcao(), None
+
+    try:
+        perfil_id = time.strftime("%Y%m%d-%H%M%S") + "-" + uuid.uuid4().hex[:8]
+        threads = set()
+        amostrador = Amostrador(threads, config["intervalo_amostragem_ms"] / 1000)
+        profiler = cProfile.Profile()
+
+        inicio = time.perf_counter()
+        amostrador.start()
+        profiler.enable()
+        try:
+            with tracing.observar_threads(threads):
+                retorno = funcao()
+        finally:
+            profiler.disable()
+            amostrador.parar()
+            duracao = time.perf_counter() - inicio
+            info = salvar_perfil(perfil_id, profiler, amostrador, duracao, config["max_perfis_mantidos"])
+    finally:
+        _trava_perfil.release()
+
+    return retorno, info
+
+
+def salvar_perfil(perfil_id, profiler, amostrador, duracao, max_perfis_mantidos):
+    """Grava <id>.pstats e <id>.collapsed em PERFIS_DIR"""
+    os.makedirs(PERFIS_DIR, exist_ok=True)
+    caminho_pstats = os.path.join(PERFIS_DIR, f"{perfil_id}.pstats")
+    caminho_colapsado = os.path.join(PERFIS_DIR, f"{perfil_id}.collapsed")
+
+    profiler.dump_stats(caminho_pstats)
+    with open(caminho_colapsado, "w", encoding="utf-8") as f:
+        for pilha, contagem in amostrador.pilhas.most_common():
+            f.write(f"{pilha} {contagem}\n")
+
+    limpar_perfis_antigos(max_perfis_mantidos)
+    log.info(f"🔬 Perfil {perfil_id} salvo ({duracao:.2f}s, {amostrador.amostras} amostras)")
+
+    return {
+        "id": perfil_id,
+        "duracao_s": round(duracao, 3),
+        "amostras": amostrador.amostras,
+        "arquivos": {
+            "pstats": os.path.relpath(caminho_pstats, BASE_DIR),
+            "collapsed": os.path.relpath(caminho_colapsado, BASE_DIR)
+        }
+    }
+
+
+def limpar_perfis_antigos(max_perfis_mantidos):
+    """Mantém apenas os perfis mais recentes (ids começam pelo horário)"""
+    ids = sorted({os.path.splitext(nome)[0] for nome in os.listdir(PERFIS_DIR)})
+    for perfil_id in ids[:-max_perfis_mantidos] if max_perfis_mantidos > 0 else []:
+        for extensao in (".pstats", ".collapsed"):
+            try:
+                os.remove(os.path.join(PERFIS_DIR, perfil_id + extensao))
+            except FileNotFoundError:
+                pass
+
+
+def caminho_perfil(perfil_id, formato):
+    """Caminho do arquivo de um perfil salvo, ou None se não existir"""
+    extensoes = {"pstats": ".pstats", "collapsed": ".collapsed"}
+    if formato not in extensoes or not perfil_id.replace("-", "").isalnum():
+        return None
+    caminho = os.path.join(PERFIS_DIR, perfil_id + extensoes[formato])
+    return caminho if os.path.exists(caminho) else None
@@ -0,0 +1,185 @@
+# arquivo: src/utils/quality_scoring.py
+"""Pontuação de completude das startups, calculada em uma única passada"""
+from operator import attrgetter, itemgetter
+
+try:
+    import numpy as np
+    NUMPY_DISPONIVEL = True
+except ImportError:
+    NUMPY_DISPONIVEL = False
+
+CAMPOS_STARTUP = (
+    'nome', 'site', 'setor', 'ano_fundacao', 'valor_investimento',
+    'rodada', 'data_investimento', 'vc_investidor', 'descricao_breve',
+    'linkedin_fundador'
+)
+
+# Tupla (e não set) para que valores não hasheáveis vindos da IA, como listas,
+# possam ser comparados sem erro
+VALORES_VAZIOS = ("Não informado", "—", "")
+
+# Valores vazios hasheáveis (inclui os falsos comuns: None, 0/False, tupla
+# vazia), para contar os vazios de uma linha com uma busca em set por valor
+_VAZIOS_HASHEAVEIS = frozenset(VALORES_VAZIOS + (None, 0, (), b"", frozenset()))
+
+# Startup é considerada completa com pelo menos 7 dos 10 campos
+MINIMO_CAMPOS_COMPLETA = 7
+
+
+def campo_preenchido(valor):
+    """True se o valor é informativo (não vazio nem placeholder)"""
+    return bool(valor) and valor not in VALORES_VAZIOS
+
+
+def pontuar_startup(startup, campos=CAMPOS_STARTUP):
+    """Número de campos preenchidos de uma startup"""
+    return len([v for v in map(startup.get, campos) if v and v not in VALORES_VAZIOS])
+
+
+def leitor_campos(tipo, campos=CAMPOS_STARTUP):
+    """
+    Função que lê todos os campos de uma startup de uma vez, como tupla
+
+    Registros com os campos em __slots__ (startup_record.Startup) são lidos
+    direto dos slots (attrgetter), sem passar pelo __getitem__ em Python;
+    dicts, por chave (itemgetter).
+    """
+    if set(campos).issubset(getattr(tipo, "__slots__", ())):
+        return attrgetter(*campos) if len(campos) > 1 else lambda s: (getattr(s, campos[0]),)
+    return itemgetter(*campos) if len(campos) > 1 else lambda s: (s[campos[0]],)
+
+
+def calcular_scores(startups, campos=CAMPOS_STARTUP):
+    """
+    Apenas o score de cada startup (caminho mais leve, usado na seleção)
+
+    Lê os campos de uma vez (leitor_campos, pelo tipo da primeira startup) e
+    conta os vazios com o set de vazios hasheáveis, tudo em C. Se alguma
+    startup for de outro tipo, não tiver um dos campos ou tiver um valor não
+    hasheável (ex: lista vinda da IA), a lista inteira é recalculada com
+    pontuar_startup.
+    """
+    if not campos or not startups:
+        return [0] * len(startups)
+    ler = leitor_campos(type(startups[0]), campos)
+    eh_vazio = _VAZIOS_HASHEAVEIS.__contains__
+    total = len(campos)
+    try:
+        return [total - sum(map(eh_vazio, valores)) for valores in map(ler, startups)]
+    except (KeyError, AttributeError, TypeError):
+        return [pontuar_startup(startup, campos) for startup in startups]
+
+
+def _resumo(total, completas, soma_campos, preenchidos_por_campo, scores):
+    return {
+        "total": total,
+        "completas": completas,
+        "percentual": round((completas / total) * 100, 1) if total else 0,
+        "media_campos_preenchidos": round(soma_campos / total, 1) if total else 0,
+        "por_campo": {
+            campo: {
+                "preenchidos": preenchidos,
+                "percentual": round((preenchidos / total) * 100, 1) if total else 0
+            }
+            for campo, preenchidos in preenchidos_por_campo.items()
+        },
+        "scores": scores
+    }
+
+
+def pontuar_startups(startups, campos=CAMPOS_STARTUP, minimo_completa=MINIMO_CAMPOS_COMPLETA):
+    """
+    Calcula completude por startup e por campo em uma única passada
+    
+    Args:
+        startups (list): Lista de startups (dicts)
+        campos (tuple): Campos considerados
+        minimo_completa (int): Campos preenchidos para contar como completa
+    
+    Returns:
+        dict: total, completas, percentual, media_campos_preenchidos,
+            por_campo {campo: {preenchidos, percentual}} e scores (um por startup)
+    """
+    # Contagem por posição do campo; vira {campo: preenchidos} no fim
+    preenchidos = [0] * len(campos)
+    posicoes = range(len(campos))
+    scores = []
+    completas = 0
+    soma_campos = 0
+    vazios = VALORES_VAZIOS
+    leitores = {}
+    
+    for startup in startups:
+        tipo = type(startup)
+        ler = leitores.get(tipo)
+        if ler is None:
+            ler = leitores[tipo] = leitor_campos(tipo, campos)
+        try:
+            valores = ler(startup)
+        except (KeyError, AttributeError):
+            valores = tuple(map(startup.get, campos))
+        score = 0
+        for posicao, valor in zip(posicoes, valores):
+            if valor and valor not in vazios:
+                preenchidos[posicao] += 1
+                score += 1
+        scores.append(score)
+        soma_campos += score
+        if score >= minimo_completa:
+            completas += 1
+    
+    return _resumo(len(scores), completas, soma_campos, dict(zip(campos, preenchidos)), scores)
+
+
+def pontuar_colunar(colunas, minimo_completa=MINIMO_CAMPOS_COMPLETA):
+    """
+    Caminho colunar para relatórios sobre todo o histórico
+    
+    Recebe os valores já separados por campo (ex: montados na leitura do
+    banco) e calcula as mesmas estatísticas de pontuar_startups com
+    operações vetorizadas quando o numpy está disponível.
+    
+    Args:
+        colunas (dict): {campo: lista de valores}, todas do mesmo tamanho
+    
+    Returns:
+        dict: Mesmo formato de pontuar_startups
+    """
+    if not colunas:
+        return _resumo(0, 0, 0, {}, [])
+    
+    total = len(next(iter(colunas.values())))
+    vazios = VALORES_VAZIOS
+    
+    if NUMPY_DISPONIVEL:
+        mascara = np.empty((len(colunas), total), dtype=bool)
+        for i, valores in enumerate(colunas.values()):
+            mascara[i] = [bool(v) and v not in vazios for v in valores]
+        scores = mascara.sum(axis=0)
+        preenchidos = dict(zip(colunas, mascara.sum(axis=1).tolist()))
+        return _resumo(
+            total,
+            int((scores >= minimo_completa).sum()),
+            int(scores.sum()),
+            preenchidos,
+            scores.tolist()
+        )
+    
+    scores = [0] * total
+    preenchidos = {}
+    for campo, valores in colunas.items():
+        mascara = [1 if v and v not in vazios else 0 for v in valores]
+        preenchidos[campo] = sum(mascara)
+        scores = list(map(int.__add__, scores, mascara))
+    return _resumo(
+        total,
+        sum(1 for s in scores if s >= minimo_completa),
+        sum(scores),
+        preenchidos,
+        scores
+    )
+
+
+def para_colunas(startups, campos=CAMPOS_STARTUP):
+    """Converte uma lista de startups no formato colunar"""
+    return {campo: [s.get(campo) for s in startups] for campo in campos}
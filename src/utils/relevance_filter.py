@@ -0,0 +1,233 @@
+# arquivo: src/utils/relevance_filter.py
+"""
+Pré-filtro local de relevância das fontes antes da extração com IA
+
+Cada fonte recebe uma nota entre 0 e 1 que combina BM25 (nome da VC + termos
+de investimento) com a menção explícita à VC, valores monetários e densidade
+de nomes próprios. Fontes abaixo de `limiar_descarte` saem do prompt; as
+abaixo de `limiar_truncamento` (e as maiores que o limite de caracteres)
+ficam só com os trechos mais relevantes.
+"""
+import math
+import re
+import threading
+from collections import Counter
+
+from utils.config_loader import load_section
+
+CONFIG_PADRAO = {
+    "habilitado": True,
+    "limiar_descarte": 0.2,
+    "limiar_truncamento": 0.45,
+    "min_fontes": 3,
+    "caracteres_truncamento": 1200,
+    "k1": 1.5,
+    "b": 0.75
+}
+
+TERMOS_INVESTIMENTO = frozenset((
+    "invest", "invests", "invested", "investment", "investments", "investor", "investors",
+    "investimento", "investimentos", "investiu", "investe", "investidora",
+    "funding", "raise", "raised", "raises", "round", "rodada", "series", "série", "serie",
+    "seed", "led", "leads", "backed", "portfolio", "portfólio", "aporte", "aportes",
+    "captou", "capta", "captação", "million", "millions", "milhões", "mi", "valuation",
+    "startup", "startups", "venture", "fintech", "founded", "fundada", "founder", "fundador"
+))
+
+# Palavras genéricas de nomes de gestoras que não identificam a VC
+TERMOS_GENERICOS_VC = frozenset(("ventures", "venture", "capital", "partners", "fund", "vc", "investimentos"))
+
+_RE_PALAVRA = re.compile(r"\w+")
+_RE_VALOR = re.compile(
+    r"(?:US\$|R\$|\$|€|£)\s?\d|\d+(?:[.,]\d+)?\s?(?:million|mi\b|milhões|milhão|mm\b|bilhões|billion|[MB]\b)",
+    re.IGNORECASE
+)
+_RE_NOME_PROPRIO = re.compile(r"(?<![.!?]\s)\b[A-Z][a-zà-ú]*[A-Z0-9]?[\wà-ú]*")
+_RE_TRECHOS = re.compile(r"\n\s*\n|(?<=[.!?])\s+(?=[A-Z\"“])")
+
+_lock = threading.Lock()
+_estatisticas = {
+    "chamadas": 0,
+    "fontes_recebidas": 0,
+    "fontes_descartadas": 0,
+    "fontes_truncadas": 0,
+    "caracteres_antes": 0,
+    "caracteres_depois": 0
+}
+_config = None
+
+
+def carregar_config():
+    global _config
+    if _config is None:
+        _config = {**CONFIG_PADRAO, **(load_section("filtro_relevancia", {}) or {})}
+    return _config
+
+
+def tokenizar(texto):
+    return _RE_PALAVRA.findall(texto.lower())
+
+
+def termos_consulta(vc_name):
+    """Termos do nome da VC (sem palavras genéricas) + vocabulário de investimento"""
+    termos_vc = [t for t in tokenizar(vc_name) if t not in TERMOS_GENERICOS_VC] or tokenizar(vc_name)
+    return set(termos_vc) | TERMOS_INVESTIMENTO
+
+
+def pontuar_bm25(documentos, termos, k1=1.5, b=0.75):
+    """BM25 de cada documento (lista de tokens) para o conjunto de termos"""
+    n = len(documentos)
+    if not n:
+        return []
+    media = sum(len(d) for d in documentos) / n or 1
+    frequencias = [Counter(d) for d in documentos]
+    df = Counter(t for f in frequencias for t in termos if t in f)
+    idf = {t: math.log(1 + (n - df[t] + 0.5) / (df[t] + 0.5)) for t in df}
+
+    notas = []
+    for doc, freq in zip(documentos, frequencias):
+        nota = 0.0
+        fator = k1 * (1 - b + b * len(doc) / media)
+        for termo, peso in idf.items():
+            tf = freq.get(termo, 0)
+            if tf:
+                nota += peso * tf * (k1 + 1) / (tf + fator)
+        notas.append(nota)
+    return notas
+
+
+def pontuar_fontes(fontes, vc_name, config=None):
+    """
+    Nota de relevância (0 a 1) de cada fonte para a extração de startups da VC
+
+    Returns:
+        list: notas na mesma ordem de `fontes`
+    """
+    config = config or carregar_config()
+    termos = termos_consulta(vc_name)
+    nome_vc = vc_name.lower().strip()
+    termos_vc = [t for t in tokenizar(vc_name) if t not in TERMOS_GENERICOS_VC]
+
+    textos = [f"{f.get('title', '')}\n{f.get('content', '')}" for f in fontes]
+    documentos = [tokenizar(t) for t in textos]
+    bm25 = pontuar_bm25(documentos, termos, config["k1"], config["b"])
+    maximo = max(bm25, default=0) or 1
+
+    notas = []
+    for texto, doc, nota_bm25 in zip(textos, documentos, bm25):
+        texto_minusculo = texto.lower()
+        if nome_vc in texto_minusculo:
+            mencao_vc = 1.0
+        elif termos_vc and all(t in doc for t in termos_vc):
+            mencao_vc = 0.5
+        else:
+            mencao_vc = 0.0
+        valores = min(1.0, len(_RE_VALOR.findall(texto)) / 2)
+        densidade_nomes = len(_RE_NOME_PROPRIO.findall(texto)) / max(len(doc), 1) * 100
+        nomes = min(1.0, densidade_nomes / 8)
+        notas.append(0.5 * nota_bm25 / maximo + 0.2 * mencao_vc + 0.15 * valores + 0.15 * nomes)
+    return notas
+
+
+def selecionar_trechos(texto, vc_name, limite):
+    """
+    Reduz o texto aos trechos (parágrafos/frases) mais relevantes, na ordem
+    original, até `limite` caracteres
+    """
+    if len(texto) <= limite:
+        return texto
+    trechos = [t.strip() for t in _RE_TRECHOS.split(texto) if t and t.strip()]
+    termos = termos_consulta(vc_name)
+    nome_vc = vc_name.lower()
+
+    def nota(trecho):
+        palavras = tokenizar(trecho)
+        return (
+            sum(1 for p in palavras if p in termos)
+            + 3 * (nome_vc in trecho.lower())
+            + 2 * len(_RE_VALOR.findall(trecho))
+        )
+
+    ordem = sorted(range(len(trechos)), key=lambda i: nota(trechos[i]), reverse=True)
+    escolhidos, tamanho = set(), 0
+    for i in ordem:
+        if tamanho + len(trechos[i]) + 1 > limite:
+            continue
+        escolhidos.add(i)
+        tamanho += len(trechos[i]) + 1
+    if not escolhidos:
+        return texto[:limite]
+    return "\n".join(trechos[i] for i in sorted(escolhidos))
+
+
+def filtrar_fontes(fontes, vc_name, limite_caracteres=4000, config=None):
+    """
+    Descarta e trunca fontes pouco relevantes antes de montar o prompt
+
+    Args:
+        fontes (list): Fontes da busca (title, content, url, score, hash)
+        vc_name (str): Nome da VC
+        limite_caracteres (int): Caracteres por fonte usados no prompt
+        config (dict): Sobrescreve a seção `filtro_relevancia` do config.json
+
+    Returns:
+        tuple: (fontes ordenadas por relevância — cópias, com `relevancia` e
+            conteúdo possivelmente reduzido —, resumo do filtro)
+    """
+    config = config or carregar_config()
+    antes = sum(min(len(f.get("content", "")), limite_caracteres) for f in fontes)
+    if not config["habilitado"] or not fontes:
+        return fontes, {"fontes": len(fontes), "mantidas": len(fontes), "descartadas": 0,
+                        "truncadas": 0, "caracteres_antes": antes, "caracteres_depois": antes}
+
+    notas = pontuar_fontes(fontes, vc_name, config)
+    ordem = sorted(range(len(fontes)), key=lambda i: notas[i], reverse=True)
+
+    mantidas, descartadas, truncadas = [], 0, 0
+    for posicao, i in enumerate(ordem):
+        nota = notas[i]
+        if nota < config["limiar_descarte"] and posicao >= config["min_fontes"]:
+            descartadas += 1
+            continue
+        fonte = dict(fontes[i], relevancia=round(nota, 3))
+        conteudo = fonte.get("content", "")
+        limite = limite_caracteres if nota >= config["limiar_truncamento"] else min(
+            limite_caracteres, config["caracteres_truncamento"])
+        if len(conteudo) > limite:
+            fonte["content"] = selecionar_trechos(conteudo, vc_name, limite)
+            truncadas += 1
+        mantidas.append(fonte)
+
+    depois = sum(min(len(f.get("content", "")), limite_caracteres) for f in mantidas)
+    resumo = {
+        "fontes": len(fontes),
+        "mantidas": len(mantidas),
+        "descartadas": descartadas,
+        "truncadas": truncadas,
+        "caracteres_antes": antes,
+        "caracteres_depois": depois
+    }
+    _registrar(resumo)
+    return mantidas, resumo
+
+
+def _registrar(resumo):
+    with _lock:
+        _estatisticas["chamadas"] += 1
+        _estatisticas["fontes_recebidas"] += resumo["fontes"]
+        _estatisticas["fontes_descartadas"] += resumo["descartadas"]
+        _estatisticas["fontes_truncadas"] += resumo["truncadas"]
+        _estatisticas["caracteres_antes"] += resumo["caracteres_antes"]
+        _estatisticas["caracteres_depois"] += resumo["caracteres_depois"]
+
+
+def obter_estatisticas_filtro():
+    """Quanto do contexto de extração o filtro economizou (tokens ≈ caracteres / 4)"""
+    with _lock:
+        stats = dict(_estatisticas)
+    economizados = stats["caracteres_antes"] - stats["caracteres_depois"]
+    stats["tokens_economizados_estimados"] = economizados // 4
+    stats["percentual_economizado"] = (
+        round(economizados / stats["caracteres_antes"] * 100, 1) if stats["caracteres_antes"] else 0
+    )
+    return stats
@@ -0,0 +1,263 @@
+# arquivo: src/utils/source_store.py
+"""Armazenamento persistente, comprimido e deduplicado das fontes coletadas"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from utils.config_loader import BASE_DIR
+
+DB_PATH = os.environ.get("FONTES_DB_PATH", os.path.join(BASE_DIR, "data", "fontes.db"))
+
+_lock_schema = threading.Lock()
+_schema_criado = set()
+
+
+def _conectar(db_path=DB_PATH):
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=30)
+    if db_path not in _schema_criado:
+        with _lock_schema:
+            if db_path not in _schema_criado:
+                _criar_schema(conn)
+                _schema_criado.add(db_path)
+    return conn
+
+
+def _criar_schema(conn):
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS fontes (
+            hash TEXT PRIMARY KEY,
+            url TEXT,
+            titulo TEXT,
+            conteudo BLOB NOT NULL,
+            tamanho INTEGER NOT NULL,
+            criado_em REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS fontes_por_url (
+            url TEXT PRIMARY KEY,
+            hash TEXT NOT NULL,
+            atualizado_em REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS proveniencia (
+            startup TEXT NOT NULL,
+            vc TEXT NOT NULL,
+            campo TEXT NOT NULL,
+            hash TEXT NOT NULL,
+            valor TEXT,
+            criado_em REAL NOT NULL,
+            PRIMARY KEY (startup, vc, campo, hash)
+        );
+        -- Totais para /status, mantidos na mesma transação de cada fonte nova
+        -- (INSERT OR IGNORE de fonte repetida não dispara o gatilho)
+        CREATE TABLE IF NOT EXISTS fontes_totais (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            total INTEGER NOT NULL,
+            bytes_originais INTEGER NOT NULL,
+            bytes_comprimidos INTEGER NOT NULL
+        );
+        CREATE TRIGGER IF NOT EXISTS fontes_totais_insert AFTER INSERT ON fontes BEGIN
+            UPDATE fontes_totais SET total = total + 1, bytes_originais = bytes_originais + new.tamanho,
+                bytes_comprimidos = bytes_comprimidos + LENGTH(new.conteudo) WHERE id = 1;
+        END;
+        CREATE TRIGGER IF NOT EXISTS fontes_totais_delete AFTER DELETE ON fontes BEGIN
+            UPDATE fontes_totais SET total = total - 1, bytes_originais = bytes_originais - old.tamanho,
+                bytes_comprimidos = bytes_comprimidos - LENGTH(old.conteudo) WHERE id = 1;
+        END;
+    """)
+    # Bancos anteriores aos totais: uma contagem completa, só na primeira vez
+    conn.execute(
+        "INSERT OR IGNORE INTO fontes_totais (id, total, bytes_originais, bytes_comprimidos) "
+        "SELECT 1, COUNT(*), COALESCE(SUM(tamanho), 0), COALESCE(SUM(LENGTH(conteudo)), 0) FROM fontes"
+    )
+    conn.commit()
+
+
+def calcular_hash(conteudo):
+    return hashlib.sha256(conteudo.encode("utf-8")).hexdigest()
+
+
+def chave_startup(nome):
+    """Chave canônica usada para ligar campos de uma startup às fontes"""
+    return " ".join((nome or "").lower().split())
+
+
+def salvar_fontes(fontes, db_path=DB_PATH):
+    """
+    Persiste as fontes (uma única vez por conteúdo) e anota o hash em cada uma
+    
+    Args:
+        fontes (list): Fontes no formato de search_web_exa (title, content, url, score)
+    
+    Returns:
+        list: Hashes das fontes, na mesma ordem
+    """
+    if not fontes:
+        return []
+    
+    agora = time.time()
+    linhas_fontes = []
+    linhas_urls = []
+    hashes = []
+    
+    for fonte in fontes:
+        conteudo = fonte.get("content") or ""
+        hash_fonte = calcular_hash(conteudo)
+        fonte["hash"] = hash_fonte
+        hashes.append(hash_fonte)
+        
+        linhas_fontes.append((
+            hash_fonte,
+            fonte.get("url", ""),
+            fonte.get("title", ""),
+            zlib.compress(conteudo.encode("utf-8"), 6),
+            len(conteudo),
+            agora
+        ))
+        if fonte.get("url"):
+            linhas_urls.append((fonte["url"], hash_fonte, agora))
+    
+    conn = _conectar(db_path)
+    try:
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO fontes (hash, url, titulo, conteudo, tamanho, criado_em) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                linhas_fontes
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO fontes_por_url (url, hash, atualizado_em) VALUES (?, ?, ?)",
+                linhas_urls
+            )
+    finally:
+        conn.close()
+    
+    return hashes
+
+
+def _linha_para_fonte(linha):
+    hash_fonte, url, titulo, conteudo = linha
+    return {
+        "hash": hash_fonte,
+        "url": url,
+        "title": titulo,
+        "content": zlib.decompress(conteudo).decode("utf-8")
+    }
+
+
+def carregar_fontes(hashes, db_path=DB_PATH):
+    """Carrega fontes completas pelo hash, sem nenhuma chamada de rede"""
+    hashes = list(dict.fromkeys(h for h in hashes if h))
+    if not hashes:
+        return []
+    
+    conn = _conectar(db_path)
+    try:
+        marcadores = ",".join("?" * len(hashes))
+        linhas = conn.execute(
+            f"SELECT hash, url, titulo, conteudo FROM fontes WHERE hash IN ({marcadores})",
+            hashes
+        ).fetchall()
+    finally:
+        conn.close()
+    
+    por_hash = {linha[0]: _linha_para_fonte(linha) for linha in linhas}
+    return [por_hash[h] for h in hashes if h in por_hash]
+
+
+def carregar_fonte_por_url(url, db_path=DB_PATH):
+    """Retorna a versão mais recente armazenada de uma URL, ou None"""
+    conn = _conectar(db_path)
+    try:
+        linha = conn.execute(
+            "SELECT f.hash, f.url, f.titulo, f.conteudo FROM fontes_por_url u "
+            "JOIN fontes f ON f.hash = u.hash WHERE u.url = ?",
+            (url,)
+        ).fetchone()
+    finally:
+        conn.close()
+    return _linha_para_fonte(linha) if linha else None
+
+
+def registrar_proveniencia(startup, vc, campos_por_hash, db_path=DB_PATH):
+    """
+    Liga campos de uma startup às fontes de onde vieram
+    
+    Args:
+        startup (str): Nome da startup
+        vc (str): VC investidor
+        campos_por_hash (dict): {campo: (valor, [hashes])}
+    """
+    agora = time.time()
+    chave = chave_startup(startup)
+    linhas = [
+        (chave, vc, campo, hash_fonte, str(valor), agora)
+        for campo, (valor, hashes) in campos_por_hash.items()
+        for hash_fonte in hashes
+    ]
+    if not linhas:
+        return
+    
+    conn = _conectar(db_path)
+    try:
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO proveniencia (startup, vc, campo, hash, valor, criado_em) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                linhas
+            )
+    finally:
+        conn.close()
+
+
+def obter_proveniencia(startup, vc=None, db_path=DB_PATH):
+    """
+    Retorna, por campo, o valor registrado e as fontes que o sustentam
+    
+    Returns:
+        dict: {campo: [{"valor", "hash", "url", "titulo"}]}
+    """
+    consulta = (
+        "SELECT p.campo, p.valor, p.hash, f.url, f.titulo FROM proveniencia p "
+        "LEFT JOIN fontes f ON f.hash = p.hash WHERE p.startup = ?"
+    )
+    parametros = [chave_startup(startup)]
+    if vc:
+        consulta += " AND p.vc = ?"
+        parametros.append(vc)
+    consulta += " ORDER BY p.campo, p.criado_em DESC"
+    
+    conn = _conectar(db_path)
+    try:
+        linhas = conn.execute(consulta, parametros).fetchall()
+    finally:
+        conn.close()
+    
+    proveniencia = {}
+    for campo, valor, hash_fonte, url, titulo in linhas:
+        proveniencia.setdefault(campo, []).append({
+            "valor": valor,
+            "hash": hash_fonte,
+            "url": url,
+            "titulo": titulo
+        })
+    return proveniencia
+
+
+def estatisticas(db_path=DB_PATH):
+    """Totais do armazenamento (fontes, bytes originais e comprimidos), lidos da linha de totais"""
+    conn = _conectar(db_path)
+    try:
+        total, bytes_originais, bytes_comprimidos = conn.execute(
+            "SELECT total, bytes_originais, bytes_comprimidos FROM fontes_totais WHERE id = 1"
+        ).fetchone() or (0, 0, 0)
+    finally:
+        conn.close()
+    return {
+        "total_fontes": total,
+        "bytes_originais": bytes_originais,
+        "bytes_comprimidos": bytes_comprimidos
+    }
@@ -0,0 +1,199 @@
+# arquivo: src/utils/startup_record.py
+"""
+Registro compacto de startup
+
+Cada startup ocupa um objeto com __slots__ (sem o dict interno). Os valores
+categóricos (setor, rodada, VC, ano) e os marcadores de campo vazio são
+internados: "Fintech" ou "Não informado" existem uma vez na memória, não uma
+por startup. O registro se comporta como um dict (startup["nome"],
+startup.get, startup[campo] = valor, dict(startup)), então o pipeline, a
+pontuação e o enriquecimento funcionam sem mudanças. Na hora de gerar JSON,
+use para_dict/para_json ou `default=json_padrao`.
+"""
+import json
+import sys
+from collections.abc import MutableMapping
+from operator import attrgetter
+
+from utils.quality_scoring import CAMPOS_STARTUP, VALORES_VAZIOS
+
+NAO_INFORMADO = sys.intern("Não informado")
+
+# Poucos valores distintos repetidos em milhares de startups
+CAMPOS_CATEGORICOS = frozenset(("setor", "rodada", "vc_investidor", "ano_fundacao"))
+
+_intern = sys.intern
+_VAZIOS = frozenset(VALORES_VAZIOS)
+# Distingue get(campo) de get(campo, None)
+_SEM_PADRAO = object()
+
+
+def internar(campo, valor):
+    """Versão compartilhada do valor, se for categórico ou marcador de vazio"""
+    if type(valor) is str and (campo in CAMPOS_CATEGORICOS or valor in _VAZIOS):
+        return _intern(valor)
+    return valor
+
+
+class Startup(MutableMapping):
+    """
+    Startup com os 10 campos em slots; chaves fora do padrão (ex: vindas da
+    pesquisa normal) ficam em `extras`
+    """
+
+    __slots__ = CAMPOS_STARTUP + ("extras",)
+
+    def __init__(self, **campos):
+        for campo in CAMPOS_STARTUP:
+            setattr(self, campo, internar(campo, campos.pop(campo, NAO_INFORMADO)))
+        self.extras = campos or None
+
+    @classmethod
+    def de_dict(cls, dados, preencher_vazios=False, com_extras=True):
+        """
+        Cria o registro a partir de um dict (campos ausentes = "Não informado")
+
+        Args:
+            dados (dict): Startup em dict (ex: resposta da IA ou JSON do banco)
+            preencher_vazios (bool): Troca valores falsos ("", None) por "Não informado"
+            com_extras (bool): Mantém as chaves fora dos 10 campos
+        """
+        startup = cls.__new__(cls)
+        obter = dados.get
+        for campo, categorico in _CAMPOS_CATEGORIA:
+            valor = obter(campo, NAO_INFORMADO)
+            if preencher_vazios and not valor:
+                valor = NAO_INFORMADO
+            if type(valor) is str and (categorico or valor in _VAZIOS):
+                valor = _intern(valor)
+            setattr(startup, campo, valor)
+        if com_extras and not _CAMPOS.issuperset(dados):
+            startup.extras = {campo: valor for campo, valor in dados.items() if campo not in _CAMPOS}
+        else:
+            startup.extras = None
+        return startup
+
+    def para_dict(self):
+        """Dict na ordem de CAMPOS_STARTUP (extras no final)"""
+        dados = dict(zip(CAMPOS_STARTUP, _ler_campos(self)))
+        if self.extras:
+            dados.update(self.extras)
+        return dados
+
+    def copy(self):
+        copia = Startup.__new__(Startup)
+        for campo in CAMPOS_STARTUP:
+            setattr(copia, campo, getattr(self, campo))
+        copia.extras = dict(self.extras) if self.extras else None
+        return copia
+
+    # -- interface de dict --------------------------------------------------
+
+    def __getitem__(self, campo):
+        if campo in _CAMPOS:
+            return getattr(self, campo)
+        if self.extras and campo in self.extras:
+            return self.extras[campo]
+        raise KeyError(campo)
+
+    def get(self, campo, padrao=_SEM_PADRAO):
+        """
+        Valor do campo; os 10 campos sempre existem, então sem `padrao` um
+        campo vazio vem como "Não informado". Com `padrao`, o campo vazio
+        (o marcador NAO_INFORMADO) devolve `padrao`, como um dict sem a chave
+        """
+        if campo in _CAMPOS:
+            valor = getattr(self, campo)
+            return valor if valor is not NAO_INFORMADO or padrao is _SEM_PADRAO else padrao
+        if padrao is _SEM_PADRAO:
+            padrao = None
+        return self.extras.get(campo, padrao) if self.extras else padrao
+
+    def __setitem__(self, campo, valor):
+        if campo in _CAMPOS:
+            setattr(self, campo, internar(campo, valor))
+        else:
+            if self.extras is None:
+                self.extras = {}
+            self.extras[campo] = valor
+
+    def __delitem__(self, campo):
+        if campo in _CAMPOS:
+            # Os 10 campos sempre existem; remover volta ao marcador de vazio
+            setattr(self, campo, NAO_INFORMADO)
+        elif self.extras and campo in self.extras:
+            del self.extras[campo]
+        else:
+            raise KeyError(campo)
+
+    def __contains__(self, campo):
+        return campo in _CAMPOS or bool(self.extras) and campo in self.extras
+
+    def __iter__(self):
+        yield from CAMPOS_STARTUP
+        if self.extras:
+            yield from self.extras
+
+    def __len__(self):
+        return len(CAMPOS_STARTUP) + (len(self.extras) if self.extras else 0)
+
+    def __eq__(self, outro):
+        if isinstance(outro, Startup):
+            return all(getattr(self, c) == getattr(outro, c) for c in CAMPOS_STARTUP) \
+                and (self.extras or None) == (outro.extras or None)
+        if isinstance(outro, dict):
+            return self.para_dict() == outro
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Startup({self.para_dict()!r})"
+
+    def __getstate__(self):
+        return self.para_dict()
+
+    def __setstate__(self, estado):
+        novo = Startup.de_dict(estado)
+        for campo in self.__slots__:
+            setattr(self, campo, getattr(novo, campo))
+
+
+_CAMPOS = frozenset(CAMPOS_STARTUP)
+# Os 10 slots de uma vez, em C (para_dict; ver quality_scoring.leitor_campos)
+_ler_campos = attrgetter(*CAMPOS_STARTUP)
+_CAMPOS_CATEGORIA = tuple((campo, campo in CAMPOS_CATEGORICOS) for campo in CAMPOS_STARTUP)
+
+
+def de_dicts(dados, preencher_vazios=False):
+    """Lista de registros a partir de uma lista qualquer (itens que não são dict são ignorados)"""
+    if not isinstance(dados, list):
+        return []
+    de_dict = Startup.de_dict
+    return [de_dict(item, preencher_vazios) for item in dados if isinstance(item, (dict, Startup))]
+
+
+def para_dicts(startups):
+    """Lista de dicts (aceita registros e dicts misturados)"""
+    return [s.para_dict() if isinstance(s, Startup) else s for s in startups]
+
+
+def json_padrao(obj):
+    """Para `json.dumps(..., default=json_padrao)`"""
+    if isinstance(obj, Startup):
+        return obj.para_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def para_json(startups):
+    """JSON (lista de objetos, mesmo formato gravado no banco)"""
+    return json.dumps(para_dicts(startups), ensure_ascii=False)
+
+
+def de_json(texto):
+    """Lista de registros a partir do JSON gravado no banco"""
+    try:
+        dados = json.loads(texto)
+    except (TypeError, ValueError):
+        return []
+    return de_dicts(dados)
@@ -0,0 +1,368 @@
+# arquivo: src/utils/tracing.py
+"""
+Rastreamento em spans (requisição → VC → camada → busca/LLM) e logs
+estruturados, gravados em JSONL por uma thread de fundo
+"""
+import atexit
+import contextvars
+import functools
+import inspect
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from utils.config_loader import BASE_DIR, load_section
+
+NIVEIS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40}
+
+CONFIG_PADRAO = {
+    "habilitado": True,
+    "arquivo": "data/traces.jsonl",
+    "nivel_arquivo": "DEBUG",
+    "nivel_console": "INFO",
+    "max_fila": 10000,
+    "tamanho_lote": 200,
+    # Rotação por tamanho: traces.jsonl -> traces.jsonl.1 -> ... (0 = sem limite)
+    "tamanho_maximo_mb": 50,
+    "arquivos_mantidos": 3
+}
+
+# Span ativo no contexto atual (thread ou cópia de contexto propagada)
+_span_atual = contextvars.ContextVar("span_atual", default=None)
+
+# Threads que executam trabalho do contexto atual, para quem o observa (ex.:
+# o amostrador do perfil); None quando ninguém observa
+_threads_observadas = contextvars.ContextVar("threads_observadas", default=None)
+
+_escritor = None
+_trava_escritor = threading.Lock()
+
+
+class Span:
+    """Trecho cronometrado de execução; atributos podem ser anotados até o fim"""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "nome", "inicio", "_t0", "atributos")
+
+    def __init__(self, nome, pai=None, atributos=None):
+        self.trace_id = pai.trace_id if pai else uuid.uuid4().hex
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = pai.span_id if pai else None
+        self.nome = nome
+        self.inicio = time.time()
+        self._t0 = time.perf_counter()
+        self.atributos = dict(atributos or {})
+
+    def anotar(self, **atributos):
+        self.atributos.update(atributos)
+
+    def para_registro(self):
+        return {
+            "tipo": "span",
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "nome": self.nome,
+            "inicio": round(self.inicio, 6),
+            "duracao_ms": round((time.perf_counter() - self._t0) * 1000, 3),
+            "status": "erro" if "erro" in self.atributos else "ok",
+            "atributos": self.atributos
+        }
+
+
+class EscritorRastros(threading.Thread):
+    """
+    Consome a fila de spans/eventos fora do caminho crítico: grava o JSONL em
+    lotes e imprime no console os eventos a partir de `nivel_console`.
+    Se a fila enche, os registros novos são descartados (e contados).
+    """
+
+    def __init__(self, config):
+        super().__init__(daemon=True, name="escritor-rastros")
+        self.config = config
+        self.caminho = None
+        if config["habilitado"]:
+            arquivo = os.environ.get("TRACE_PATH") or config["arquivo"]
+            self.caminho = arquivo if os.path.isabs(arquivo) else os.path.join(BASE_DIR, arquivo)
+        self.nivel_console = NIVEIS.get(config["nivel_console"], 20)
+        self.nivel_arquivo = NIVEIS.get(config["nivel_arquivo"], 10) if self.caminho else max(NIVEIS.values()) + 1
+        # Eventos abaixo disso nem entram na fila
+        self.nivel_minimo = min(self.nivel_console, self.nivel_arquivo)
+        self.fila = queue.Queue(maxsize=config["max_fila"])
+        self.gravados = 0
+        self.descartados = 0
+        self.rotacoes = 0
+
+    def enviar(self, registro):
+        try:
+            self.fila.put_nowait(registro)
+        except queue.Full:
+            self.descartados += 1
+
+    def _rotacionar(self):
+        """traces.jsonl vira traces.jsonl.1 (o .1 vira .2, ...); o mais antigo é apagado"""
+        mantidos = max(0, int(self.config["arquivos_mantidos"]))
+        for indice in range(mantidos, 0, -1):
+            origem = self.caminho if indice == 1 else f"{self.caminho}.{indice - 1}"
+            if os.path.exists(origem):
+                os.replace(origem, f"{self.caminho}.{indice}")
+        if not mantidos:
+            os.remove(self.caminho)
+        self.rotacoes += 1
+
+    def run(self):
+        arquivo = None
+        tamanho_maximo = self.config["tamanho_maximo_mb"] * 1_000_000
+        if self.caminho:
+            os.makedirs(os.path.dirname(self.caminho), exist_ok=True)
+            arquivo = open(self.caminho, "a", encoding="utf-8")
+
+        encerrar = False
+        while not encerrar:
+            lote = [self.fila.get()]
+            while len(lote) < self.config["tamanho_lote"]:
+                try:
+                    lote.append(self.fila.get_nowait())
+                except queue.Empty:
+                    break
+
+            linhas = []
+            for registro in lote:
+                if registro is None:
+                    encerrar = True
+                    continue
+                if registro["tipo"] == "log":
+                    nivel = NIVEIS[registro["nivel"]]
+                    if nivel >= self.nivel_console:
+                        print(formatar_console(registro))
+                    if nivel < self.nivel_arquivo:
+                        continue
+                linhas.append(json.dumps(registro, ensure_ascii=False, default=str))
+
+            if arquivo and linhas:
+                arquivo.write("\n".join(linhas) + "\n")
+                arquivo.flush()
+                if tamanho_maximo > 0 and arquivo.tell() >= tamanho_maximo:
+                    arquivo.close()
+                    try:
+                        self._rotacionar()
+                    except OSError as e:
+                        print(f"⚠️ Não foi possível rotacionar {self.caminho}: {e}")
+                    arquivo = open(self.caminho, "a", encoding="utf-8")
+            self.gravados += len(linhas)
+            for _ in lote:
+                self.fila.task_done()
+
+        if arquivo:
+            arquivo.close()
+
+    def encerrar(self, timeout=5):
+        """Grava o que está na fila e finaliza a thread (sem travar o atexit se a fila estiver cheia)"""
+        inicio = time.monotonic()
+        try:
+            self.fila.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self.join(max(0, timeout - (time.monotonic() - inicio)))
+
+    def metricas(self):
+        return {
+            "arquivo": os.path.relpath(self.caminho, BASE_DIR) if self.caminho else None,
+            "fila": self.fila.qsize(),
+            "gravados": self.gravados,
+            "descartados": self.descartados,
+            "rotacoes": self.rotacoes
+        }
+
+
+def formatar_console(registro):
+    """Linha de console: hora, nível, trace curto e mensagem"""
+    hora = time.strftime("%H:%M:%S", time.localtime(registro["ts"]))
+    trace = (registro.get("trace_id") or "-")[:8]
+    return f"{hora} {registro['nivel']:<7} [{trace}] {registro['mensagem']}"
+
+
+def obter_escritor():
+    """Escritor único do processo, iniciado no primeiro uso"""
+    global _escritor
+    if _escritor is None:
+        with _trava_escritor:
+            if _escritor is None:
+                config = {**CONFIG_PADRAO, **load_section("rastreamento", {})}
+                escritor = EscritorRastros(config)
+                escritor.start()
+                atexit.register(escritor.encerrar)
+                _escritor = escritor
+    return _escritor
+
+
+# ---------------------------------------------------------------------------
+# Spans
+# ---------------------------------------------------------------------------
+
+def iniciar_span(nome, **atributos):
+    """
+    Abre um span filho do span atual e o torna o atual
+
+    Returns:
+        tuple: (span, token) para passar a finalizar_span
+    """
+    span = Span(nome, _span_atual.get(), atributos)
+    return span, _span_atual.set(span)
+
+
+def finalizar_span(span, token):
+    """Restaura o span anterior e envia o registro para gravação"""
+    _span_atual.reset(token)
+    obter_escritor().enviar(span.para_registro())
+
+
+@contextmanager
+def span(nome, **atributos):
+    """Context manager: `with span("camada1", vc=vc_name) as s: ...`"""
+    atual, token = iniciar_span(nome, **atributos)
+    try:
+        yield atual
+    except Exception as e:
+        atual.anotar(erro=str(e))
+        raise
+    finally:
+        finalizar_span(atual, token)
+
+
+def rastreado(nome, *argumentos):
+    """
+    Decorador que executa a função dentro de um span
+
+    Args:
+        nome (str): Nome do span
+        *argumentos: Nomes de parâmetros da função copiados para os atributos
+    """
+    def decorador(funcao):
+        assinatura = inspect.signature(funcao)
+
+        @functools.wraps(funcao)
+        def wrapper(*args, **kwargs):
+            atributos = {}
+            if argumentos:
+                valores = assinatura.bind_partial(*args, **kwargs).arguments
+                atributos = {a: valores[a] for a in argumentos if a in valores}
+            with span(nome, **atributos):
+                return funcao(*args, **kwargs)
+        return wrapper
+    return decorador
+
+
+def anotar(**atributos):
+    """Adiciona atributos ao span atual (ignorado fora de um span)"""
+    atual = _span_atual.get()
+    if atual is not None:
+        atual.anotar(**atributos)
+
+
+def trace_id_atual():
+    atual = _span_atual.get()
+    return atual.trace_id if atual else None
+
+
+def propagar(funcao):
+    """
+    Faz `funcao` rodar com o span atual como pai quando executada em outra
+    thread (ThreadPoolExecutor não copia o contexto sozinho)
+    """
+    contexto = contextvars.copy_context()
+
+    @functools.wraps(funcao)
+    def executar(*args, **kwargs):
+        return executar_no_contexto(contexto.copy(), funcao, *args, **kwargs)
+    return executar
+
+
+def executar_no_contexto(contexto, funcao, *args, **kwargs):
+    """
+    `contexto.run(funcao, ...)` registrando a thread enquanto ela executa
+
+    Usado por quem entrega trabalho a um pool: se o contexto estiver sendo
+    observado (observar_threads), a thread do pool entra no conjunto
+    observado até a função terminar.
+    """
+    return contexto.run(_executar_registrando, funcao, args, kwargs)
+
+
+def _executar_registrando(funcao, args, kwargs):
+    threads = _threads_observadas.get()
+    ident = threading.get_ident()
+    if threads is None or ident in threads:
+        return funcao(*args, **kwargs)
+    threads.add(ident)
+    try:
+        return funcao(*args, **kwargs)
+    finally:
+        threads.discard(ident)
+
+
+@contextmanager
+def observar_threads(threads):
+    """
+    Mantém em `threads` (set) a thread atual e as threads de pool que
+    executarem trabalho deste contexto (via propagar/executar_no_contexto)
+    """
+    threads.add(threading.get_ident())
+    token = _threads_observadas.set(threads)
+    try:
+        yield threads
+    finally:
+        _threads_observadas.reset(token)
+
+
+# ---------------------------------------------------------------------------
+# Logs estruturados
+# ---------------------------------------------------------------------------
+
+class Logger:
+    """Eventos de log com nível, componente e o span atual"""
+
+    def __init__(self, componente):
+        self.componente = componente
+
+    def _registrar(self, nivel, mensagem, atributos):
+        escritor = obter_escritor()
+        if NIVEIS[nivel] < escritor.nivel_minimo:
+            return
+        atual = _span_atual.get()
+        registro = {
+            "tipo": "log",
+            "ts": time.time(),
+            "nivel": nivel,
+            "componente": self.componente,
+            "mensagem": mensagem,
+            "trace_id": atual.trace_id if atual else None,
+            "span_id": atual.span_id if atual else None
+        }
+        if atributos:
+            registro["atributos"] = atributos
+        escritor.enviar(registro)
+
+    def debug(self, mensagem, **atributos):
+        self._registrar("DEBUG", mensagem, atributos)
+
+    def info(self, mensagem, **atributos):
+        self._registrar("INFO", mensagem, atributos)
+
+    def warning(self, mensagem, **atributos):
+        self._registrar("WARNING", mensagem, atributos)
+
+    def error(self, mensagem, **atributos):
+        self._registrar("ERROR", mensagem, atributos)
+
+
+def obter_logger(componente):
+    return Logger(componente)
+
+
+def metricas():
+    """Situação da fila de gravação (para /status)"""
+    return obter_escritor().metricas()
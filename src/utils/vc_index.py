@@ -0,0 +1,72 @@
+# arquivo: src/utils/vc_index.py
+"""Índice exato pesquisa -> VCs pesquisadas (chave normalizada por VC)"""
+
+TABELA = "pesquisa_vcs"
+
+
+def criar_indice(conn):
+    """Cria a tabela do índice se ainda não existir"""
+    cursor = conn.cursor()
+    cursor.execute(
+        f"CREATE TABLE IF NOT EXISTS {TABELA} ("
+        f"pesquisa_id INTEGER NOT NULL, vc_chave TEXT NOT NULL, "
+        f"PRIMARY KEY (vc_chave, pesquisa_id))"
+    )
+    cursor.execute(f"CREATE INDEX IF NOT EXISTS {TABELA}_pesquisa ON {TABELA} (pesquisa_id)")
+    cursor.close()
+
+
+def indice_vazio(conn):
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT 1 FROM {TABELA} LIMIT 1")
+    vazio = cursor.fetchone() is None
+    cursor.close()
+    return vazio
+
+
+def chave_vc(nome):
+    """Chave de uma VC: sem diferença de caixa nem de espaços ("  KASZEK " = "kaszek")"""
+    return " ".join(str(nome or "").lower().split())
+
+
+def indexar_pesquisa(conn, pesquisa_id, vc_list):
+    """
+    Registra as VCs de uma pesquisa
+
+    Args:
+        conn: Conexão DB-API (sqlite3) dentro da transação que salva a pesquisa
+        pesquisa_id (int): Id da Pesquisa
+        vc_list (str): VCs pesquisadas, separadas por vírgula
+    """
+    chaves = dict.fromkeys(c for c in map(chave_vc, (vc_list or "").split(",")) if c)
+    if not chaves:
+        return
+    cursor = conn.cursor()
+    cursor.executemany(
+        f"INSERT OR IGNORE INTO {TABELA} (pesquisa_id, vc_chave) VALUES (?, ?)",
+        [(pesquisa_id, chave) for chave in chaves]
+    )
+    cursor.close()
+
+
+def remover_pesquisa(conn, pesquisa_id):
+    cursor = conn.cursor()
+    cursor.execute(f"DELETE FROM {TABELA} WHERE pesquisa_id = ?", (pesquisa_id,))
+    cursor.close()
+
+
+def pesquisas_da_vc(conn, vc_name):
+    """
+    Ids das pesquisas que incluíram exatamente esta VC, da mais recente para a mais antiga
+
+    Returns:
+        list: Ids de Pesquisa
+    """
+    cursor = conn.cursor()
+    cursor.execute(
+        f"SELECT pesquisa_id FROM {TABELA} WHERE vc_chave = ? ORDER BY pesquisa_id DESC",
+        (chave_vc(vc_name),)
+    )
+    ids = [pesquisa_id for pesquisa_id, in cursor.fetchall()]
+    cursor.close()
+    return ids
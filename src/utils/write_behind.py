@@ -0,0 +1,334 @@
+# arquivo: src/utils/write_behind.py
+"""
+Persistência write-behind dos resultados de pesquisa
+
+O endpoint só enfileira o registro. Uma thread dedicada serializa o JSON e
+grava vários registros por transação, fora do caminho da resposta. No
+encerramento do processo, a fila é gravada antes de sair. O que não puder ser
+gravado (banco travado após as tentativas, registro que não serializa, ou
+timeout no encerramento) vai para um arquivo JSONL de pendências,
+reenfileirado na próxima inicialização. Um registro que volta às pendências
+`max_tentativas_pendencia` vezes é movido para o arquivo `.descartadas`.
+"""
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+
+from utils.config_loader import BASE_DIR, load_section
+from utils import tracing
+from utils.startup_record import json_padrao
+
+CONFIG_PADRAO = {
+    "habilitado": True,
+    "tamanho_lote": 50,
+    "espera_lote_ms": 50,
+    "max_fila": 1000,
+    "tentativas": 3,
+    "arquivo_pendencias": "data/pesquisas_pendentes.jsonl",
+    "max_tentativas_pendencia": 3
+}
+
+# Inicializações em que o registro já foi reenfileirado (só no arquivo de
+# pendências; retirado antes de gravar_lote)
+CHAVE_TENTATIVAS = "_tentativas_pendencia"
+
+log = tracing.obter_logger("write_behind")
+
+
+def _percentil(valores, p):
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    indice = min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))
+    return ordenados[indice]
+
+
+def carregar_config():
+    return {**CONFIG_PADRAO, **(load_section("persistencia", {}) or {})}
+
+
+class FilaGravacao(threading.Thread):
+    """
+    Fila de registros a persistir e a thread que grava em lotes
+
+    `gravar_lote(registros)` recebe dicts já serializados e deve gravá-los em
+    uma única transação (levantando exceção se falhar).
+    """
+
+    def __init__(self, gravar_lote, config=None):
+        super().__init__(daemon=True, name="escritor-pesquisas")
+        self.gravar_lote = gravar_lote
+        self.config = {**CONFIG_PADRAO, **(config or {})}
+        arquivo = self.config["arquivo_pendencias"]
+        self.caminho_pendencias = arquivo if os.path.isabs(arquivo) else os.path.join(BASE_DIR, arquivo)
+        self.fila = queue.Queue(maxsize=self.config["max_fila"])
+        self._lock = threading.Lock()
+        self._ociosa = threading.Condition(self._lock)
+        self._pendentes = 0  # enfileirados e ainda não gravados
+        self.latencias_commit = deque(maxlen=500)
+        self.tamanhos_lote = deque(maxlen=500)
+        self.lotes = 0
+        self.gravados = 0
+        self.falhas = 0
+        self.gravacoes_sincronas = 0
+        self.enviados_pendencias = 0
+        self.descartados = 0
+        self.encerrada = False
+
+    # -- lado do endpoint -------------------------------------------------
+
+    def enfileirar(self, registro):
+        """
+        Agenda a gravação de um registro (campos do modelo; valores não-str
+        são serializados em JSON pela thread)
+
+        Com a fila cheia ou a thread parada, grava no próprio chamador.
+        """
+        if not self.config["habilitado"] or self.encerrada or not self.is_alive():
+            self._gravar_sincrono(registro)
+            return
+        with self._lock:
+            self._pendentes += 1
+        try:
+            self.fila.put_nowait(registro)
+        except queue.Full:
+            with self._ociosa:
+                self._pendentes -= 1
+                self._ociosa.notify_all()
+            self._gravar_sincrono(registro)
+
+    def _gravar_sincrono(self, registro):
+        with self._lock:
+            self.gravacoes_sincronas += 1
+        try:
+            serializado = serializar(registro)
+        except Exception as e:
+            log.error(f"❌ Pesquisa não serializável: {e}")
+            self._salvar_pendencias([registro])
+            return
+        self._gravar_com_tentativas([serializado])
+
+    def aguardar(self, timeout=5):
+        """
+        Espera a fila esvaziar (leituras que precisam ver as últimas gravações)
+
+        Returns:
+            bool: False se o timeout acabou antes
+        """
+        with self._ociosa:
+            return self._ociosa.wait_for(lambda: self._pendentes == 0, timeout)
+
+    # -- thread de gravação ---------------------------------------------
+
+    def run(self):
+        encerrar = False
+        while not encerrar:
+            lote = [self.fila.get()]
+            # Junta o que chegar em até espera_lote_ms para fazer transações maiores
+            limite = time.monotonic() + self.config["espera_lote_ms"] / 1000
+            while len(lote) < self.config["tamanho_lote"]:
+                restante = limite - time.monotonic()
+                try:
+                    lote.append(self.fila.get(timeout=restante) if restante > 0 else self.fila.get_nowait())
+                except queue.Empty:
+                    break
+
+            recebidos = [registro for registro in lote if registro is not None]
+            encerrar = len(recebidos) < len(lote)
+            try:
+                registros = []
+                for registro in recebidos:
+                    try:
+                        registros.append(serializar(registro))
+                    except Exception as e:
+                        log.error(f"❌ Pesquisa não serializável: {e}")
+                        self._salvar_pendencias([registro])
+                if registros:
+                    self._gravar_com_tentativas(registros)
+            except Exception as e:
+                # A thread não pode morrer: sem ela, tudo passaria a ser gravado no endpoint
+                log.error(f"❌ Erro inesperado na gravação de {len(recebidos)} pesquisa(s): {e}")
+            finally:
+                with self._ociosa:
+                    self._pendentes -= len(recebidos)
+                    self._ociosa.notify_all()
+
+    def _gravar_com_tentativas(self, registros):
+        if self._gravar_lote_com_tentativas(registros):
+            return True
+        if len(registros) == 1:
+            self._salvar_pendencias(registros)
+            return False
+        # Um registro ruim não pode levar o lote inteiro para as pendências
+        falhas = [registro for registro in registros if not self._gravar_lote_com_tentativas([registro], 1)]
+        if falhas:
+            self._salvar_pendencias(falhas)
+        return not falhas
+
+    def _gravar_lote_com_tentativas(self, registros, tentativas=None):
+        tentativas = tentativas or self.config["tentativas"]
+        # O contador de pendências não é campo do modelo
+        limpos = [{k: v for k, v in registro.items() if k != CHAVE_TENTATIVAS} for registro in registros]
+        for tentativa in range(1, tentativas + 1):
+            inicio = time.perf_counter()
+            try:
+                self.gravar_lote(limpos)
+            except Exception as e:
+                with self._lock:
+                    self.falhas += 1
+                log.warning(f"⚠️ Falha ao gravar {len(registros)} pesquisa(s) "
+                            f"(tentativa {tentativa}/{tentativas}): {e}")
+                time.sleep(0.1 * 2 ** (tentativa - 1))
+                continue
+            with self._lock:
+                self.latencias_commit.append(time.perf_counter() - inicio)
+                self.tamanhos_lote.append(len(registros))
+                self.lotes += 1
+                self.gravados += len(registros)
+            return True
+        return False
+
+    def _salvar_pendencias(self, registros, caminho=None):
+        """Último recurso: anexa os registros ao arquivo de pendências"""
+        caminho = caminho or self.caminho_pendencias
+        try:
+            os.makedirs(os.path.dirname(caminho), exist_ok=True)
+            with open(caminho, "a", encoding="utf-8") as f:
+                for registro in registros:
+                    # default=str: registros que não serializaram também são guardados
+                    f.write(json.dumps(registro, ensure_ascii=False, default=str) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        except Exception as e:
+            log.error(f"❌ {len(registros)} pesquisa(s) perdidas: não foi possível gravar {caminho}: {e}")
+            return
+        if caminho == self.caminho_pendencias:
+            with self._lock:
+                self.enviados_pendencias += len(registros)
+            log.error(f"❌ {len(registros)} pesquisa(s) salvas em {caminho} para regravação")
+
+    def reenfileirar_pendencias(self):
+        """
+        Reenfileira o arquivo de pendências de uma execução anterior
+
+        Linhas que não são JSON são ignoradas. Registros que já voltaram
+        `max_tentativas_pendencia` vezes vão para o arquivo `.descartadas`.
+
+        Returns:
+            int: Registros reenfileirados
+        """
+        processando = self.caminho_pendencias + ".processando"
+        if os.path.exists(self.caminho_pendencias):
+            # Um .processando que sobrou de uma inicialização interrompida é mantido
+            with open(self.caminho_pendencias, encoding="utf-8") as origem, \
+                    open(processando, "a", encoding="utf-8") as destino:
+                destino.write(origem.read())
+            os.remove(self.caminho_pendencias)
+        if not os.path.exists(processando):
+            return 0
+
+        registros, descartados, invalidas = [], [], 0
+        with open(processando, encoding="utf-8") as f:
+            for numero, linha in enumerate(f, 1):
+                if not linha.strip():
+                    continue
+                try:
+                    registro = json.loads(linha)
+                    tentativas = int(registro.get(CHAVE_TENTATIVAS, 0)) + 1
+                except (ValueError, TypeError, AttributeError) as e:
+                    invalidas += 1
+                    log.warning(f"⚠️ Linha {numero} das pendências ignorada: {e}")
+                    continue
+                registro[CHAVE_TENTATIVAS] = tentativas
+                if tentativas > self.config["max_tentativas_pendencia"]:
+                    descartados.append(registro)
+                else:
+                    registros.append(registro)
+
+        if descartados:
+            self._salvar_pendencias(descartados, self.caminho_pendencias + ".descartadas")
+            with self._lock:
+                self.descartados += len(descartados)
+            log.error(f"❌ {len(descartados)} pesquisa(s) movidas para {self.caminho_pendencias}.descartadas "
+                      f"após {self.config['max_tentativas_pendencia']} reinicializações sem gravar")
+        for registro in registros:
+            self.enfileirar(registro)
+        os.remove(processando)
+        if registros:
+            log.info(f"📥 {len(registros)} pesquisa(s) pendentes reenfileiradas")
+        return len(registros)
+
+    def encerrar(self, timeout=10):
+        """Grava o que está na fila e finaliza a thread (registrado no atexit)"""
+        if self.encerrada:
+            return
+        self.encerrada = True
+        if self.is_alive():
+            self.fila.put(None)
+            self.join(timeout)
+        # Thread travada ou parada: o que sobrou vai para o arquivo de pendências
+        restantes = []
+        while True:
+            try:
+                registro = self.fila.get_nowait()
+            except queue.Empty:
+                break
+            if registro is not None:
+                restantes.append(registro)
+        if restantes:
+            self._salvar_pendencias(restantes)
+
+    def metricas(self):
+        with self._lock:
+            latencias = list(self.latencias_commit)
+            tamanhos = list(self.tamanhos_lote)
+            return {
+                "habilitado": self.config["habilitado"],
+                "fila": self.fila.qsize(),
+                "pendentes": self._pendentes,
+                "lotes": self.lotes,
+                "gravados": self.gravados,
+                "tamanho_medio_lote": round(sum(tamanhos) / len(tamanhos), 1) if tamanhos else 0,
+                "latencia_commit_ms": {
+                    "p50": round(_percentil(latencias, 50) * 1000, 1),
+                    "p99": round(_percentil(latencias, 99) * 1000, 1)
+                },
+                "falhas": self.falhas,
+                "gravacoes_sincronas": self.gravacoes_sincronas,
+                "enviados_pendencias": self.enviados_pendencias,
+                "descartados": self.descartados
+            }
+
+
+def serializar(registro):
+    """Campos não-texto (resultado, metadados; startups em registro ou dict) viram JSON"""
+    return {
+        chave: valor if valor is None or isinstance(valor, str)
+        else json.dumps(valor, ensure_ascii=False, default=json_padrao)
+        for chave, valor in registro.items()
+    }
+
+
+def iniciar_fila(gravar_lote, config=None, iniciar=True):
+    """
+    Cria a fila, inicia a thread, registra o encerramento e reenfileira pendências
+
+    Com iniciar=False (processo que não atende requisições, ex: o pai do
+    reloader do Flask), só cria a fila: sem thread, ela grava no chamador e
+    as pendências ficam para o processo que atende.
+    """
+    fila = FilaGravacao(gravar_lote, config if config is not None else carregar_config())
+    if not iniciar:
+        return fila
+    fila.start()
+    atexit.register(fila.encerrar)
+    try:
+        fila.reenfileirar_pendencias()
+    except Exception as e:
+        # Pendências ilegíveis não podem impedir o app de subir
+        log.error(f"❌ Não foi possível reenfileirar as pendências: {e}")
+    return fila
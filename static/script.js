@@ -47,6 +47,7 @@
   let selectedIds = new Set();
   let savedSet = loadSaved();
   let currentVCs = [];
+  let currentAggregates = null; // agregados calculados pelo backend para currentResults
 
   // suggestions
   const sampleSuggestions = ["Sequoia Capital","SoftBank","a16z","Kaszek","Monashees"];
@@ -115,6 +116,7 @@
 
   showEmptyState(true);
   updateSelectedUI();
+  loadHistoryAnalytics();
 
   [compareModal, detailsModal].forEach(modal => {
     modal && modal.addEventListener('click', (e) => {
@@ -162,9 +164,16 @@
 
       currentResults = arr.map(normalizeStartup);
       currentVCs = vcList;
+      currentAggregates = json.agregados || null;
       
       applyFilters();
-      showToast(`${currentResults.length} startups encontradas!`, "success");
+      const failedVCs = json.vcs_com_erro || [];
+      showPartialWarning(failedVCs);
+      if (failedVCs.length) {
+        showToast(`Resultado parcial: ${currentResults.length} startups; falha em ${failedVCs.join(", ")}`, "error");
+      } else {
+        showToast(`${currentResults.length} startups encontradas!`, "success");
+      }
       
     } catch (err) {
       console.error("Search error:", err);
@@ -201,8 +210,10 @@
       let arr = Array.isArray(payload) ? payload : [payload];
       currentResults = arr.map(normalizeStartup);
       currentVCs = vcList;
+      currentAggregates = json.agregados || null;
       
       applyFilters();
+      showPartialWarning([]);
       showDeepResearchInfo(metadados);
       
       const msg = `✨ Pesquisa Profunda: ${currentResults.length} startups de ${metadados.total_fontes || 'várias'} fontes`;
@@ -217,6 +228,30 @@
     }
   }
 
+  // Aviso fixo acima dos resultados quando parte das VCs falhou
+  function showPartialWarning(failedVCs) {
+    let warning = document.getElementById("partialWarning");
+    if (!failedVCs || !failedVCs.length) {
+      if (warning) warning.remove();
+      return;
+    }
+    if (!warning) {
+      warning = document.createElement("div");
+      warning.id = "partialWarning";
+      warning.style.cssText = `
+        background: #fef2f2;
+        border: 1px solid #fca5a5;
+        color: #991b1b;
+        border-radius: 8px;
+        padding: 12px 16px;
+        margin: 12px 0;
+        font-weight: 600;
+      `;
+      resultsEl.parentNode.insertBefore(warning, resultsEl);
+    }
+    warning.textContent = `⚠️ Resultado parcial: não foi possível pesquisar ${failedVCs.join(", ")}. Tente novamente essas VCs.`;
+  }
+
   function showLoadingDeep(show) {
     let overlay = document.getElementById("__loading_deep_overlay");
     
@@ -432,8 +467,12 @@
     
     if (!list || !list.length) {
       showEmptyState(true);
-      updateStats([]);
-      drawSectorChart({});
+      if (currentResults.length) {
+        updateStats([]);
+        drawSectorChart({});
+      } else {
+        loadHistoryAnalytics();
+      }
       return;
     }
 
@@ -446,8 +485,10 @@
       resultsEl.appendChild(card);
     });
 
-    updateStats(list);
-    drawSectorChart(buildSectorCounts(list));
+    // Sem filtros, os números vêm prontos do backend
+    const aggregates = !filtersActive() && currentAggregates;
+    updateStats(list, aggregates);
+    drawSectorChart(aggregates ? sectorCountsFromAggregates(aggregates) : buildSectorCounts(list));
     updateSelectedUI();
     updateSavedButtonsState();
   }
@@ -772,6 +813,8 @@
       const arr = Array.isArray(item.resultado) ? item.resultado : [item.resultado];
       currentResults = arr.map(normalizeStartup);
       currentVCs = item.vc_list.split(',').map(s => s.trim());
+      currentAggregates = null;
+      showPartialWarning([]);
       
       applyFilters();
       hidePanel(historyPanel);
@@ -783,11 +826,11 @@
     }
   };
 
-  function updateStats(list) {
-    statTotalStartups.textContent = list.length;
+  function updateStats(list, aggregates) {
+    statTotalStartups.textContent = aggregates ? aggregates.totais.startups : list.length;
     statTotalVCs.textContent = currentVCs.length || "—";
     
-    const total = list.reduce((acc, s) => {
+    const total = aggregates ? aggregates.totais.investimento : list.reduce((acc, s) => {
       const n = parseMaybeHumanNumber(String(s.valor_investimento || 0));
       return acc + (n || 0);
     }, 0);
@@ -795,6 +838,37 @@
     statTotalValue.textContent = total ? formatCurrency(total) : "—";
   }
 
+  function filtersActive() {
+    return [filterYearFrom, filterYearTo, filterSector, filterMinValue, filterMaxValue]
+      .some(el => el.value.trim() !== "");
+  }
+
+  function sectorCountsFromAggregates(aggregates) {
+    const counts = {};
+    Object.entries(aggregates.por_setor || {}).forEach(([sector, item]) => {
+      counts[sector] = item.startups;
+    });
+    return counts;
+  }
+
+  // Sem resultados na tela: painel mostra o histórico inteiro (agregados mantidos no backend)
+  async function loadHistoryAnalytics() {
+    try {
+      const res = await fetch("/analytics?limite=6");
+      if (!res.ok) return;
+      const aggregates = await res.json();
+      if (currentResults.length) return;
+      
+      const totais = aggregates.totais || {};
+      statTotalStartups.textContent = totais.startups || "—";
+      statTotalVCs.textContent = totais.vcs || "—";
+      statTotalValue.textContent = totais.investimento ? formatCurrency(totais.investimento) : "—";
+      drawSectorChart(sectorCountsFromAggregates(aggregates));
+    } catch (err) {
+      console.error("Analytics loading error:", err);
+    }
+  }
+
   function buildSectorCounts(list) {
     const counts = {};
     list.forEach(s => {